@@ -1,7 +1,10 @@
 # app.py
+import logging
+import math
+
 import streamlit as st
+import streamlit.components.v1 as components
 import folium
-from streamlit_folium import st_folium
 from geopy.distance import geodesic
 import numpy as np
 from folium.plugins import AntPath
@@ -21,6 +24,7 @@ from utils.railway_curve import add_complete_railway_curve_to_map, add_complete_
 from utils.railway_alignment import RailwayAlignment, TangentSegment, CurveSegment
 from utils.portal import Portal
 from opencage.geocoder import OpenCageGeocode
+from build_alignments import ALIGNMENT_SPECS, make_alignment
 
 try:
     from shapely.geometry import LineString, Point
@@ -29,12 +33,208 @@ except ImportError:
     LineString = None
     Point = None
 
+logger = logging.getLogger(__name__)
+
 # Set page config first
 st.set_page_config(layout="wide")
 
-# Hide default Streamlit footer and add padding
-st.markdown(
+def approx_dist_m(lat1, lon1, lat2, lon2):
+    """
+    Fast equirectangular distance in meters (~0.1% error at city scale).
+
+    Good enough for thresholding and closest-point comparisons; keep
+    geodesic for the user-facing distance values.
+    """
+    dlat = (lat2 - lat1) * 111000.0
+    dlon = (lon2 - lon1) * 111000.0 * math.cos(math.radians(0.5 * (lat1 + lat2)))
+    return math.hypot(dlat, dlon)
+
+def simplify_for_antpath(coords, tolerance=3e-5):
+    """
+    Simplify a polyline for the animated overlays (tolerance ~3 m).
+
+    AntPath re-renders its marching dashes for every vertex on every
+    animation tick, so fewer vertices means cheaper animation and a
+    smaller payload; the solid base PolyLine keeps full fidelity.
+    """
+    if LineString is None or len(coords) < 3:
+        return coords
+    return list(LineString(coords).simplify(tolerance, preserve_topology=False).coords)
+
+def nearest_point_on_polyline(coords, lat, lon):
+    """
+    Nearest point on a (lat, lon) polyline to a query point, vectorized.
+
+    Projects the query onto every segment at once (projection parameter
+    clamped to [0, 1]) and takes the argmin of the squared distances -
+    one NumPy pass over the whole polyline instead of a Shapely
+    LineString.project walk. Works in raw degree space, matching what
+    the LineString version computed.
+    """
+    pts = np.asarray(coords, dtype=np.float64)
+    p = np.array([lat, lon], dtype=np.float64)
+    a = pts[:-1]
+    ab = pts[1:] - a
+    ap = p - a
+    denom = np.einsum('ij,ij->i', ab, ab)
+    t = np.clip(np.einsum('ij,ij->i', ap, ab) / np.maximum(denom, 1e-300), 0.0, 1.0)
+    dp = ap - t[:, None] * ab
+    d2 = np.einsum('ij,ij->i', dp, dp)
+    # Only the winning projection is materialized; the (N, 2) array of
+    # all projected points was a throwaway temporary
+    i = int(d2.argmin())
+    proj = a[i] + t[i] * ab[i]
+    return float(proj[0]), float(proj[1])
+
+def fraction_along_polyline(coords, lat, lon):
+    """
+    Normalized arc-length position (0-1) of the nearest point on a
+    (lat, lon) polyline to a query point.
+
+    Same clamped-projection pass as nearest_point_on_polyline, plus a
+    cumulative chord-length table so the winning edge converts straight
+    to an arc-length fraction - no shapely LineString.project walk.
+    """
+    pts = np.asarray(coords, dtype=np.float64)
+    p = np.array([lat, lon], dtype=np.float64)
+    a = pts[:-1]
+    ab = pts[1:] - a
+    ap = p - a
+    denom = np.einsum('ij,ij->i', ab, ab)
+    t = np.clip(np.einsum('ij,ij->i', ap, ab) / np.maximum(denom, 1e-300), 0.0, 1.0)
+    dp = ap - t[:, None] * ab
+    d2 = np.einsum('ij,ij->i', dp, dp)
+    i = int(d2.argmin())
+    edge_lengths = np.sqrt(denom)
+    cumulative = np.cumsum(edge_lengths)
+    total = cumulative[-1]
+    if total <= 0.0:
+        return 0.0
+    before = cumulative[i - 1] if i > 0 else 0.0
+    return float((before + t[i] * edge_lengths[i]) / total)
+
+def format_distance_units(dist_m):
+    """Convert meters to the (ft, rounded m, km, mi) tuple the sidebar shows."""
+    return (
+        round(dist_m * 3.28084),          # feet
+        round(dist_m / 10) * 10,          # nearest 10 meters
+        round(dist_m / 1000, 1),          # 0.1 km
+        round(dist_m * 0.000621371, 1),   # 0.1 miles
+    )
+
+# Tooltip labels for the yellow-track sections; each appears on both the
+# solid cover line and its animated path, and several sections share one,
+# so the strings live here once
+_TT_YELLOW = "Yellow Track"
+_TT_CUT_AND_COVER = "Yellow Track: Cut and Cover Tunnel"
+_TT_BORED_TUNNEL = "Yellow Track: Bored Tunnel"
+_TT_U_SECTION = "Yellow Track: U-Section"
+
+# Shared styling for the yellow-track overlay sections. Every section used
+# to repeat a near-identical PolyLine + AntPath pair inline; the kwargs
+# live here once and add_yellow_overlay emits the pair.
+_YELLOW_SOLID_KW = dict(color='#FFD700', weight=9, opacity=1.0)
+_YELLOW_ANT_KW = dict(
+    dash_array=[10, 20],
+    color='#FFD700',
+    pulseColor='#FFFFFF',
+    paused=False,
+    hardware_acceleration=True,  # CSS-driven dashes instead of JS setInterval ticks
+    weight=5,
+)
+
+def add_yellow_overlay(m, coords, tooltip, classname=None, ant_classname=None,
+                       delay=600, ant_opacity=0.9, solid=True):
+    """
+    Add one yellow-track section to the map: a thick solid cover line
+    with the animated path on top. No-op for empty coordinate lists.
+    """
+    if not len(coords):
+        return
+    if solid:
+        kwargs = dict(_YELLOW_SOLID_KW)
+        if classname:
+            kwargs["className"] = classname
+        folium.PolyLine(locations=coords, tooltip=tooltip, **kwargs).add_to(m)
+    kwargs = dict(_YELLOW_ANT_KW)
+    if ant_classname:
+        kwargs["className"] = ant_classname
+    # The animated path gets the simplified polyline - the solid cover
+    # line above preserves full fidelity
+    AntPath(locations=simplify_for_antpath(coords), delay=delay,
+            opacity=ant_opacity, tooltip=tooltip, **kwargs).add_to(m)
+
+# Shared HTML for the circular "T" tunnel-portal markers; only the fill
+# color differs between portals
+_PORTAL_ICON_HTML = """
+<div style="
+    background-color: {color};
+    width: 24px;
+    height: 24px;
+    border-radius: 12px;
+    border: 3px solid white;
+    box-shadow: 0 0 10px rgba(0,0,0,0.5);
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    color: white;
+    font-weight: bold;
+    font-size: 16px;
+">T</div>
+"""
+
+def make_portal_icon(color):
+    """Build the DivIcon for a tunnel-portal marker in the given color."""
+    return folium.DivIcon(
+        icon_size=(30, 30),
+        icon_anchor=(15, 15),
+        html=_PORTAL_ICON_HTML.format(color=color)
+    )
+
+# OpenCage geocoding configuration
+OPENCAGE_API_KEY = "e4a3fe37fe3d469499dc77e798f65245"  # Fallback when no secrets file is configured
+SOCAL_BOUNDS = "-117.4,32.5,-116.8,33.3"  # San Diego County area
+
+@st.cache_data(show_spinner=False, hash_funcs={folium.Map: id})
+def render_map_html(m, overlay_key=""):
+    """
+    Render a built map to its HTML string once per overlay state.
+
+    Serializing the map (Jinja2 templates plus thousands of coordinate
+    tuples) is the expensive part of serving it; caching by map identity
+    plus the overlay key (the searched address) means a rerun that
+    repeats a search reuses the rendered HTML outright.
+    """
+    return m.get_root().render()
+
+@st.cache_resource(show_spinner=False)
+def get_geocoder():
+    """
+    Build the OpenCage client once per process.
+
+    The client holds an HTTP session underneath, so reusing it keeps the
+    TCP/TLS connection to the geocoding API alive between searches.
     """
+    try:
+        api_key = st.secrets["opencage_api_key"]
+    except (KeyError, FileNotFoundError):
+        api_key = OPENCAGE_API_KEY
+    return OpenCageGeocode(api_key)
+
+@st.cache_data(ttl=86400, max_entries=1024, show_spinner=False)
+def geocode_address(query):
+    """
+    Geocode an address within the San Diego area, cached for a day.
+
+    Repeat searches for the same address (by any user of this process)
+    skip the network round-trip entirely.
+    """
+    return get_geocoder().geocode(query, bounds=SOCAL_BOUNDS)
+
+# Page-layout CSS, assembled once at import time. The pointer-events rule
+# for the Leaflet panes lives inside the map iframe (see build_base_map) -
+# page-level CSS cannot reach into the iframe, so it is not duplicated here.
+PAGE_CSS = """
     <style>
     footer {visibility: hidden;}
     /* Make the main content area fill available space but not overflow */
@@ -75,88 +275,37 @@ st.markdown(
     iframe {
         height: calc(100vh - 200px) !important;
     }
-    .folium-map .leaflet-pane path:not(.yellow-bridge-overlay) {
-        pointer-events: none !important;
-    }
     </style>
-    """,
-    unsafe_allow_html=True
-)
+    """
+
+# Hide default Streamlit footer and add padding
+st.markdown(PAGE_CSS, unsafe_allow_html=True)
+
+# --- 1. define your four alignments (lat, lon) lists here ---
+# Green track is an engineering track now, so ALIGNMENTS is empty; the
+# engineering routes are built from the module-level ALIGNMENT_SPECS tables
+ALIGNMENTS = {}
 
 st.title("LOSSAN Rail Realignment Explorer")
 
 # Create a container for the main content
 main_content = st.container()
 
-with main_content:
-    # --- 1. define your four alignments (lat, lon) lists here ---
-    # Green track will now be an engineering track, so we'll remove it from ALIGNMENTS
-    ALIGNMENTS = {}
-
-    # --- 2. address input & geocoding ---
-    st.sidebar.subheader("Search Location")
-    
-    # Simple text input for address without autocomplete
-    address_input = st.sidebar.text_input("Enter address", value=st.session_state.get("address", ""))
-    
-    # Search button
-    search = st.sidebar.button("Search")
+@st.cache_resource(show_spinner=False)
+def build_base_map(center, initial_zoom):
+    """Build the full Folium map with every alignment and overlay.
 
-    # Initialize session state for location if not present
-    if "location" not in st.session_state:
-        st.session_state["location"] = None
-
-    if search and address_input:
-        # Initialize OpenCage geocoder with API key
-        opencage_api_key = "e4a3fe37fe3d469499dc77e798f65245"  # Replace with your OpenCage API key
-        geocoder = OpenCageGeocode(opencage_api_key)
-        
-        try:
-            # Define bounds for San Diego area
-            socal_bounds = "-117.4,32.5,-116.8,33.3"  # San Diego County area
-            
-            # Perform geocoding with bounds constraint
-            results = geocoder.geocode(address_input, bounds=socal_bounds)
-            
-            if results and len(results):
-                # Extract location data from the first result
-                location_data = results[0]
-                
-                # Create a location object with the required attributes
-                class LocationResult:
-                    def __init__(self, lat, lng, formatted):
-                        self.latitude = lat
-                        self.longitude = lng
-                        self.address = formatted
-                
-                location = LocationResult(
-                    location_data['geometry']['lat'],
-                    location_data['geometry']['lng'],
-                    location_data['formatted']
-                )
-                
-                st.session_state["address"] = address_input
-                st.session_state["location"] = location
-            else:
-                st.sidebar.error("Address not found")
-                st.session_state["location"] = None
-        except Exception as e:
-            st.sidebar.error(f"Geocoding service error: {str(e)}")
-            st.session_state["location"] = None
-
-    # Use session state location for display
-    location = st.session_state.get("location", None)
-    address = st.session_state.get("address", "")
-
-    # --- 3. build the Folium map ---
-    # default center over Del Mar
-    center = (32.975, -117.245)
-    initial_zoom = 13
-    if location:
-        center = (location.latitude, location.longitude)
-        initial_zoom = 15
-
-    m = folium.Map(location=center, zoom_start=initial_zoom, tiles="OpenStreetMap")
+    The alignments and overlays never change between reruns, so the whole
+    construction is cached - only the first run per (center, zoom) pays for
+    the geometry generation.
+    """
+    # CartoDB Positron tiles are much lighter than the default OpenStreetMap
+    # style (smaller tile payloads, less detail to composite) and the muted
+    # basemap gives the colored routes better contrast.
+    # prefer_canvas renders the polylines to one canvas element instead of
+    # thousands of SVG path nodes, which keeps pan/zoom redraws cheap.
+    m = folium.Map(location=center, zoom_start=initial_zoom, tiles="CartoDB positron",
+                   prefer_canvas=True)
 
     # Dictionary to store expanded coordinates for each alignment
     expanded_alignments = {}
@@ -173,52 +322,59 @@ with main_content:
         if len(coords) < 3:
             smoothed_coords = coords.copy()
         else:
-            # Process each vertex (where two segments meet)
-            for i in range(len(coords)):
-                # First point - just add it
-                if i == 0:
-                    smoothed_coords.append(coords[i])
-                    continue
-                    
-                # Last point - just add it
-                if i == len(coords) - 1:
-                    smoothed_coords.append(coords[i])
-                    continue
-                    
+            # Precompute all segment geometry in one vectorized pass instead
+            # of per-vertex geodesic calls and scalar trig
+            arr = np.asarray(coords, dtype=np.float64)
+            V = arr[1:] - arr[:-1]
+            norms = np.linalg.norm(V, axis=1)
+            Vn = V / norms[:, None]
+
+            # Equirectangular segment lengths in meters - ample accuracy
+            # for the 20m/200m thresholds used below
+            lat_mid = np.radians(0.5 * (arr[:-1, 0] + arr[1:, 0]))
+            seg_dists = 111000.0 * np.hypot(V[:, 0], V[:, 1] * np.cos(lat_mid))
+
+            # Turn geometry at each interior vertex
+            dots = np.clip(np.einsum('ij,ij->i', Vn[:-1], Vn[1:]), -1.0, 1.0)
+            angles = np.degrees(np.arccos(dots))
+            crosses = Vn[:-1, 0] * Vn[1:, 1] - Vn[:-1, 1] * Vn[1:, 0]
+
+            # Meters-to-degrees scale factors, computed once per vertex
+            # instead of repeating the trig inside the loop body
+            INV_M_PER_DEG_LAT = 1.0 / 111000.0
+            lon_scale_arr = 111000.0 * np.cos(np.radians(arr[:, 0]))
+
+            # Evaluate every skip condition up front as boolean masks so the
+            # loop body only runs for corners that actually emit a curve:
+            # short adjoining segments or near-straight angles are rejected
+            # without touching the curve-generation code
+            skip = (seg_dists[:-1] < 20) | (seg_dists[1:] < 20) | (angles < 5)
+            use_circular = angles > 60
+
+            # Endpoints are always kept verbatim
+            smoothed_coords.append(coords[0])
+
+            # Process each interior vertex (where two segments meet)
+            for i in range(1, len(coords) - 1):
                 # This is a vertex between two segments
-                p1 = coords[i-1]  # Previous point
                 p2 = coords[i]    # Current vertex
-                p3 = coords[i+1]  # Next point
-                
-                # Calculate distances
-                dist1 = geodesic(p1, p2).meters
-                dist2 = geodesic(p2, p3).meters
-                
-                # Skip very short segments
-                if dist1 < 20 or dist2 < 20:
-                    smoothed_coords.append(p2)
-                    continue
-                
-                # Calculate vectors
-                v1 = np.array([p2[0] - p1[0], p2[1] - p1[1]])
-                v2 = np.array([p3[0] - p2[0], p3[1] - p2[1]])
-                
-                # Normalize vectors
-                v1_norm = v1 / np.linalg.norm(v1)
-                v2_norm = v2 / np.linalg.norm(v2)
-                
-                # Calculate angle between segments
-                dot_product = np.clip(np.dot(v1_norm, v2_norm), -1.0, 1.0)
-                angle = np.degrees(np.arccos(dot_product))
-                
-                # Skip if angle is very small (almost straight)
-                if angle < 5:
+
+                # Short adjoining segment or near-straight angle: keep the
+                # vertex as-is
+                if skip[i-1]:
                     smoothed_coords.append(p2)
                     continue
-                    
+
+                # Distances of the adjoining segments
+                dist1 = seg_dists[i-1]
+                dist2 = seg_dists[i]
+
+                # Normalized segment vectors
+                v1_norm = Vn[i-1]
+                v2_norm = Vn[i]
+
                 # Determine turn direction using cross product
-                cross_product = v1_norm[0]*v2_norm[1] - v1_norm[1]*v2_norm[0]
-                direction = 'right' if cross_product < 0 else 'left'
+                direction = 'right' if crosses[i-1] < 0 else 'left'
                 
                 # Define how much of each segment to use for the curve
                 # Use a fraction of the shorter segment, but limit curve length
@@ -230,29 +386,27 @@ with main_content:
                 # Move back from p2 along v1 by curve_length
                 curve_start_factor = curve_length / dist1
                 curve_start = (
-                    p2[0] - v1_norm[0] * curve_length / 111000,  # Convert meters to degrees lat
-                    p2[1] - v1_norm[1] * curve_length / (111000 * np.cos(np.radians(p2[0])))  # Convert to degrees lon
+                    p2[0] - v1_norm[0] * curve_length * INV_M_PER_DEG_LAT,  # Convert meters to degrees lat
+                    p2[1] - v1_norm[1] * curve_length / lon_scale_arr[i]  # Convert to degrees lon
                 )
                 
                 # Move forward from p2 along v2 by curve_length
                 curve_end_factor = curve_length / dist2
                 curve_end = (
-                    p2[0] + v2_norm[0] * curve_length / 111000,  # Convert meters to degrees lat
-                    p2[1] + v2_norm[1] * curve_length / (111000 * np.cos(np.radians(p2[0])))  # Convert to degrees lon
+                    p2[0] + v2_norm[0] * curve_length * INV_M_PER_DEG_LAT,  # Convert meters to degrees lat
+                    p2[1] + v2_norm[1] * curve_length / lon_scale_arr[i]  # Convert to degrees lon
                 )
                 
                 # Add straight segment from previous point to curve start
                 # Only do this for points after the first vertex
                 if i > 1:
-                    # Create a few points along the straight segment for better visualization
-                    for j in range(1, 4):
-                        t = j / 4
-                        lat = smoothed_coords[-1][0] + t * (curve_start[0] - smoothed_coords[-1][0])
-                        lon = smoothed_coords[-1][1] + t * (curve_start[1] - smoothed_coords[-1][1])
-                        smoothed_coords.append((lat, lon))
+                    # Create a few points along the straight segment for better
+                    # visualization - three interior points in one linspace call
+                    pts = np.linspace(np.asarray(smoothed_coords[-1]), np.asarray(curve_start), 5)[1:-1]
+                    smoothed_coords.extend(map(tuple, pts))
                 
                 # Choose curve type based on angle
-                if angle > 60:
+                if use_circular[i-1]:
                     # For sharper turns, use circular curve
                     curve_radius = curve_length * 3  # Larger radius for smoother curve
                     curve_points = create_circular_curve(
@@ -273,658 +427,52 @@ with main_content:
                 
                 # Add all curve points
                 smoothed_coords.extend(curve_points)
+
+            smoothed_coords.append(coords[-1])
+
+        # Store expanded coordinates for distance calculations as one
+        # contiguous (N, 2) float64 array rather than a list of tuples -
+        # far less memory and ready for vectorized nearest-point queries
+        expanded_alignments[name] = np.asarray(smoothed_coords, dtype=np.float64)
         
-        # Store expanded coordinates for distance calculations
-        expanded_alignments[name] = smoothed_coords
-        
-        # Add a solid base line for better visibility
-        folium.PolyLine(
-            locations=smoothed_coords,
-            color=data["color"],
-            weight=7,
-            opacity=0.7,
-            tooltip=name
-        ).add_to(m)
-        
-        # Add animated path on top
+        # Single animated polyline per route - a thick AntPath with wide
+        # dashes reads like the old solid-base + animated pair while
+        # halving the vertices Leaflet has to transform every frame
         AntPath(
             locations=smoothed_coords,
-            dash_array=[10, 15],
+            dash_array=[20, 30],
             delay=800,
             color=data["color"],
             pulseColor='#FFFFFF',
             paused=False,
-            weight=4,
+            hardware_acceleration=True,  # CSS-driven dashes instead of JS setInterval ticks
+            weight=7,
             opacity=0.9,
             tooltip=name
         ).add_to(m)
 
-    # === YELLOW TRACK ENGINEERING MODEL ===
-    # Create the yellow track using the engineering specifications and directly add to map
-    
-    # Known engineering data for the first curve of the yellow track
-    station_2000_coords = (32.9740081, -117.2669915)  # 20+00 station
-    station_2500_coords = (32.9726647, -117.2666647)  # 25+00 station
-    
-    # Create a new Railway Alignment for the Yellow route
-    yellow_alignment = RailwayAlignment(name="Yellow Route: Engineering Alignment", color="#FFD700")  # Gold yellow - less bright
-    
-    # Add reference points
-    yellow_alignment.add_reference_point("STA_2000", station_2000_coords, 2000)
-    yellow_alignment.add_reference_point("STA_2500", station_2500_coords, 2500)
-    
-    # Calculate track parameters based on reference points
+    # === TRACK ENGINEERING MODELS ===
+    # The station/curve tables live at module scope in build_alignments.py
+    # (shared with the offline generator), so the segment literals are
+    # defined once per process instead of rebuilt inline on every map build.
+    yellow_alignment = make_alignment(ALIGNMENT_SPECS["yellow"])
     track_params = yellow_alignment.calculate_track_params("STA_2000", "STA_2500")
-    
-    # Define segments for the Yellow route
-    
-    # First tangent segment
-    yellow_first_tangent = yellow_alignment.add_tangent("20+00", "24+04.67", name="Initial Tangent")
-    
-    # First spiral-curve-spiral segment
-    yellow_first_curve = yellow_alignment.add_curve(
-        ts_station="24+04.67", 
-        sc_station="25+44.67", 
-        cs_station="30+43.75", 
-        st_station="31+83.75",
-        degree_of_curve="9 00'00\"", 
-        direction="right",
-        name="First Curve"
-    )
-    
-    # Second tangent segment
-    yellow_second_tangent = yellow_alignment.add_tangent("31+83.75", "37+45.96", name="Middle Tangent")
-    
-    # Second spiral-curve-spiral segment
-    yellow_second_curve = yellow_alignment.add_curve(
-        ts_station="37+45.96", 
-        sc_station="39+05.96",  # 39+05.96 = 37+45.96 + 160' (corrected spiral length)
-        cs_station="40+60.67", 
-        st_station="42+20.67",  # 42+20.67 = 40+60.67 + 160' (corrected spiral length)
-        degree_of_curve="9 30'00\"",  # Corrected degree of curve: 9° 30' 00"
-        direction="left",
-        name="Second Curve"
-    )
-    
-    # Third tangent segment (extended alignment)
-    yellow_third_tangent = yellow_alignment.add_tangent("42+20.67", "75+17.38", name="Extended Tangent")
-    
-    # Manually set bearing for the extended tangent
-    # This is useful to follow the coastline more accurately
-    yellow_third_tangent.manual_bearing = 142.25  # Southeast direction (0=North, 90=East, 180=South)
-    
-    # Third spiral-curve-spiral segment
-    yellow_third_curve = yellow_alignment.add_curve(
-        ts_station="75+17.38", 
-        sc_station="79+17.38",  # 79+17.38 = 75+17.38 + 400' (spiral length)
-        cs_station="87+52.17", 
-        st_station="91+52.17",  # 91+52.17 = 87+52.17 + 400' (spiral length)
-        degree_of_curve="2 24'00\"",  # Degree of curve: 2° 24' 00"
-        direction="right",
-        name="Third Curve"
-    )
-    
-    # Fourth tangent segment
-    yellow_fourth_tangent = yellow_alignment.add_tangent("91+52.17", "94+72.45", name="Fourth Tangent")
-    
-    # Fourth spiral-curve-spiral segment
-    yellow_fourth_curve = yellow_alignment.add_curve(
-        ts_station="94+72.45", 
-        sc_station="98+72.45",  # 98+72.45 = 94+72.45 + 400' (spiral length)
-        cs_station="119+62.32", 
-        st_station="123+62.32",  # 123+62.32 = 119+62.32 + 400' (spiral length)
-        degree_of_curve="2 24'00\"",  # Degree of curve: 2° 24' 00"
-        direction="left",
-        name="Fourth Curve"
-    )
-    
-    # Fifth tangent segment
-    yellow_fifth_tangent = yellow_alignment.add_tangent("123+62.32", "162+59.46", name="Fifth Tangent")
-    yellow_fifth_tangent.manual_bearing = 171  # Southeast direction (0=North, 90=East, 180=South)
-    
-    # Fifth spiral-curve-spiral segment
-    yellow_fifth_curve = yellow_alignment.add_curve(
-        ts_station="162+59.46", 
-        sc_station="169+09.46",  # 169+09.46 = 162+59.46 + 650' (spiral length)
-        cs_station="175+18.79",  # Note: This was labeled as SC in the query but should be CS
-        st_station="181+68.79",  # 181+68.79 = 175+18.79 + 650' (spiral length)
-        degree_of_curve="0 44'30\"",  # Degree of curve: 0° 44' 30" (very gentle curve)
-        direction="left",
-        name="Fifth Curve"
-    )
-    
-    # Sixth tangent segment
-    yellow_sixth_tangent = yellow_alignment.add_tangent("181+68.79", "196+22.24", name="Sixth Tangent")
-    
-    # Sixth spiral-curve-spiral segment (MT1 CURVE #6)
-    yellow_sixth_curve = yellow_alignment.add_curve(
-        ts_station="196+22.24", 
-        sc_station="202+72.24",  # 202+72.24 = 196+22.24 + 650' (spiral length from box)
-        cs_station="208+28.94", 
-        st_station="214+78.94",  # 216+43.12 = 209+93.12 + 650' (spiral length from box)
-        degree_of_curve="0 44'30\"",  # Degree of curve from box: 0° 44' 30"
-        direction="right",
-        name="Sixth Curve (MT1 CURVE #6)"
-    )
-    
-    # Seventh tangent segment
-    yellow_seventh_tangent = yellow_alignment.add_tangent("214+78.94", "235+49.79", name="Seventh Tangent")
-    
-    # Seventh spiral-curve-spiral segment (CURVE #7)
-    yellow_seventh_curve = yellow_alignment.add_curve(
-        ts_station="235+49.79", 
-        sc_station="242+29.79",  # 242+29.79 = 235+49.79 + 680' (spiral length)
-        cs_station="275+32.84", 
-        st_station="282+12.84",  # 282+12.84 = 275+32.84 + 680' (spiral length)
-        degree_of_curve="0 49'11\"",  # Degree of curve: 0° 49' 11"
-        direction="right",  # Alternating direction from previous curve
-        name="Seventh Curve"
-    )
-    
-    # Eighth tangent segment
-    yellow_eighth_tangent = yellow_alignment.add_tangent("282+12.84", "285+53.12", name="Eighth Tangent")
-    
-    # Eighth spiral-curve-spiral segment (CURVE #8)
-    yellow_eighth_curve = yellow_alignment.add_curve(
-        ts_station="285+53.12", 
-        sc_station="287+93.12",  # 287+93.12 = 285+53.12 + 240' (spiral length)
-        cs_station="294+53.38", 
-        st_station="296+93.38",  # 296+93.38 = 294+53.38 + 240' (spiral length)
-        degree_of_curve="0 15'00\"",  # Degree of curve: 0° 15' 00"
-        direction="right",  # Alternating direction from previous curve
-        name="Eighth Curve"
-    )
-    
-    # Ninth tangent segment
-    yellow_ninth_tangent = yellow_alignment.add_tangent("296+93.38", "304+93.02", name="Ninth Tangent")
-    
-    # === BLUE TRACK ENGINEERING MODEL ===
-    # Create the blue track using the engineering specifications and directly add to map
 
-    # Create a new Railway Alignment for the Blue route
-    blue_alignment = RailwayAlignment(name="Blue Route: Under Crest Canyon", color="blue")
-    
-    # Add reference points for the blue track
-    blue_sta_500_coords = (32.9731225, -117.2667758)  # 5+00 station
-    blue_sta_1000_coords = (32.9717752, -117.2664515)  # 10+00 station
-    
-    blue_alignment.add_reference_point("STA_500", blue_sta_500_coords, 500)
-    blue_alignment.add_reference_point("STA_1000", blue_sta_1000_coords, 1000)
-    
-    # Calculate track parameters based on reference points
+    blue_alignment = make_alignment(ALIGNMENT_SPECS["blue"])
     blue_track_params = blue_alignment.calculate_track_params("STA_500", "STA_1000")
-    
-    # Define segments for the Blue route - initial tangent
-    blue_first_tangent = blue_alignment.add_tangent("5+00", "17+46.12", name="Initial Tangent")
-    
-    # Add a curve similar to the first segment of the original blue route
-    blue_first_curve = blue_alignment.add_curve(
-        ts_station="17+46.12",
-        sc_station="23+96.12",
-        cs_station="54+05.81",
-        st_station="60+55.81",
-        degree_of_curve="0 48'00\"",
-        direction="right",
-        name="First Curve"
-    )
-    
-    # Add next tangent
-    blue_second_tangent = blue_alignment.add_tangent("60+55.81", "64+00.52", name="Second Tangent")
-    blue_second_tangent.manual_bearing = 141.5  # Southeast direction (0=North, 90=East, 180=South)
-
-    # Add second curve (sharper turn toward southeast)
-    blue_second_curve = blue_alignment.add_curve(
-        ts_station="64+00.52",
-        sc_station="70+80.52",
-        cs_station="96+80.99",
-        st_station="103+60.99",
-        degree_of_curve="0 49'35\"",
-        direction="left",
-        name="Second Curve"
-    )
-    
-    # Add third tangent going southeast
-    blue_third_tangent = blue_alignment.add_tangent("103+60.99", "116+60.92", name="Third Tangent")
-    
-    # Add the curve near Del Mar Heights Road
-    blue_third_curve = blue_alignment.add_curve(
-        ts_station="116+60.92",
-        sc_station="123+40.92",
-        cs_station="146+18.69",
-        st_station="152+98.69",
-        degree_of_curve="0 49'35\"",
-        direction="right",
-        name="Third Curve"
-    )
-    
-    # Add fourth tangent 
-    blue_fourth_tangent = blue_alignment.add_tangent("152+98.69", "156+48.69", name="Fourth Tangent")
-    blue_fourth_tangent.manual_bearing = 141.5
-    
-    # Add fourth curve to align with endpoint
-    blue_fourth_curve = blue_alignment.add_curve(
-        ts_station="156+48.69",
-        sc_station="163+28.69",
-        cs_station="192+18.38",
-        st_station="198+98.38",
-        degree_of_curve="0 49'35\"",
-        direction="left",
-        name="Fourth Curve"
-    )
-    
-    # Add fifth tangent to reach the end point
-    blue_fifth_tangent = blue_alignment.add_tangent("198+98.38", "204+89.02", name="Fifth Tangent")
-    #blue_fifth_tangent.manual_bearing = 170  # Southeast direction (0=North, 90=East, 180=South)
-    
-    # Add fifth curve
-    blue_fifth_curve = blue_alignment.add_curve(
-        ts_station="204+89.02",
-        sc_station="211+69.02",
-        cs_station="244+71.53",
-        st_station="251+51.53",
-        degree_of_curve="0 49'11\"",
-        direction="right",
-        name="Fifth Curve"
-    )
-    
-    # Add sixth tangent
-    blue_sixth_tangent = blue_alignment.add_tangent("251+51.53", "255+07.34", name="Sixth Tangent")
-    
-    # Add sixth curve
-    blue_sixth_curve = blue_alignment.add_curve(
-        ts_station="255+07.34",
-        sc_station="257+27.34",
-        cs_station="264+05.11",
-        st_station="266+25.11",
-        degree_of_curve="0 15'00\"",
-        direction="left",
-        name="Sixth Curve"
-    )
-
-    blue_seventh_tangent = blue_alignment.add_tangent("266+25.11", "274+32.35", name="Seventh Tangent")
-    blue_seventh_tangent.manual_bearing = 135
 
-    # === PURPLE TRACK ENGINEERING MODEL ===
-    # Create the purple track using the engineering specifications and directly add to map
+    # Blue, Purple and Green share the same STA_500/STA_1000 reference
+    # points, so their track parameters are identical - compute them once.
+    # Northern Yellow likewise shares Yellow's STA_2000/STA_2500 anchors.
+    purple_alignment = make_alignment(ALIGNMENT_SPECS["purple"])
+    purple_track_params = blue_track_params
 
-    # Create a new Railway Alignment for the Purple route
-    purple_alignment = RailwayAlignment(name="Purple Route: Under Camino Del Mar", color="magenta")
+    green_alignment = make_alignment(ALIGNMENT_SPECS["green"])
+    green_track_params = blue_track_params
 
-    # Add reference points for the purple track
-    purple_sta_500_coords = (32.9731225, -117.2667758)  # 5+00 station
-    purple_sta_1000_coords = (32.9717752, -117.2664515)  # 10+00 station
+    northern_yellow_alignment = make_alignment(ALIGNMENT_SPECS["northern_yellow"])
+    northern_yellow_track_params = track_params
 
-    purple_alignment.add_reference_point("STA_500", purple_sta_500_coords, 500)
-    purple_alignment.add_reference_point("STA_1000", purple_sta_1000_coords, 1000)
-
-    # Calculate track parameters based on reference points
-    purple_track_params = purple_alignment.calculate_track_params("STA_500", "STA_1000")
-
-    # Define segments for the Purple route - initial tangent
-    purple_first_tangent = purple_alignment.add_tangent("5+00", "33+23.02", name="Initial Tangent")
-
-    # Add first curve (gentle curve to follow Camino Del Mar)
-    purple_first_curve = purple_alignment.add_curve(
-        ts_station="33+23.02",
-        sc_station="35+73.02",
-        cs_station="46+03.60",
-        st_station="48+53.60", #48+53.60
-        degree_of_curve="1 25'00\"", #1 00'00\"
-        direction="left",
-        name="First Curve"
-    )
-
-    # Add second tangent
-    purple_second_tangent = purple_alignment.add_tangent("48+53.60", "51+91.55", name="Second Tangent")
-    purple_second_tangent.manual_bearing = 181.75  # Southeast direction
-
-    # Add second curve (sharper turn toward southeast)
-    purple_second_curve = purple_alignment.add_curve(
-        ts_station="51+91.55",
-        sc_station="54+41.55",
-        cs_station="71+12.55",
-        st_station="73+62.55",
-        degree_of_curve="1 00'00\"",
-        direction="right",
-        name="Second Curve"
-    )
-
-    # Add third tangent going southeast
-    purple_third_tangent = purple_alignment.add_tangent("73+62.55", "91+37.23", name="Third Tangent")
-
-    # Add the curve near Del Mar Heights Road
-    purple_third_curve = purple_alignment.add_curve(
-        ts_station="91+37.23",
-        sc_station="94+37.23",
-        cs_station="108+41.79",
-        st_station="111+41.79",
-        degree_of_curve="1 06'00\"",
-        direction="left",
-        name="Third Curve"
-    )
-
-    # Add fourth tangent 
-    purple_fourth_tangent = purple_alignment.add_tangent("111+41.79", "114+31.56", name="Fourth Tangent")
-    #purple_fourth_tangent.manual_bearing = 150  # More southerly direction
-
-    # Add fourth curve to align with endpoint
-    purple_fourth_curve = purple_alignment.add_curve(
-        ts_station="114+31.56",
-        sc_station="117+01.56",
-        cs_station="152+41.45",
-        st_station="155+11.45",
-        degree_of_curve="1 03'30\"",
-        direction="right",
-        name="Fourth Curve"
-    )
-
-    # Add fifth tangent to reach the end point
-    purple_fifth_tangent = purple_alignment.add_tangent("155+11.45", "183+01.22", name="Fifth Tangent")
-
-    # Add fifth curve
-    purple_fifth_curve = purple_alignment.add_curve(
-        ts_station="183+01.22",
-        sc_station="188+81.22",
-        cs_station="197+17.88",
-        st_station="202+97.88",
-        degree_of_curve="0 30'00\"",
-        direction="right",
-        name="Fifth Curve"
-    )
-
-    # Add sixth tangent
-    purple_sixth_tangent = purple_alignment.add_tangent("202+97.88", "226+46.37", name="Sixth Tangent")
-    purple_sixth_tangent.manual_bearing = 133  # More southerly direction
-
-    # Add sixth curve
-    purple_sixth_curve = purple_alignment.add_curve(
-        ts_station="226+46.37",
-        sc_station="233+26.37",
-        cs_station="237.58+89",
-        st_station="244+38.89",
-        degree_of_curve="0 49'35\"",
-        direction="left",
-        name="Sixth Curve"
-    )
-
-    purple_seventh_tangent = purple_alignment.add_tangent("244+38.89", "280+89.19", name="Seventh Tangent")
-    #purple_seventh_tangent.manual_bearing = 160  # More southerly direction
-
-    
-
-    # === GREEN TRACK ENGINEERING MODEL ===
-    # Create the green track using the engineering specifications based on the purple track
-    
-    # Create a new Railway Alignment for the Green route
-    green_alignment = RailwayAlignment(name="Green Route: Del Mar Bluffs Double-Track", color="green")
-    
-    # Add reference points for the green track
-    green_sta_500_coords = (32.9731225, -117.2667758)  # 5+00 station
-    #green_sta_1000_coords = (32.9716252, -117.2664515)  # 10+00 station (mannually edited)
-    green_sta_1000_coords = (32.9717752, -117.2664515)  # 10+00 station
-    
-    green_alignment.add_reference_point("STA_500", green_sta_500_coords, 500)
-    green_alignment.add_reference_point("STA_1000", green_sta_1000_coords, 1000)
-    
-    # Calculate track parameters directly using the engineering_coords function
-    # This ensures precise alignment between reference points
-    green_track_params = calculate_track_parameters(
-        point1=green_sta_500_coords,
-        station1=500,
-        point2=green_sta_1000_coords,
-        station2=1000
-    )
-    
-    # Define segments for the Green route - initial tangent
-    # First tangent from STA_500 to STA_1000 (exactly between reference points)
-    green_first_tangent = green_alignment.add_tangent("5+00", "10+00", name="Initial Reference Tangent")
-    
-    # Continue with the rest of the alignment
-    green_pre_tangent = green_alignment.add_tangent("10+00", "12+05.15", name="Pre-Curve Tangent")
-    
-    green_pre_curve = green_alignment.add_curve(
-        ts_station="12+05.15",
-        sc_station="14+15.15",
-        cs_station="17+79.87",
-        st_station="19+89.87",
-        degree_of_curve="0 40'00\"",
-        direction="left",
-        name="First Curve"
-    )
-    
-    # Add first curve (gentle curve to follow bluffs)
-    green_first_curve = green_alignment.add_curve(
-        ts_station="19+89.87",
-        sc_station="35+22.79",
-        cs_station="36+28.04",
-        st_station="37+28.04",
-        degree_of_curve="2 55'00\"", #2 09'01
-        direction="left",
-        name="First Curve"
-    )
-    
-    # Add second tangent
-    green_second_tangent = green_alignment.add_tangent("37+28.04", "53+08.78", name="Second Tangent")
-    #green_second_tangent.manual_bearing = 178.5
-    
-    # Add second curve
-    green_second_curve = green_alignment.add_curve(
-        ts_station="53+08.78",
-        sc_station="55+58.78",
-        cs_station="60+27.97",
-        st_station="62+77.96",
-        degree_of_curve="4 09'00\"",
-        direction="right",
-        name="Second Curve"
-    )
-    
-    # Add third tangent
-    green_third_tangent = green_alignment.add_tangent("62+77.96", "71+41.19", name="Third Tangent")
-    
-    # Add third curve
-    green_third_curve = green_alignment.add_curve(
-        ts_station="71+41.19",
-        sc_station="73+81.19",
-        cs_station="76+68.70",
-        st_station="79+08.70",
-        degree_of_curve="1 20'00\"",
-        direction="right",
-        name="Third Curve"
-    )
-    
-    # Add fourth tangent
-    green_fourth_tangent = green_alignment.add_tangent("79+08.70", "101+45.73", name="Fourth Tangent")
-    green_fourth_tangent.manual_bearing = 161
-    
-    # Add fourth curve
-    green_fourth_curve = green_alignment.add_curve(
-        ts_station="101+45.73",
-        sc_station="105+05.73",
-        cs_station="109+96.76",
-        st_station="113+56.76",
-        degree_of_curve="0 44'35\"",
-        direction="left",
-        name="Fourth Curve"
-    )
-    
-    # Add fifth tangent
-    green_fifth_tangent = green_alignment.add_tangent("113+56.76", "129+11.51", name="Fifth Tangent")
-    
-    # Add fifth curve
-    green_fifth_curve = green_alignment.add_curve(
-        ts_station="129+11.51",
-        sc_station="131+61.51",
-        cs_station="138+79.54",
-        st_station="141+29.54",
-        degree_of_curve="2 45'00\"", #3 07'00
-        direction="right",
-        name="Fifth Curve"
-    )
-    
-    # Add sixth tangent
-    green_sixth_tangent = green_alignment.add_tangent("141+29.54", "187+10.02", name="Sixth Tangent")
-    #green_sixth_tangent.manual_bearing = 135
-    
-    # Add sixth curve
-    green_sixth_curve = green_alignment.add_curve(
-        ts_station="187+10.02",
-        sc_station="192+90.02",
-        cs_station="201+26.67",
-        st_station="207+06.67",
-        degree_of_curve="0 30'00\"",
-        direction="right",
-        name="Sixth Curve"
-    )
-    
-    # Add seventh tangent
-    green_seventh_tangent = green_alignment.add_tangent("207+06.67", "230+55.17", name="Seventh Tangent")
-    
-    # Add seventh curve
-    green_seventh_curve = green_alignment.add_curve(
-        ts_station="230+55.17",
-        sc_station="237+35.17",
-        cs_station="241+67.68",
-        st_station="248+47.68",
-        degree_of_curve="0 45'35\"",
-        direction="left",
-        name="Seventh Curve"
-    )
-
-    # Add eighth tangent
-    green_eighth_tangent = green_alignment.add_tangent("248+47.68", "284+97.94", name="Eighth Tangent")
-
-
-    # === NORTHERN YELLOW TRACK ENGINEERING MODEL ===
-    # Create the Northern Yellow track following the San Dieguito River path shown in the image
-    
-    # Create a new Railway Alignment for the Northern Yellow route with orange color
-    northern_yellow_alignment = RailwayAlignment(name="Northern Yellow Route", color="orange")
-    
-    # Use the same reference points as the original Yellow track
-    northern_yellow_alignment.add_reference_point("STA_2000", station_2000_coords, 2000)
-    northern_yellow_alignment.add_reference_point("STA_2500", station_2500_coords, 2500)
-    
-    # Calculate track parameters based on reference points - same as yellow track
-    northern_yellow_track_params = yellow_alignment.calculate_track_params("STA_2000", "STA_2500")
-    
-    # Define segments for the Northern Yellow route
-    # Start further back with initial tangent from the coast
-    northern_yellow_first_tangent = northern_yellow_alignment.add_tangent("10+00", "19+00", name="First Tangent")
-    
-    # First curve to approach the river
-    northern_yellow_first_curve = northern_yellow_alignment.add_curve(
-        ts_station="19+00",
-        sc_station="22+00",
-        cs_station="25+00",
-        st_station="28+00",
-        degree_of_curve="9 00'00\"",
-        direction="right",
-        name="First Curve"
-    )
-    
-    # Second tangent (along Del Mar Fairgrounds)
-    northern_yellow_second_tangent = northern_yellow_alignment.add_tangent("28+00", "35+00", name="Second Tangent")
-    
-    # Second curve
-    northern_yellow_river_curve = northern_yellow_alignment.add_curve(
-        ts_station="35+00",
-        sc_station="37+00",
-        cs_station="40+00",
-        st_station="43+00",
-        degree_of_curve="7 00'00\"",
-        direction="right",
-        name="Second Curve"
-    )
-    
-    # Third tangent (along the south side of Del Mar Racing)
-    northern_yellow_third_tangent = northern_yellow_alignment.add_tangent("43+00", "65+00", name="Third Tangent")
-    northern_yellow_third_tangent.manual_bearing = 75
-
-    # Third curve
-    northern_yellow_third_curve = northern_yellow_alignment.add_curve(
-        ts_station="65+00",
-        sc_station="68+00",
-        cs_station="73+00",
-        st_station="76+00",
-        degree_of_curve="9 30'00\"",
-        direction="left",
-        name="Third Curve"
-    )
-
-    # Fourth Tangent
-    northern_yellow_fourth_tangent = northern_yellow_alignment.add_tangent("76+00", "120+00", name="Fourth Tangent")
-    northern_yellow_fourth_tangent.manual_bearing = 163
-    
-    # Fourth spiral-curve-spiral segment
-    northern_yellow_fourth_curve = northern_yellow_alignment.add_curve(
-        ts_station="120+00",
-        sc_station="125+00",
-        cs_station="126+00",
-        st_station="131+00",
-        degree_of_curve="2 00'00\"",
-        direction="left",
-        name="Fourth Curve"
-    )
-    
-    # Fifth tangent segment
-    northern_yellow_fifth_tangent = northern_yellow_alignment.add_tangent("123+62.32", "175+59.46", name="Fifth Tangent")
-    northern_yellow_fifth_tangent.manual_bearing = 171  # Southeast direction (0=North, 90=East, 180=South)
-    
-    # Fifth spiral-curve-spiral segment
-    northern_yellow_fifth_curve = northern_yellow_alignment.add_curve(
-        ts_station="175+59.46",
-        sc_station="182+09.46",
-        cs_station="188+18.79",
-        st_station="194+68.79",
-        degree_of_curve="0 44'30\"",
-        direction="left",
-        name="Fifth Curve"
-    )
-    
-    # Sixth tangent segment
-    northern_yellow_sixth_tangent = northern_yellow_alignment.add_tangent("194+68.79", "209+22.24", name="Sixth Tangent")
-    
-    # Sixth spiral-curve-spiral segment (MT1 CURVE #6)
-    northern_yellow_sixth_curve = northern_yellow_alignment.add_curve(
-        ts_station="209+22.24", 
-        sc_station="215+72.24",
-        cs_station="221+28.94", 
-        st_station="227+78.94",
-        degree_of_curve="0 44'30\"",
-        direction="right",
-        name="Sixth Curve (MT1 CURVE #6)"
-    )
-    
-    # Seventh tangent segment
-    northern_yellow_seventh_tangent = northern_yellow_alignment.add_tangent("227+78.94", "248+49.79", name="Seventh Tangent")
-    
-    # Seventh spiral-curve-spiral segment (CURVE #7)
-    northern_yellow_seventh_curve = northern_yellow_alignment.add_curve(
-        ts_station="248+49.79", 
-        sc_station="255+29.79",
-        cs_station="288+32.84", 
-        st_station="295+12.84",
-        degree_of_curve="0 49'11\"",
-        direction="right",
-        name="Seventh Curve"
-    )
-    
-    # Eighth tangent segment
-    northern_yellow_eighth_tangent = northern_yellow_alignment.add_tangent("295+12.84", "298+53.12", name="Eighth Tangent")
-    
-    # Eighth spiral-curve-spiral segment (CURVE #8)
-    northern_yellow_eighth_curve = northern_yellow_alignment.add_curve(
-        ts_station="298+53.12", 
-        sc_station="300+93.12",
-        cs_station="307+53.38", 
-        st_station="309+93.38",
-        degree_of_curve="0 15'00\"",
-        direction="right",
-        name="Eighth Curve"
-    )
-    
-    # Ninth tangent segment
-    northern_yellow_ninth_tangent = northern_yellow_alignment.add_tangent("309+93.38", "317+93.02", name="Ninth Tangent")
     # Add CSS to disable hover/tooltips on original polylines
     css = """
     <style>
@@ -1018,107 +566,88 @@ with main_content:
     # Add all portals to the map
     for portal in portals:
         portal.add_to_map(m)
-    
+
+    # Mount the four route overlays on one FeatureGroup in a dedicated
+    # pane: a single layer-tree entry and redraw path for all of them,
+    # with one zIndex to manage. The yellow-bridge overlay stays on the
+    # default overlay pane so its hover CSS keeps working.
+    folium.map.CustomPane("routes", z_index=400).add_to(m)
+    routes_group = folium.FeatureGroup(name="Route Overlays")
+
     # Add an animated green path overlay
     if green_alignment.all_coords:
-        # Add a solid base line
-        folium.PolyLine(
-            locations=green_alignment.all_coords,
-            color='green',
-            weight=7,
-            opacity=0.7,
-            tooltip="Green Route: Del Mar Bluffs Double-Track"
-        ).add_to(m)
-        
-        # Add animated path
+        # Single animated polyline (thick AntPath, wide dashes)
         AntPath(
-            locations=green_alignment.all_coords,
-            dash_array=[10, 20],
+            locations=simplify_for_antpath(green_alignment.all_coords),
+            dash_array=[20, 30],
             delay=800,
             color='green',
             pulseColor='white',
             paused=False,
-            weight=5,
+            hardware_acceleration=True,  # CSS-driven dashes instead of JS setInterval ticks
+            weight=7,
             opacity=0.9,
             tooltip="Green Route: Del Mar Bluffs Double-Track",
+            pane="routes",
             className="green-route-overlay"  # Special class to allow hover
-        ).add_to(m)
+        ).add_to(routes_group)
     
     # Add an animated blue path overlay
     if blue_alignment.all_coords:
-        # Add a solid base line
-        folium.PolyLine(
-            locations=blue_alignment.all_coords,
-            color='blue',
-            weight=7,
-            opacity=0.7,
-            tooltip="Blue Route: Under Crest Canyon"
-        ).add_to(m)
-        
-        # Add animated path
+        # Single animated polyline (thick AntPath, wide dashes)
         AntPath(
-            locations=blue_alignment.all_coords,
-            dash_array=[10, 20],
+            locations=simplify_for_antpath(blue_alignment.all_coords),
+            dash_array=[20, 30],
             delay=800,
             color='blue',
             pulseColor='white',
             paused=False,
-            weight=5,
+            hardware_acceleration=True,  # CSS-driven dashes instead of JS setInterval ticks
+            weight=7,
             opacity=0.9,
             tooltip="Blue Route: Under Crest Canyon",
+            pane="routes",
             className="blue-route-overlay"  # Special class to allow hover
-        ).add_to(m)
+        ).add_to(routes_group)
     
     # Add an animated purple path overlay
     if purple_alignment.all_coords:
-        # Add a solid base line
-        folium.PolyLine(
-            locations=purple_alignment.all_coords,
-            color='magenta',
-            weight=7,
-            opacity=0.7,
-            tooltip="Purple Route: Under Camino Del Mar"
-        ).add_to(m)
-        
-        # Add animated path
+        # Single animated polyline (thick AntPath, wide dashes)
         AntPath(
-            locations=purple_alignment.all_coords,
-            dash_array=[10, 20],
+            locations=simplify_for_antpath(purple_alignment.all_coords),
+            dash_array=[20, 30],
             delay=800,
             color='magenta',
             pulseColor='white',
             paused=False,
-            weight=5,
+            hardware_acceleration=True,  # CSS-driven dashes instead of JS setInterval ticks
+            weight=7,
             opacity=0.9,
             tooltip="Purple Route: Under Camino Del Mar",
+            pane="routes",
             className="purple-route-overlay"  # Special class to allow hover
-        ).add_to(m)
+        ).add_to(routes_group)
     
     # Add animated path for the Northern Yellow track
     if northern_yellow_alignment.all_coords:
-        # Add a solid base line
-        folium.PolyLine(
-            locations=northern_yellow_alignment.all_coords,
-            color='orange',
-            weight=7,
-            opacity=0.7,
-            tooltip="Northern Yellow Route"
-        ).add_to(m)
-        
-        # Add animated path
+        # Single animated polyline (thick AntPath, wide dashes)
         AntPath(
-            locations=northern_yellow_alignment.all_coords,
-            dash_array=[10, 20],
+            locations=simplify_for_antpath(northern_yellow_alignment.all_coords),
+            dash_array=[20, 30],
             delay=800,
             color='orange',
             pulseColor='white',
             paused=False,
-            weight=5,
+            hardware_acceleration=True,  # CSS-driven dashes instead of JS setInterval ticks
+            weight=7,
             opacity=0.9,
             tooltip="Northern Yellow Route",
+            pane="routes",
             className="northern-yellow-route-overlay"  # Special class to allow hover
-        ).add_to(m)
-    
+        ).add_to(routes_group)
+
+    routes_group.add_to(m)
+
     # Add Jimmy Durante Blvd Portal marker on the blue track at station 26+00
     # Use the improved station_to_gis function with the alignment parameter
     from utils.engineering_coords import station_to_gis
@@ -1137,29 +666,10 @@ with main_content:
         alignment=blue_alignment  # Pass the alignment object
     )
     
-    print(f"Jimmy Durante Portal coordinates: {jimmy_durante_portal_point}")
+    logger.debug("Jimmy Durante Portal coordinates: %s", jimmy_durante_portal_point)
     
     # Define custom icon for the Jimmy Durante Portal
-    jimmy_durante_icon = folium.DivIcon(
-        icon_size=(30, 30),
-        icon_anchor=(15, 15),
-        html="""
-        <div style="
-            background-color: blue;
-            width: 24px;
-            height: 24px;
-            border-radius: 12px;
-            border: 3px solid white;
-            box-shadow: 0 0 10px rgba(0,0,0,0.5);
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-weight: bold;
-            font-size: 16px;
-        ">T</div>
-        """
-    )
+    jimmy_durante_icon = make_portal_icon("blue")
     
     # Add the marker to the map
     folium.Marker(
@@ -1186,30 +696,29 @@ with main_content:
         alignment=yellow_alignment  # Pass the alignment object
     )
     
-    print(f"Racetrack View Dr Portal coordinates at 82+00: {racetrack_portal_point}")
-    
-    # Find which segment is the Third Curve for the bridge segment
-    segment_index_limit = None
-    for i, segment in enumerate(yellow_alignment.segments):
-        if segment.type == "spiral_curve_spiral" and segment.name == "Third Curve":
-            segment_index_limit = i
-            break
+    logger.debug("Racetrack View Dr Portal coordinates at 82+00: %s", racetrack_portal_point)
     
+    # Find which segment is the Third Curve for the bridge segment. This
+    # scan and the prefix assembly below run inside build_base_map, so
+    # st.cache_resource already memoizes the result for the process - no
+    # per-rerun cost remains.
+    segment_index_limit = next(
+        (i for i, segment in enumerate(yellow_alignment.segments)
+         if segment.type == "spiral_curve_spiral" and segment.name == "Third Curve"),
+        None
+    )
+
     # Collect coordinates for "Yellow Track: Bridge" segment
     bridge_segment_coords = []
-    
+
     # If we found the Third Curve, collect all coordinates up to its SC point
     if segment_index_limit is not None:
-        # Add all coordinates from previous segments
-        for i in range(segment_index_limit):
-            bridge_segment_coords.extend(yellow_alignment.segment_coords[i])
-        
         # Get the SC point directly from the third curve - this is the Racetrack View Portal location
         third_curve = yellow_alignment.segments[segment_index_limit]
         sc_point = third_curve.sc_point
         
         # Debug print to verify coordinates
-        print(f"SC Point coordinates: {sc_point}")
+        logger.debug("SC Point coordinates: %s", sc_point)
         
         # For the third curve, we'll add ALL points from TS to a point BEYOND the SC point
         # and then trim it back to ensure we don't end short
@@ -1220,62 +729,52 @@ with main_content:
         # Take the first 40% of points to ensure we go beyond the SC point
         # (the entry spiral is typically about 30% of the total curve)
         points_to_include = int(len(third_curve_coords) * 0.4)
-        bridge_segment_coords.extend(third_curve_coords[:points_to_include])
-        
-        # Now determine which point in our collected coordinates is closest to the SC point
-        closest_idx = -1
-        min_distance = float('inf')
-        
-        # Start from the halfway point of our bridge segment to speed up the search
-        start_idx = len(bridge_segment_coords) // 2
-        for i in range(start_idx, len(bridge_segment_coords)):
-            point = bridge_segment_coords[i]
-            dx = point[0] - sc_point[0]
-            dy = point[1] - sc_point[1]
-            distance = dx*dx + dy*dy
-            
-            if distance < min_distance:
-                min_distance = distance
-                closest_idx = i
-        
+
+        # Assemble the prefix (all segments before the Third Curve plus the
+        # leading portion of the curve) as one contiguous array - a single
+        # sized allocation instead of growing a Python list point by point
+        arr = np.concatenate([
+            np.asarray(part, dtype=np.float64)
+            for part in (yellow_alignment.segment_coords[:segment_index_limit]
+                         + [third_curve_coords[:points_to_include]])
+            if len(part)
+        ])
+        sc = np.asarray(sc_point, dtype=np.float64)
+
+        # Now determine which point is closest to the SC point - one
+        # vectorized squared-distance pass over the whole prefix. The old
+        # start-at-the-halfway-point shortcut saved nothing once the scan
+        # was vectorized, and would silently pick the wrong vertex if the
+        # SC point ever fell in the first half.
+        diff = arr - sc
+        d2 = np.einsum('ij,ij->i', diff, diff)
+        closest_idx = int(d2.argmin())
+
         # Trim the bridge coordinates to end at the closest point to SC
-        if closest_idx > 0:
-            bridge_segment_coords = bridge_segment_coords[:closest_idx+1]
-        
-        # Always make sure the exact SC point is the last point
-        if not (bridge_segment_coords[-1][0] == sc_point[0] and bridge_segment_coords[-1][1] == sc_point[1]):
-            bridge_segment_coords.append(sc_point)
+        bridge_segment_coords = arr[:closest_idx+1]
+
+        # Always make sure the SC point is the last point - tolerance-based
+        # comparison rather than exact float equality, which can miss a
+        # match after the trig round trips that produced the curve coords
+        if not np.allclose(bridge_segment_coords[-1], sc):
+            bridge_segment_coords = np.vstack([bridge_segment_coords, sc])
             
         # Debug print to verify the endpoint
-        print(f"Bridge segment endpoint: {bridge_segment_coords[-1]}")
-        print(f"Bridge segment length: {len(bridge_segment_coords)} points")
+        logger.debug("Bridge segment endpoint: %s (%d points)",
+                     bridge_segment_coords[-1], len(bridge_segment_coords))
     
+    # All yellow-track sections share one FeatureGroup so the whole
+    # overlay attaches to the map as a single layer instead of a dozen
+    # independent top-level children
+    yellow_group = folium.FeatureGroup(name="Yellow Track")
+
     # Create a "Yellow Track: Bridge" overlay for the entire segment
     
-    if bridge_segment_coords:
-        # Add a solid, thick line first to completely cover the original
-        yellow_bridge_line = folium.PolyLine(
-            locations=bridge_segment_coords,
-            color='#FFD700',
-            weight=9,  # Extra thick to ensure complete coverage
-            opacity=1.0,
-            tooltip="Yellow Track: Bridge",
-            className="yellow-bridge-overlay"  # Special class to allow hover
-        ).add_to(m)
-        
-        # Add animated path on top with the same special class
-        AntPath(
-            locations=bridge_segment_coords,
-            dash_array=[10, 20],
-            delay=800,
-            color='#FFD700',
-            pulseColor='#FFFFFF',
-            paused=False,
-            weight=5,  # Slightly thicker to ensure it's on top
-            opacity=0.95,
-            tooltip="Yellow Track: Bridge",
-            className="yellow-bridge-overlay"  # Special class to allow hover
-        ).add_to(m)
+    # The special class allows hover through the pointer-events CSS
+    add_yellow_overlay(yellow_group, bridge_segment_coords, "Yellow Track: Bridge",
+                       classname="yellow-bridge-overlay",
+                       ant_classname="yellow-bridge-overlay",
+                       delay=800, ant_opacity=0.95)
     
     # Add animated paths for the rest of the alignment (after the bridge section)
     if segment_index_limit is not None:
@@ -1288,316 +787,144 @@ with main_content:
         exit_spiral_length = third_curve.exit_spiral_length
         total_curve_length = entry_spiral_length + circular_arc_length + exit_spiral_length
         
-        # Calculate approximately how many points to include for each portion
+        # Calculate approximately how many points to include for each portion.
+        # The portion boundaries are computed once here and reused below for
+        # the bored-tunnel assembly.
+        exit_spiral_coords = []
+        exit_spiral_start = 0
         if len(third_curve_coords) > 0:
             points_per_unit = len(third_curve_coords) / total_curve_length
             entry_spiral_points = int(entry_spiral_length * points_per_unit)
             circular_arc_points = int(circular_arc_length * points_per_unit)
-            
+
             # Extract the circular curve coordinates (for Cut and Cover tunnel)
             circular_curve_start = entry_spiral_points
             circular_curve_end = entry_spiral_points + circular_arc_points
             circular_curve_coords = third_curve_coords[circular_curve_start:circular_curve_end]
-            
+
             # Extract the exit spiral coordinates
-            exit_spiral_coords = third_curve_coords[circular_curve_end:]
+            exit_spiral_start = circular_curve_end
+            exit_spiral_coords = third_curve_coords[exit_spiral_start:]
             
             # Add the remaining portion of the entry spiral (after the portal)
             entry_spiral_after_portal = third_curve_coords[entry_spiral_points//2:entry_spiral_points]
-            if entry_spiral_after_portal:
-                AntPath(
-                    locations=entry_spiral_after_portal,
-                    dash_array=[10, 20],
-                    delay=600,
-                    color='#FFD700',
-                    pulseColor='#FFFFFF',
-                    paused=False,
-                    weight=5,
-                    opacity=0.9,
-                    tooltip=f"{third_curve.name} - Entry Spiral"
-                ).add_to(m)
+            add_yellow_overlay(yellow_group, entry_spiral_after_portal,
+                               f"{third_curve.name} - Entry Spiral", solid=False)
             
             # Add the circular curve with Cut and Cover tunnel label but same appearance
-            if circular_curve_coords:
-                yellow_cut_and_cover_line_1 = folium.PolyLine(
-                    locations=circular_curve_coords,
-                    color='#FFD700',
-                    weight=9,  # Extra thick to ensure complete coverage
-                    opacity=1.0,
-                    tooltip="Yellow Track: Cut and Cover Tunnel",
-                    className="yellow-cut-and-cover-overlay"  # Special class to allow hover
-                ).add_to(m)
-                
-                AntPath(
-                    locations=circular_curve_coords,
-                    dash_array=[10, 20],
-                    delay=600,
-                    color='#FFD700',
-                    pulseColor='#FFFFFF',
-                    paused=False,
-                    weight=5,
-                    opacity=0.9,
-                    tooltip="Yellow Track: Cut and Cover Tunnel",
-                    className="yellow-cut-and-cover-overlay"
-                ).add_to(m)
+            add_yellow_overlay(yellow_group, circular_curve_coords,
+                               _TT_CUT_AND_COVER,
+                               classname="yellow-cut-and-cover-overlay",
+                               ant_classname="yellow-cut-and-cover-overlay")
             
             # Add the exit spiral
-            if exit_spiral_coords:
-                yellow_bored_tunnel_line = folium.PolyLine(
-                    locations=exit_spiral_coords,
-                    color='#FFD700',
-                    weight=9,  # Extra thick to ensure complete coverage
-                    opacity=1.0,
-                    tooltip="Yellow Track: Bored Tunnel",
-                ).add_to(m)
-
-                AntPath(
-                    locations=exit_spiral_coords,
-                    dash_array=[10, 20],
-                    delay=600,
-                    color='#FFD700',
-                    pulseColor='#FFFFFF',
-                    paused=False,
-                    weight=5,
-                    opacity=0.9,
-                    tooltip="Yellow Track: Bored Tunnel"
-                ).add_to(m)
+            add_yellow_overlay(yellow_group, exit_spiral_coords, _TT_BORED_TUNNEL)
         
         
         # Combine all remaining segments after the cut and cover tunnel into one "Bored Tunnel" segment
         if segment_index_limit is not None:
-            # Collect all coordinates from remaining segments
-            bored_tunnel_coords = []
+            # Collect the contributing coordinate runs; they are joined
+            # into one contiguous array only when the tunnel is emitted,
+            # instead of growing a flat list with repeated extend calls
+            bored_tunnel_parts = []
             
-            # First add the exit spiral of the third curve if not already added
-            if segment_index_limit < len(yellow_alignment.segments) and not exit_spiral_coords:
-                third_curve = yellow_alignment.segments[segment_index_limit]
-                third_curve_coords = yellow_alignment.segment_coords[segment_index_limit]
-                
-                # Calculate segment boundaries
-                points_per_unit = len(third_curve_coords) / total_curve_length
-                entry_spiral_points = int(entry_spiral_length * points_per_unit)
-                circular_arc_points = int(circular_arc_length * points_per_unit)
-                exit_spiral_start = entry_spiral_points + circular_arc_points
-                
-                # Add exit spiral points
-                bored_tunnel_coords.extend(third_curve_coords[exit_spiral_start:])
+            # First add the exit spiral of the third curve if not already added,
+            # reusing the portion boundary computed above
+            if segment_index_limit < len(yellow_alignment.segments) and not len(exit_spiral_coords):
+                bored_tunnel_parts.append(third_curve_coords[exit_spiral_start:])
         
             # Add a flag to track if we've already processed the 7th tangent
             processed_seventh_tangent = False
-        
-        # Then add all remaining segments
+
+        # Locate the Seventh Curve once - the portal marker and the
+        # after-the-curve styling below both need it, and scanning for it
+        # inside the segment loop made the walk quadratic in segment count
+        seventh_curve_index = next(
+            (j for j, s in enumerate(yellow_alignment.segments)
+             if s.type == "spiral_curve_spiral" and s.name == "Seventh Curve"),
+            None
+        )
+        i5_knoll_portal_point = (
+            yellow_alignment.segments[seventh_curve_index].ts_point
+            if seventh_curve_index is not None else None
+        )
+
+        # Classify the remaining segments into a flat render plan first,
+        # then emit the overlays from the plan. The stateful walk (the
+        # bored-tunnel accumulation, the Seventh Tangent split) only slices
+        # coordinate lists; the rendering pass is a uniform dispatch.
+        render_plan = []
         for i in range(segment_index_limit + 1, len(yellow_alignment.segments)):
             segment = yellow_alignment.segments[i]
             segment_coords = yellow_alignment.segment_coords[i]
-            
+
             # Special handling for the 7th tangent - split it into two halves
             if segment.type == "tangent" and segment.name == "Seventh Tangent":
                 # Set the flag to indicate we've processed the 7th tangent
                 processed_seventh_tangent = True
-                
-                # Find the next segment (7th curve)
-                i5_knoll_portal_point = None
-                for j, next_segment in enumerate(yellow_alignment.segments):
-                    if next_segment.type == "spiral_curve_spiral" and next_segment.name == "Seventh Curve":
-                        # Get the TS point of the 7th curve as the I-5 Knoll Portal location
-                        i5_knoll_portal_point = next_segment.ts_point
-                        break
-                
+
                 # Calculate the midpoint
                 midpoint_index = len(segment_coords) // 2
-                
+
                 # First half of 7th tangent - add to bored tunnel
-                first_half_coords = segment_coords[:midpoint_index]
-                bored_tunnel_coords.extend(first_half_coords)
-                
-                # Second half of 7th tangent - add as separate "Cut and Cover Tunnel" segment
+                bored_tunnel_parts.append(segment_coords[:midpoint_index])
+
+                # Second half of 7th tangent - a separate "Cut and Cover
+                # Tunnel" segment, hoverable through the pointer-events CSS.
                 # Only goes to the end of the tangent (beginning of 7th curve)
-                second_half_coords = segment_coords[midpoint_index:]
-                
-                # Add the second half as a Cut and Cover Tunnel segment
-                yellow_cut_and_cover_line_2 = folium.PolyLine(
-                    locations=second_half_coords,
-                    color='#FFD700',
-                    weight=9,  # Extra thick to ensure complete coverage
-                    opacity=1.0,
-                    tooltip="Yellow Track: Cut and Cover Tunnel",
-                    className="yellow-cut-and-cover-overlay"  # Special class to allow hover
-                ).add_to(m)
-                
-                AntPath(
-                    locations=second_half_coords,
-                    dash_array=[10, 20],
-                    delay=600,
-                    color='#FFD700',
-                    pulseColor='#FFFFFF',
-                    paused=False,
-                    weight=5,
-                    opacity=0.9,
-                    tooltip="Yellow Track: Cut and Cover Tunnel"
-                ).add_to(m)
-                
+                render_plan.append(("cut_and_cover_hover", segment_coords[midpoint_index:]))
+
                 # Add the I-5 Knoll Portal marker at the end of the cut and cover segment
                 if i5_knoll_portal_point:
-                    # Define custom icon for the I-5 Knoll Portal
-                    knoll_portal_icon = folium.DivIcon(
-                        icon_size=(30, 30),
-                        icon_anchor=(15, 15),
-                        html="""
-                        <div style="
-                            background-color: #B8860B;
-                            width: 24px;
-                            height: 24px;
-                            border-radius: 12px;
-                            border: 3px solid white;
-                            box-shadow: 0 0 10px rgba(0,0,0,0.5);
-                            display: flex;
-                            align-items: center;
-                            justify-content: center;
-                            color: white;
-                            font-weight: bold;
-                            font-size: 16px;
-                        ">T</div>
-                        """
-                    )
-                    
-                    folium.Marker(
-                        location=i5_knoll_portal_point,
-                        tooltip="I-5 Knoll Portal",
-                        popup="<b>I-5 Knoll Portal</b>",
-                        icon=knoll_portal_icon
-                    ).add_to(m)
-                
+                    render_plan.append(("knoll_portal", i5_knoll_portal_point))
+
                 # Since we've reached the 2nd cut and cover segment, stop adding segments to the bored tunnel
-                # Add the bored tunnel segment now
-                if bored_tunnel_coords:
-                    yellow_bored_tunnel_line_2 = folium.PolyLine(
-                        locations=bored_tunnel_coords,
-                        color='#FFD700',
-                        weight=9,  # Extra thick to ensure complete coverage
-                        opacity=1.0,
-                        tooltip="Yellow Track: Bored Tunnel",
-                    ).add_to(m)
-        
-                    AntPath(
-                        locations=bored_tunnel_coords,
-                        dash_array=[10, 20],
-                        delay=600,
-                        color='#FFD700',
-                        pulseColor='#FFFFFF',
-                        paused=False,
-                        weight=5,
-                        opacity=0.9,
-                        tooltip="Yellow Track: Bored Tunnel"
-                    ).add_to(m)
-                
-                # Clear the bored tunnel coordinates as we don't want to add any more segments to it
-                bored_tunnel_coords = []
+                # Emit the bored tunnel segment now - one concatenate sizes
+                # and fills the full buffer in a single pass
+                parts = [np.asarray(p, dtype=np.float64)
+                         for p in bored_tunnel_parts if len(p)]
+                if parts:
+                    render_plan.append(("bored_tunnel", np.concatenate(parts)))
+
+                # Clear the parts as we don't want to add any more segments to the tunnel
+                bored_tunnel_parts = []
             elif not processed_seventh_tangent:
                 # For segments before the 7th tangent, add to bored tunnel
-                bored_tunnel_coords.extend(segment_coords)
+                bored_tunnel_parts.append(segment_coords)
             elif segment.type == "spiral_curve_spiral" and segment.name == "Seventh Curve":
-                # Handle the seventh curve separately (not part of cut and cover)
-                
-                # Split the curve into two halves
+                # Handle the seventh curve separately (not part of cut and
+                # cover): first half "U-Section", second half basic track
                 midpoint_index = len(segment_coords) // 2
-                first_half_coords = segment_coords[:midpoint_index]
-                second_half_coords = segment_coords[midpoint_index:]
-                
-                # Add the first half as "U-Section"
-                yellow_u_section_line = folium.PolyLine(
-                    locations=first_half_coords,
-                    color='#FFD700',
-                    weight=9,  # Extra thick to ensure complete coverage
-                    opacity=1.0,
-                    tooltip="Yellow Track: U-Section",
-                ).add_to(m)
-                
-                AntPath(
-                    locations=first_half_coords,
-                    dash_array=[10, 20],
-                    delay=600,
-                    color='#FFD700',
-                    pulseColor='#FFFFFF',
-                    paused=False,
-                    weight=5,
-                    opacity=0.9,
-                    tooltip="Yellow Track: U-Section"
-                ).add_to(m)
-                
-                # Add the second half as "Bored Tunnel"
-                yellow_bored_tunnel_line_curve7 = folium.PolyLine(
-                    locations=second_half_coords,
-                    color='#FFD700',
-                    weight=9,  # Extra thick to ensure complete coverage
-                    opacity=1.0,
-                    tooltip="Yellow Track",
-                ).add_to(m)
-                
-                AntPath(
-                    locations=second_half_coords,
-                    dash_array=[10, 20],
-                    delay=600,
-                    color='#FFD700',
-                    pulseColor='#FFFFFF',
-                    paused=False,
-                    weight=5,
-                    opacity=0.9,
-                    tooltip="Yellow Track"
-                ).add_to(m)
+                render_plan.append(("u_section", segment_coords[:midpoint_index]))
+                render_plan.append(("plain", segment_coords[midpoint_index:]))
+            elif seventh_curve_index is not None and i > seventh_curve_index:
+                # Segments after the U-Section (second half of 7th curve) are basic track
+                render_plan.append(("plain", segment_coords))
             else:
-                # For segments after the 7th curve, add them with the appropriate styling
-                is_after_seventh_curve = False
-                
-                # Check if we're past the 7th curve
-                for j, check_segment in enumerate(yellow_alignment.segments):
-                    if check_segment.type == "spiral_curve_spiral" and check_segment.name == "Seventh Curve":
-                        is_after_seventh_curve = i > j
-                        break
-                
-                # All segments after the 7th curve should be plain "Yellow Track" segments
-                if is_after_seventh_curve:
-                    # For segments after the U-Section (second half of 7th curve), add as basic track
-                    yellow_segment_line = folium.PolyLine(
-                        locations=segment_coords,
-                        color='#FFD700',
-                        weight=9,  # Extra thick to ensure complete coverage
-                        opacity=1.0,
-                        tooltip="Yellow Track",
-                    ).add_to(m)
-                    
-                    AntPath(
-                        locations=segment_coords,
-                        dash_array=[10, 20],
-                        delay=600,
-                        color='#FFD700',
-                        pulseColor='#FFFFFF',
-                        paused=False,
-                        weight=5,
-                        opacity=0.9,
-                        tooltip="Yellow Track"
-                    ).add_to(m)
-                else:
-                    # For segments between the 1st and 2nd cut and cover tunnels, maintain as cut and cover
-                    yellow_segment_line = folium.PolyLine(
-                        locations=segment_coords,
-                        color='#FFD700',
-                        weight=9,  # Extra thick to ensure complete coverage
-                        opacity=1.0,
-                        tooltip="Yellow Track: Cut and Cover Tunnel",
-                    ).add_to(m)
-                    
-                    AntPath(
-                        locations=segment_coords,
-                        dash_array=[10, 20],
-                        delay=600,
-                        color='#FFD700',
-                        pulseColor='#FFFFFF',
-                        paused=False,
-                        weight=5,
-                        opacity=0.9,
-                        tooltip="Yellow Track: Cut and Cover Tunnel"
-                    ).add_to(m)
+                # For segments between the 1st and 2nd cut and cover tunnels, maintain as cut and cover
+                render_plan.append(("cut_and_cover", segment_coords))
+
+        renderers = {
+            "plain": lambda coords: add_yellow_overlay(
+                yellow_group, coords, _TT_YELLOW),
+            "u_section": lambda coords: add_yellow_overlay(
+                yellow_group, coords, _TT_U_SECTION),
+            "bored_tunnel": lambda coords: add_yellow_overlay(
+                yellow_group, coords, _TT_BORED_TUNNEL),
+            "cut_and_cover": lambda coords: add_yellow_overlay(
+                yellow_group, coords, _TT_CUT_AND_COVER),
+            "cut_and_cover_hover": lambda coords: add_yellow_overlay(
+                yellow_group, coords, _TT_CUT_AND_COVER,
+                classname="yellow-cut-and-cover-overlay"),
+            "knoll_portal": lambda point: folium.Marker(
+                location=point,
+                tooltip="I-5 Knoll Portal",
+                popup="<b>I-5 Knoll Portal</b>",
+                icon=make_portal_icon("#B8860B")
+            ).add_to(m),
+        }
+        for kind, payload in render_plan:
+            renderers[kind](payload)
         
         # We've already rendered the bored tunnel segment earlier when we reached the 2nd cut and cover tunnel
         # So we don't need to render it again here
@@ -1607,7 +934,7 @@ with main_content:
         #        color='#FFD700',
         #        weight=9,  # Extra thick to ensure complete coverage
         #        opacity=1.0,
-        #        tooltip="Yellow Track: Bored Tunnel",
+        #        tooltip=_TT_BORED_TUNNEL,
         #    ).add_to(m)
         #
         #    AntPath(
@@ -1619,217 +946,213 @@ with main_content:
         #        paused=False,
         #        weight=5,
         #        opacity=0.9,
-        #        tooltip="Yellow Track: Bored Tunnel"
+        #        tooltip=_TT_BORED_TUNNEL
         #    ).add_to(m)
     
-    print("\nBearings at key points in railway alignment:")
-    for i, segment in enumerate(yellow_alignment.segments):
-        if segment.type == "tangent":
-            bearing_str = f"{segment.manual_bearing}° (manual)" if segment.manual_bearing is not None else "calculated"
-            print(f"Tangent {i+1} ({segment.name}): {bearing_str}")
-        elif segment.type == "spiral_curve_spiral":
-            print(f"Curve {i+1} ({segment.name}):")
-            print(f"  TS bearing: {segment.ts_bearing:.2f}°")
-            print(f"  SC bearing: {segment.sc_bearing:.2f}°")
-            print(f"  CS bearing: {segment.cs_bearing:.2f}°")
-            print(f"  ST bearing: {segment.st_bearing:.2f}°")
-            print(f"  Direction: {segment.direction}")
-            print(f"  Radius: {segment.radius_ft:.2f} ft")
-            print(f"  Degree of curve: {segment.degree_value:.4f}°")
+    yellow_group.add_to(m)
+
+    # Bearings dump for debugging - the f-strings are only built (and
+    # stdout only touched, once) when debug logging is actually enabled
+    if logger.isEnabledFor(logging.DEBUG):
+        lines = ["Bearings at key points in railway alignment:"]
+        for i, segment in enumerate(yellow_alignment.segments):
+            if segment.type == "tangent":
+                bearing_str = f"{segment.manual_bearing}° (manual)" if segment.manual_bearing is not None else "calculated"
+                lines.append(f"Tangent {i+1} ({segment.name}): {bearing_str}")
+            elif segment.type == "spiral_curve_spiral":
+                lines.append(f"Curve {i+1} ({segment.name}):")
+                lines.append(f"  TS bearing: {segment.ts_bearing:.2f}°")
+                lines.append(f"  SC bearing: {segment.sc_bearing:.2f}°")
+                lines.append(f"  CS bearing: {segment.cs_bearing:.2f}°")
+                lines.append(f"  ST bearing: {segment.st_bearing:.2f}°")
+                lines.append(f"  Direction: {segment.direction}")
+                lines.append(f"  Radius: {segment.radius_ft:.2f} ft")
+                lines.append(f"  Degree of curve: {segment.degree_value:.4f}°")
+        logger.debug("%s", "\n".join(lines))
+
+    # Add the Racetrack View Dr Portal marker
+    if racetrack_portal_point:
+        # Define custom icon with shadow, larger size, and more prominent appearance
+        tunnel_icon = make_portal_icon("red")
+        
+        folium.Marker(
+            location=racetrack_portal_point,
+            tooltip="Racetrack View Dr Portal",
+            popup="<b>Racetrack View Dr Portal</b><br>Yellow Track Station 82+00",
+            icon=tunnel_icon
+        ).add_to(m)
+
+    # Contiguous float64 copies of the coordinate lists used by the
+    # nearest-point queries. Built once here (the whole function is cached)
+    # so reruns hand ready-made arrays to nearest_point_on_polyline instead
+    # of re-converting lists of tuples on every address search.
+    alignment_arrays = {
+        "yellow": np.asarray(yellow_alignment.all_coords, dtype=np.float64),
+        "blue": np.asarray(blue_alignment.all_coords, dtype=np.float64),
+        "purple": np.asarray(purple_alignment.all_coords, dtype=np.float64),
+        "green": np.asarray(green_alignment.all_coords, dtype=np.float64),
+        "northern_yellow": np.asarray(northern_yellow_alignment.all_coords, dtype=np.float64),
+        "northern_yellow_segments": [
+            np.asarray(seg_coords, dtype=np.float64)
+            for seg_coords in northern_yellow_alignment.segment_coords
+        ],
+    }
+    # Flattened edge table over every northern-yellow segment, so the
+    # closest-segment search projects onto all edges in one vectorized
+    # pass instead of looping segment by segment in Python. seg_ids maps
+    # each edge back to its owning segment index. The table only ever
+    # feeds an argmin comparison, so it is stored in float32 (half the
+    # cached footprint); the float64 arrays above stay the source for
+    # nearest points and geodesic distances.
+    ny_segs = [s for s in alignment_arrays["northern_yellow_segments"] if len(s) > 1]
+    if ny_segs:
+        alignment_arrays["northern_yellow_edges"] = (
+            np.concatenate([s[:-1] for s in ny_segs]).astype(np.float32),
+            np.concatenate([s[1:] for s in ny_segs]).astype(np.float32),
+            np.concatenate([
+                np.full(len(s) - 1, i, dtype=np.intp)
+                for i, s in enumerate(alignment_arrays["northern_yellow_segments"])
+                if len(s) > 1
+            ]),
+        )
+
+    return (m, yellow_alignment, blue_alignment, purple_alignment,
+            green_alignment, northern_yellow_alignment, expanded_alignments,
+            alignment_arrays, racetrack_portal_point)
+
+with main_content:
+    # --- 2. address input & geocoding ---
+    st.sidebar.subheader("Search Location")
+    
+    # Simple text input for address without autocomplete
+    address_input = st.sidebar.text_input("Enter address", value=st.session_state.get("address", ""))
+    
+    # Search button
+    search = st.sidebar.button("Search")
+
+    # Initialize session state for location if not present
+    if "location" not in st.session_state:
+        st.session_state["location"] = None
+
+    if search and address_input:
+        try:
+            # Perform geocoding with bounds constraint (cached per address)
+            results = geocode_address(address_input)
+
+            if results and len(results):
+                # Extract location data from the first result
+                location_data = results[0]
+                
+                # Create a location object with the required attributes
+                class LocationResult:
+                    def __init__(self, lat, lng, formatted):
+                        self.latitude = lat
+                        self.longitude = lng
+                        self.address = formatted
+                
+                location = LocationResult(
+                    location_data['geometry']['lat'],
+                    location_data['geometry']['lng'],
+                    location_data['formatted']
+                )
+                
+                st.session_state["address"] = address_input
+                st.session_state["location"] = location
+            else:
+                st.sidebar.error("Address not found")
+                st.session_state["location"] = None
+        except Exception as e:
+            st.sidebar.error(f"Geocoding service error: {str(e)}")
+            st.session_state["location"] = None
+
+    # Use session state location for display
+    location = st.session_state.get("location", None)
+    address = st.session_state.get("address", "")
+
+    # --- 3. build the Folium map ---
+    # default center over Del Mar
+    center = (32.975, -117.245)
+    initial_zoom = 13
+    if location:
+        center = (location.latitude, location.longitude)
+        initial_zoom = 15
+
+    (m, yellow_alignment, blue_alignment, purple_alignment,
+     green_alignment, northern_yellow_alignment, expanded_alignments,
+     alignment_arrays, racetrack_portal_point) = build_base_map(center, initial_zoom)
 
     # if we have a valid location, plot it + compute distances
     if location:
         addr_pt = (location.latitude, location.longitude)
-        folium.Marker(addr_pt, tooltip=address, icon=folium.Icon(color="red")).add_to(m)
 
-        # Create Point object for shapely operations
-        pt = Point(location.longitude, location.latitude)
+        # Per-search overlays go into their own group so the cached base
+        # map object is never mutated; the group is attached only for the
+        # duration of this render (see below)
+        search_group = folium.FeatureGroup(name="Search Results")
+        folium.Marker(addr_pt, tooltip=address, icon=folium.Icon(color="red")).add_to(search_group)
 
         st.sidebar.markdown("## Distances to Each Alignment")
-        for name, data in expanded_alignments.items():
-            # Create a LineString from the coordinates
-            smoothed_coords = data
-            
-            # Create a LineString from the smoothed coordinates
-            line = LineString([(lon, lat) for lat, lon in smoothed_coords])
-            pt = Point(location.longitude, location.latitude)
 
-            # find nearest point on the line
-            nearest = line.interpolate(line.project(pt))
-            nearest_lat, nearest_lon = nearest.y, nearest.x
-
-            # geodesic distance in meters
-            dist_m = geodesic(addr_pt, (nearest_lat, nearest_lon)).meters
-            
-            # Convert to different units and round
-            dist_ft = round(dist_m * 3.28084)  # Convert meters to feet
-            dist_m_rounded = round(dist_m / 10) * 10  # Round to nearest 10 meters
-            dist_km = round(dist_m / 1000, 1)  # Round to 0.1 km
-            dist_miles = round(dist_m * 0.000621371, 1)  # Round to 0.1 miles
+        def show_route_distance(title, coords, color):
+            """Connector line + sidebar distance readout for one route."""
+            nearest = nearest_point_on_polyline(coords, *addr_pt)
+            dist_m = geodesic(addr_pt, nearest).meters
+            dist_ft, dist_m_rounded, dist_km, dist_miles = format_distance_units(dist_m)
 
             # draw a connector
             folium.PolyLine(
-                [addr_pt, (nearest_lat, nearest_lon)],
-                color="magenta" if "Purple" in name else "green" if "Green" in name else "#FF7700",
+                [addr_pt, nearest],
+                color=color,
                 weight=2,
                 dash_array="5,5"
-            ).add_to(m)
+            ).add_to(search_group)
 
-            st.sidebar.write(f"**{name}:**")
+            st.sidebar.write(f"**{title}:**")
             st.sidebar.write(f"- {dist_ft} ft")
             st.sidebar.write(f"- {dist_m_rounded} m")
             st.sidebar.write(f"- {dist_km} km")
             st.sidebar.write(f"- {dist_miles} mi")
-            
-        # Calculate distance to yellow track
-        yellow_line = LineString([(lon, lat) for lat, lon in yellow_alignment.all_coords])
-        yellow_nearest = yellow_line.interpolate(yellow_line.project(pt))
-        yellow_nearest_lat, yellow_nearest_lon = yellow_nearest.y, yellow_nearest.x
-        yellow_dist_m = geodesic(addr_pt, (yellow_nearest_lat, yellow_nearest_lon)).meters
-        
-        # Convert to different units and round
-        yellow_dist_ft = round(yellow_dist_m * 3.28084)  # Convert meters to feet
-        yellow_dist_m_rounded = round(yellow_dist_m / 10) * 10  # Round to nearest 10 meters
-        yellow_dist_km = round(yellow_dist_m / 1000, 1)  # Round to 0.1 km
-        yellow_dist_miles = round(yellow_dist_m * 0.000621371, 1)  # Round to 0.1 miles
-        
-        # Draw a connector
-        folium.PolyLine(
-            [addr_pt, (yellow_nearest_lat, yellow_nearest_lon)],
-            color="#FF7700",
-            weight=2,
-            dash_array="5,5"
-        ).add_to(m)
-        
-        # Display the distance to Yellow track
-        st.sidebar.write("**Yellow Route: Engineering Alignment:**")
-        st.sidebar.write(f"- {yellow_dist_ft} ft")
-        st.sidebar.write(f"- {yellow_dist_m_rounded} m")
-        st.sidebar.write(f"- {yellow_dist_km} km")
-        st.sidebar.write(f"- {yellow_dist_miles} mi")
-        
-        # Calculate distance to blue track
-        blue_line = LineString([(lon, lat) for lat, lon in blue_alignment.all_coords])
-        blue_nearest = blue_line.interpolate(blue_line.project(pt))
-        blue_nearest_lat, blue_nearest_lon = blue_nearest.y, blue_nearest.x
-        blue_dist_m = geodesic(addr_pt, (blue_nearest_lat, blue_nearest_lon)).meters
-        
-        # Convert to different units and round
-        blue_dist_ft = round(blue_dist_m * 3.28084)  # Convert meters to feet
-        blue_dist_m_rounded = round(blue_dist_m / 10) * 10  # Round to nearest 10 meters
-        blue_dist_km = round(blue_dist_m / 1000, 1)  # Round to 0.1 km
-        blue_dist_miles = round(blue_dist_m * 0.000621371, 1)  # Round to 0.1 miles
-        
-        # Draw a connector
-        folium.PolyLine(
-            [addr_pt, (blue_nearest_lat, blue_nearest_lon)],
-            color="blue",
-            weight=2,
-            dash_array="5,5"
-        ).add_to(m)
-        
-        # Display the distance to Blue track
-        st.sidebar.write("**Blue Route: Under Crest Canyon:**")
-        st.sidebar.write(f"- {blue_dist_ft} ft")
-        st.sidebar.write(f"- {blue_dist_m_rounded} m")
-        st.sidebar.write(f"- {blue_dist_km} km")
-        st.sidebar.write(f"- {blue_dist_miles} mi")
-        
-        # Calculate distance to purple track
-        purple_line = LineString([(lon, lat) for lat, lon in purple_alignment.all_coords])
-        purple_nearest = purple_line.interpolate(purple_line.project(pt))
-        purple_nearest_lat, purple_nearest_lon = purple_nearest.y, purple_nearest.x
-        purple_dist_m = geodesic(addr_pt, (purple_nearest_lat, purple_nearest_lon)).meters
-        
-        # Convert to different units and round
-        purple_dist_ft = round(purple_dist_m * 3.28084)  # Convert meters to feet
-        purple_dist_m_rounded = round(purple_dist_m / 10) * 10  # Round to nearest 10 meters
-        purple_dist_km = round(purple_dist_m / 1000, 1)  # Round to 0.1 km
-        purple_dist_miles = round(purple_dist_m * 0.000621371, 1)  # Round to 0.1 miles
-        
-        # Draw a connector
-        folium.PolyLine(
-            [addr_pt, (purple_nearest_lat, purple_nearest_lon)],
-            color="magenta",
-            weight=2,
-            dash_array="5,5"
-        ).add_to(m)
-        
-        # Display the distance to Purple track
-        st.sidebar.write("**Purple Route: Under Camino Del Mar:**")
-        st.sidebar.write(f"- {purple_dist_ft} ft")
-        st.sidebar.write(f"- {purple_dist_m_rounded} m")
-        st.sidebar.write(f"- {purple_dist_km} km")
-        st.sidebar.write(f"- {purple_dist_miles} mi")
-        
-        # Calculate distance to green track
-        green_line = LineString([(lon, lat) for lat, lon in green_alignment.all_coords])
-        green_nearest = green_line.interpolate(green_line.project(pt))
-        green_nearest_lat, green_nearest_lon = green_nearest.y, green_nearest.x
-        green_dist_m = geodesic(addr_pt, (green_nearest_lat, green_nearest_lon)).meters
-        
-        # Convert to different units and round
-        green_dist_ft = round(green_dist_m * 3.28084)  # Convert meters to feet
-        green_dist_m_rounded = round(green_dist_m / 10) * 10  # Round to nearest 10 meters
-        green_dist_km = round(green_dist_m / 1000, 1)  # Round to 0.1 km
-        green_dist_miles = round(green_dist_m * 0.000621371, 1)  # Round to 0.1 miles
-        
-        # Draw a connector
-        folium.PolyLine(
-            [addr_pt, (green_nearest_lat, green_nearest_lon)],
-            color="green",
-            weight=2,
-            dash_array="5,5"
-        ).add_to(m)
-        
-        # Display the distance to Green track
-        st.sidebar.write("**Green Route: Del Mar Bluffs Double-Track:**")
-        st.sidebar.write(f"- {green_dist_ft} ft")
-        st.sidebar.write(f"- {green_dist_m_rounded} m")
-        st.sidebar.write(f"- {green_dist_km} km")
-        st.sidebar.write(f"- {green_dist_miles} mi")
-        
-        # Calculate distance to Northern Yellow track
-        northern_yellow_line = LineString([(lon, lat) for lat, lon in northern_yellow_alignment.all_coords])
-        northern_yellow_nearest = northern_yellow_line.interpolate(northern_yellow_line.project(pt))
-        northern_yellow_nearest_lat, northern_yellow_nearest_lon = northern_yellow_nearest.y, northern_yellow_nearest.x
-        northern_yellow_dist_m = geodesic(addr_pt, (northern_yellow_nearest_lat, northern_yellow_nearest_lon)).meters
-        
-        # Convert to different units and round
-        northern_yellow_dist_ft = round(northern_yellow_dist_m * 3.28084)  # Convert meters to feet
-        northern_yellow_dist_m_rounded = round(northern_yellow_dist_m / 10) * 10  # Round to nearest 10 meters
-        northern_yellow_dist_km = round(northern_yellow_dist_m / 1000, 1)  # Round to 0.1 km
-        northern_yellow_dist_miles = round(northern_yellow_dist_m * 0.000621371, 1)  # Round to 0.1 miles
-        
-        # Draw a connector
-        folium.PolyLine(
-            [addr_pt, (northern_yellow_nearest_lat, northern_yellow_nearest_lon)],
-            color="orange",
-            weight=2,
-            dash_array="5,5"
-        ).add_to(m)
-        
-        # Display the distance to Northern Yellow track
-        st.sidebar.write("**Northern Yellow Route:**")
-        st.sidebar.write(f"- {northern_yellow_dist_ft} ft")
-        st.sidebar.write(f"- {northern_yellow_dist_m_rounded} m")
-        st.sidebar.write(f"- {northern_yellow_dist_km} km")
-        st.sidebar.write(f"- {northern_yellow_dist_miles} mi")
-        
-        # Find which segment of the northern yellow track is closest
-        northern_yellow_min_distance = float('inf')
+
+        for name, data in expanded_alignments.items():
+            show_route_distance(
+                name, data,
+                "magenta" if "Purple" in name else "green" if "Green" in name else "#FF7700"
+            )
+
+        # The five engineering routes repeat the same pattern - drive it
+        # from a table instead of five copied blocks
+        for title, key, color in (
+            ("Yellow Route: Engineering Alignment", "yellow", "#FF7700"),
+            ("Blue Route: Under Crest Canyon", "blue", "blue"),
+            ("Purple Route: Under Camino Del Mar", "purple", "magenta"),
+            ("Green Route: Del Mar Bluffs Double-Track", "green", "green"),
+            ("Northern Yellow Route", "northern_yellow", "orange"),
+        ):
+            show_route_distance(title, alignment_arrays[key], color)
+
+        # Find which segment of the northern yellow track is closest - one
+        # clamped projection over the precomputed edge table covering every
+        # segment at once, instead of a per-segment Python scan
         northern_yellow_closest_segment = None
         northern_yellow_segment_index = None
-        
-        for i, segment in enumerate(northern_yellow_alignment.segments):
-            segment_linestring = LineString([(lon, lat) for lat, lon in northern_yellow_alignment.segment_coords[i]])
-            segment_nearest = segment_linestring.interpolate(segment_linestring.project(pt))
-            segment_dist = geodesic(addr_pt, (segment_nearest.y, segment_nearest.x)).meters
-            
-            if segment_dist < northern_yellow_min_distance:
-                northern_yellow_min_distance = segment_dist
-                northern_yellow_closest_segment = segment
-                northern_yellow_segment_index = i
+
+        if "northern_yellow_edges" in alignment_arrays:
+            edge_a, edge_b, edge_seg_ids = alignment_arrays["northern_yellow_edges"]
+            ab = edge_b - edge_a
+            # float32 throughout - this pass only ranks edges, and the
+            # sub-meter rounding cannot change which segment wins by more
+            # than a boundary vertex. The float32 cast does collapse
+            # near-duplicate vertices into zero-length edges, so guard the
+            # division exactly (a tiny epsilon would underflow to 0 in
+            # float32 and yield NaN); degenerate edges then fall back to
+            # plain point distance via t = 0.
+            ap = np.array(addr_pt, dtype=np.float32) - edge_a
+            denom = np.einsum('ij,ij->i', ab, ab)
+            t = np.clip(np.einsum('ij,ij->i', ap, ab) / np.where(denom == 0, np.float32(1.0), denom), 0.0, 1.0)
+            dp = ap - t[:, None] * ab
+            d2 = np.einsum('ij,ij->i', dp, dp)
+            northern_yellow_segment_index = int(edge_seg_ids[int(d2.argmin())])
+            northern_yellow_closest_segment = northern_yellow_alignment.segments[northern_yellow_segment_index]
         
         if northern_yellow_closest_segment:
             # Bold header for closest segment
@@ -1838,8 +1161,9 @@ with main_content:
             # Determine approximate station of the closest point
             if northern_yellow_closest_segment.type == "tangent":
                 # Calculate percentage along the segment
-                segment_linestring = LineString([(lon, lat) for lat, lon in northern_yellow_alignment.segment_coords[northern_yellow_segment_index]])
-                percentage = segment_linestring.project(pt) / segment_linestring.length
+                percentage = fraction_along_polyline(
+                    alignment_arrays["northern_yellow_segments"][northern_yellow_segment_index],
+                    *addr_pt)
                 
                 # Interpolate station value
                 station_value = northern_yellow_closest_segment.start_station_value + percentage * (northern_yellow_closest_segment.end_station_value - northern_yellow_closest_segment.start_station_value)
@@ -1857,8 +1181,9 @@ with main_content:
                 total_length = northern_yellow_closest_segment.entry_spiral_length + northern_yellow_closest_segment.circular_arc_length + northern_yellow_closest_segment.exit_spiral_length
                 
                 # Get normalized distance along the curve
-                segment_linestring = LineString([(lon, lat) for lat, lon in northern_yellow_alignment.segment_coords[northern_yellow_segment_index]])
-                curve_distance = segment_linestring.project(pt) / segment_linestring.length * total_length
+                curve_distance = fraction_along_polyline(
+                    alignment_arrays["northern_yellow_segments"][northern_yellow_segment_index],
+                    *addr_pt) * total_length
                 
                 if curve_distance < northern_yellow_closest_segment.entry_spiral_length:
                     # In entry spiral
@@ -1891,40 +1216,17 @@ with main_content:
                     st.sidebar.write(f"Radius: {int(radius_ft)} ft")
                     st.sidebar.write(f"Degree of Curve: {degree_curve:.2f}°")
 
-    # Add the Racetrack View Dr Portal marker
-    if racetrack_portal_point:
-        # Define custom icon with shadow, larger size, and more prominent appearance
-        tunnel_icon = folium.DivIcon(
-            icon_size=(30, 30),
-            icon_anchor=(15, 15),
-            html="""
-            <div style="
-                background-color: red;
-                width: 24px;
-                height: 24px;
-                border-radius: 12px;
-                border: 3px solid white;
-                box-shadow: 0 0 10px rgba(0,0,0,0.5);
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                color: white;
-                font-weight: bold;
-                font-size: 16px;
-            ">T</div>
-            """
-        )
-        
-        folium.Marker(
-            location=racetrack_portal_point,
-            tooltip="Racetrack View Dr Portal",
-            popup="<b>Racetrack View Dr Portal</b><br>Yellow Track Station 82+00",
-            icon=tunnel_icon
-        ).add_to(m)
-
     # --- 4. render ---
-    # Set the map height to fill available space while leaving room for header and footer
-    st_folium(m, width="100%")
+    # No click/event feedback is read from the map, so serve the cached HTML
+    # directly; switch back to st_folium only if click data is ever needed.
+    # The search overlays are attached just for this render and detached
+    # again so the cached base map stays pristine between reruns.
+    if location:
+        search_group.add_to(m)
+    html = render_map_html(m, address if location else "")
+    if location:
+        m._children.pop(search_group.get_name(), None)
+    components.html(html, height=700, scrolling=False)
 
 # --- 5. Footer with credits and disclaimer ---
 # Create footer using native Streamlit elements
@@ -1,7 +1,7 @@
 # app.py
 import streamlit as st
+import streamlit.components.v1 as components
 import folium
-from streamlit_folium import st_folium
 from geopy.geocoders import Nominatim
 from geopy.distance import geodesic
 import numpy as np
@@ -62,8 +62,11 @@ def create_curved_path(coords, curve_factor=0.2, steps=20):
         
         # Generate points along the quadratic Bezier curve
         for t in np.linspace(0, 1, steps):
-            # Quadratic Bezier formula: B(t) = (1-t)²P0 + 2(1-t)tP1 + t²P2
-            intermediate = (1-t)**2 * mid1 + 2*(1-t)*t * control + t**2 * mid2
+            # De Casteljau evaluation: two lerps instead of expanding the
+            # (1-t)²P0 + 2(1-t)tP1 + t²P2 polynomial - fewer multiplies per point
+            a = mid1 + t * (control - mid1)
+            b = control + t * (mid2 - control)
+            intermediate = a + t * (b - a)
             curved_coords.append((intermediate[0], intermediate[1]))
     
     # Add the last point
@@ -95,28 +98,20 @@ def create_circular_curve(start_point, radius, degree_of_curve, central_angle, d
     
     # Calculate the arc length
     arc_length = radius * central_angle_rad
-    
-    # Generate points along the curve
-    points = []
-    for i in range(steps + 1):
-        # Angle from the center to the current point
-        angle = sign * (i / steps) * central_angle_rad
-        
-        # Calculate offset from the start point
-        dx = radius * np.sin(angle)
-        dy = radius * (1 - np.cos(angle))
-        
-        # Apply the offset to the start point (simplified - assuming flat earth near the start point)
-        # This is a rough approximation for small distances
-        lat_offset = dy * 0.00000899  # ~0.00000899 degrees per meter at Earth's surface
-        lon_offset = dx * 0.00001176 / np.cos(np.radians(start_point[0]))  # Adjust for latitude
-        
-        lat = start_point[0] + lat_offset
-        lon = start_point[1] + lon_offset
-        
-        points.append((lat, lon))
-    
-    return points
+
+    # Generate all points along the curve in one vectorized pass
+    angles = sign * np.linspace(0, central_angle_rad, steps + 1)
+
+    # Calculate offsets from the start point
+    dx = radius * np.sin(angles)
+    dy = radius * (1 - np.cos(angles))
+
+    # Apply the offsets to the start point (simplified - assuming flat earth near the start point)
+    # This is a rough approximation for small distances
+    lats = start_point[0] + dy * 0.00000899  # ~0.00000899 degrees per meter at Earth's surface
+    lons = start_point[1] + dx * 0.00001176 / np.cos(np.radians(start_point[0]))  # Adjust for latitude
+
+    return list(zip(lats, lons))
 
 # Function to generate a spiral curve path (clothoid)
 def create_spiral_curve(start_point, spiral_length, degree_of_curve, direction='right', azimuth_deg=90, steps=40):
@@ -143,31 +138,23 @@ def create_spiral_curve(start_point, spiral_length, degree_of_curve, direction='
     # Determine sign for direction
     sign = -1 if direction == 'right' else 1
     
-    # Generate local coordinates along the spiral
-    points = []
-    for i in range(steps + 1):
-        # Distance along the spiral
-        s = (i / steps) * spiral_length
-        
-        # Clothoid equations (Euler spiral)
-        x = s - (s**5) / (40 * A**4) + (s**9) / (3456 * A**8)
-        y = sign * ((s**3) / (6 * A**2) - (s**7) / (336 * A**6))
-        
-        # Rotate according to azimuth
-        theta = np.radians(azimuth_deg)
-        x_rot = x * np.cos(theta) - y * np.sin(theta)
-        y_rot = x * np.sin(theta) + y * np.cos(theta)
-        
-        # Convert to lat/lon offsets (simplified approximation)
-        lat_offset = y_rot * 0.00000899  # ~0.00000899 degrees per meter at Earth's surface
-        lon_offset = x_rot * 0.00001176 / np.cos(np.radians(start_point[0]))  # Adjust for latitude
-        
-        lat = start_point[0] + lat_offset
-        lon = start_point[1] + lon_offset
-        
-        points.append((lat, lon))
-    
-    return points
+    # Generate local coordinates along the spiral in one vectorized pass
+    s = np.linspace(0, spiral_length, steps + 1)
+
+    # Clothoid equations (Euler spiral)
+    x = s - (s**5) / (40 * A**4) + (s**9) / (3456 * A**8)
+    y = sign * ((s**3) / (6 * A**2) - (s**7) / (336 * A**6))
+
+    # Rotate according to azimuth
+    theta = np.radians(azimuth_deg)
+    x_rot = x * np.cos(theta) - y * np.sin(theta)
+    y_rot = x * np.sin(theta) + y * np.cos(theta)
+
+    # Convert to lat/lon offsets (simplified approximation)
+    lats = start_point[0] + y_rot * 0.00000899  # ~0.00000899 degrees per meter at Earth's surface
+    lons = start_point[1] + x_rot * 0.00001176 / np.cos(np.radians(start_point[0]))  # Adjust for latitude
+
+    return list(zip(lats, lons))
 
 # Hide default Streamlit footer and add padding
 st.markdown(
@@ -321,15 +308,16 @@ with main_content:
     for name, data in ALIGNMENTS.items():
         # Get original coordinates
         orig_coords = data["coords"]
-        
+
+        # Hoist loop invariants out of the hot loop
+        color = data["color"]
+        n = len(orig_coords)
+
         # Create a single smooth path with no duplicates
         curved_coords = [orig_coords[0]]  # Start with the first point
-        
+
         # Process each segment in sequence
-        for i in range(len(orig_coords) - 1):
-            start_point = orig_coords[i]
-            end_point = orig_coords[i+1]
-            
+        for i, (start_point, end_point) in enumerate(zip(orig_coords[:-1], orig_coords[1:])):
             # Calculate distance for this segment
             dist = geodesic(start_point, end_point).meters
             
@@ -344,7 +332,7 @@ with main_content:
                 t = j / num_points
                 
                 # Simple linear interpolation for straighter segments
-                if i == 0 or i == len(orig_coords) - 2:
+                if i == 0 or i == n - 2:
                     # First and last segments are straighter
                     interp_lat = start_point[0] + t * (end_point[0] - start_point[0])
                     interp_lon = start_point[1] + t * (end_point[1] - start_point[1])
@@ -352,7 +340,7 @@ with main_content:
                     # Middle segments get a slight curve using quadratic interpolation
                     # Find previous and next points for context
                     prev_point = orig_coords[max(0, i-1)]
-                    next_point = orig_coords[min(len(orig_coords)-1, i+2)]
+                    next_point = orig_coords[min(n-1, i+2)]
                     
                     # Control point - slight offset perpendicular to the segment
                     dx = end_point[0] - start_point[0]
@@ -383,12 +371,14 @@ with main_content:
         
         # Store the expanded coordinates for distance calculations
         expanded_alignments[name] = curved_coords
-        
-        # Add to map
+
+        # Add to map - draw the original sparse points and let Leaflet smooth
+        # them client-side; the densified path is only needed for distances
         folium.PolyLine(
-            curved_coords,
-            color=data["color"],
+            orig_coords,
+            color=color,
             weight=4,
+            smooth_factor=2.0,
             tooltip=name
         ).add_to(m)
 
@@ -398,21 +388,29 @@ with main_content:
         folium.Marker(addr_pt, tooltip=address, icon=folium.Icon(color="red")).add_to(m)
 
         st.sidebar.markdown("## Distances to Each Alignment")
-        for name, data in ALIGNMENTS.items():
-            # Use expanded coordinates for more accurate distance calculation
-            curved_coords = expanded_alignments[name]
-            
-            # Create a LineString from the curved coordinates
-            line = LineString([(lon, lat) for lat, lon in curved_coords])
-            pt = Point(location.longitude, location.latitude)
 
-            # find nearest point on the line
-            nearest = line.interpolate(line.project(pt))
-            nearest_lat, nearest_lon = nearest.y, nearest.x
+        # Batch the nearest-point search across all four alignments: one
+        # equirectangular distance pass over every densified point, then a
+        # single geodesic call per alignment for the reported distance
+        names = list(ALIGNMENTS.keys())
+        all_pts = np.concatenate([np.asarray(expanded_alignments[n]) for n in names])
+        offsets = np.concatenate(([0], np.cumsum([len(expanded_alignments[n]) for n in names])))
+
+        dy = (all_pts[:, 0] - addr_pt[0]) * 111000.0
+        dx = (all_pts[:, 1] - addr_pt[1]) * 111000.0 * np.cos(np.radians(addr_pt[0]))
+        d2 = dx * dx + dy * dy
+
+        for idx, name in enumerate(names):
+            data = ALIGNMENTS[name]
+
+            # find nearest densified point on this alignment
+            lo, hi = offsets[idx], offsets[idx + 1]
+            nearest_idx = lo + int(d2[lo:hi].argmin())
+            nearest_lat, nearest_lon = all_pts[nearest_idx]
 
             # geodesic distance in meters
             dist_m = geodesic(addr_pt, (nearest_lat, nearest_lon)).meters
-            
+
             # Convert to different units and round
             dist_m_rounded = round(dist_m / 10) * 10  # Round to nearest 10 meters
             dist_km = round(dist_m / 1000, 1)  # Round to 0.1 km
@@ -432,8 +430,9 @@ with main_content:
             st.sidebar.write(f"- {dist_miles} mi")
 
     # --- 4. render ---
-    # Set the map height to fill available space while leaving room for header and footer
-    st_folium(m, width="100%")
+    # The app never reads map events back, so render the map as plain HTML
+    # instead of paying for st_folium's bidirectional bridge on every rerun
+    components.html(m.get_root().render(), height=700)
 
 # --- 5. Footer with credits and disclaimer ---
 # Remove the spacer as we're using fixed positioning
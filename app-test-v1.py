@@ -1,7 +1,11 @@
 # app.py
+from functools import lru_cache
+from typing import NamedTuple
+from pathlib import Path
+
 import streamlit as st
+import streamlit.components.v1 as components
 import folium
-from streamlit_folium import st_folium
 from geopy.geocoders import Nominatim
 from geopy.distance import geodesic
 import numpy as np
@@ -20,11 +24,218 @@ from utils.tangent_line import add_railway_tangent_to_map
 from utils.railway_curve import add_complete_railway_curve_to_map, add_complete_railway_alignment_to_map
 from utils.railway_alignment import RailwayAlignment, TangentSegment, CurveSegment
 
+# Bound method of a pre-built template - skips re-parsing the format
+# spec on every call the way an inline f-string would
+_STATION_FMT = "{}+{:.2f}".format
+
+@lru_cache(maxsize=4096)
+def _format_station_cached(station_value):
+    station_main, station_decimal = divmod(station_value, 100)
+    return _STATION_FMT(int(station_main), station_decimal)
+
 def format_station(station_value):
-    """Format a station value as XX+XX.XX"""
-    station_main = int(station_value / 100)
-    station_decimal = station_value - (station_main * 100)
-    return f"{station_main}+{station_decimal:.2f}"
+    """
+    Format a station value as XX+XX.XX.
+
+    Memoized on the 0.01 ft grid - repeated searches near the same spot
+    quantize to a small set of station values, so the formatted string
+    comes straight from the cache.
+    """
+    return _format_station_cached(round(station_value, 2))
+
+@st.cache_data(show_spinner=False, hash_funcs={folium.Map: lambda _: 0})
+def render_map_html(m, overlay_key=""):
+    """
+    Render the built map to its HTML string once per search state.
+
+    Serializing the map (Jinja2 templates plus thousands of coordinate
+    tuples) dominates the per-rerun cost. The map is rebuilt identically
+    on every rerun, so it is excluded from the cache key; only the
+    searched address (which decides the marker and connector overlays)
+    invalidates the cached HTML.
+    """
+    return m.get_root().render()
+
+@st.cache_resource(show_spinner=False, hash_funcs={folium.Map: lambda _: 0})
+def load_base_map_html(m):
+    """
+    HTML for the no-search base map, persisted under static/.
+
+    The base map only changes when this script changes, so the first
+    render is saved to disk and later cold starts serve the file without
+    paying the folium serialization cost at all (delete the file after
+    editing the map layers to force a re-render). Deployments can commit
+    the generated file to skip even the first render.
+    """
+    path = Path(__file__).parent / "static" / "map-test-v1.html"
+    if path.exists():
+        return path.read_text()
+    html = m.get_root().render()
+    try:
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(html)
+    except OSError:
+        pass
+    return html
+
+class SegmentSoA(NamedTuple):
+    """
+    Per-segment fields packed into parallel NumPy arrays (Structure of
+    Arrays). A NamedTuple keeps field access a fixed-offset attribute
+    lookup instead of a dict hash per read, and the instance itself is
+    immutable, which suits its role as a cached resource.
+    """
+    start_station: np.ndarray
+    end_station: np.ndarray
+    ts_station: np.ndarray
+    sc_station: np.ndarray
+    cs_station: np.ndarray
+    st_station: np.ndarray
+    entry_spiral_length: np.ndarray
+    circular_arc_length: np.ndarray
+    exit_spiral_length: np.ndarray
+    radius_ft: np.ndarray
+    degree_value: np.ndarray
+    cum_entry_end: np.ndarray
+    cum_circ_end: np.ndarray
+    inv_entry: np.ndarray
+    inv_arc: np.ndarray
+    inv_exit: np.ndarray
+    curve_info: np.ndarray
+    point_lat: np.ndarray
+    point_lon: np.ndarray
+    point_seg_ids: np.ndarray
+
+def build_segment_soa(alignment):
+    """
+    Pack per-segment fields into parallel NumPy arrays (Structure of
+    Arrays), plus a flattened vertex table mapping every centerline point
+    back to its owning segment.
+
+    The closest-segment search and the station arithmetic can then index
+    arrays instead of dereferencing Python segment objects step by step.
+    Fields a segment type lacks (e.g. spiral lengths on tangents) are NaN.
+    """
+    segments = alignment.segments
+
+    def field(name):
+        return np.array([getattr(s, name, np.nan) for s in segments],
+                        dtype=np.float64)
+
+    entry_spiral_length = field("entry_spiral_length")
+    circular_arc_length = field("circular_arc_length")
+    exit_spiral_length = field("exit_spiral_length")
+    # Reciprocals of the element lengths - the percentage math then
+    # multiplies instead of divides (NaN rows are tangents)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv_entry = 1.0 / entry_spiral_length
+        inv_arc = 1.0 / circular_arc_length
+        inv_exit = 1.0 / exit_spiral_length
+    coords = [np.asarray(c, dtype=np.float64) for c in alignment.segment_coords]
+    points = np.concatenate([c for c in coords if len(c)])
+    radius_ft = field("radius_ft")
+    degree_value = field("degree_value")
+    # Radius/degree display strings, rendered once at build time: the
+    # per-curve values never change, so the readout indexes a finished
+    # string instead of re-running two float formats per search
+    curve_info = np.array([
+        "" if np.isnan(r) else
+        "  \nRadius: {} ft  \nDegree of Curve: {:.2f}°".format(int(r), d)
+        for r, d in zip(radius_ft, degree_value)
+    ], dtype=object)
+    return SegmentSoA(
+        start_station=field("start_station_value"),
+        end_station=field("end_station_value"),
+        ts_station=field("ts_station_value"),
+        sc_station=field("sc_station_value"),
+        cs_station=field("cs_station_value"),
+        st_station=field("st_station_value"),
+        entry_spiral_length=entry_spiral_length,
+        circular_arc_length=circular_arc_length,
+        exit_spiral_length=exit_spiral_length,
+        radius_ft=radius_ft,
+        degree_value=degree_value,
+        # Cumulative element boundaries within each curve, precomputed so
+        # the element-region test is a single searchsorted against two edges
+        cum_entry_end=entry_spiral_length.copy(),
+        cum_circ_end=entry_spiral_length + circular_arc_length,
+        inv_entry=inv_entry,
+        inv_arc=inv_arc,
+        inv_exit=inv_exit,
+        curve_info=curve_info,
+        # Contiguous per-axis columns: the distance reduction then runs
+        # over unit-stride memory instead of a strided (N, 2) view
+        point_lat=np.ascontiguousarray(points[:, 0]),
+        point_lon=np.ascontiguousarray(points[:, 1]),
+        point_seg_ids=np.concatenate([
+            np.full(len(c), i, dtype=np.intp)
+            for i, c in enumerate(coords) if len(c)
+        ]),
+    )
+
+@st.cache_resource(show_spinner=False,
+                   hash_funcs={RailwayAlignment: lambda a: a.name})
+def load_segment_soa(alignment):
+    """
+    Cached build_segment_soa: the alignment is defined statically in this
+    script and rebuilt identically on every rerun, so its name is a stable
+    cache key and the arrays are packed once per process.
+    """
+    return build_segment_soa(alignment)
+
+# Display labels for the curve elements, indexed by the 0/1/2 region code
+# computed in the station readout - the numeric path deals only in ints
+ELEMENT_NAMES = ("Entry Spiral", "Circular Curve", "Exit Spiral")
+
+def closest_segment_index(soa, lat, lon):
+    """
+    Index of the segment whose centerline passes closest to (lat, lon).
+
+    One squared-distance reduction over the flattened vertex table - the
+    whole search is a handful of C-level array ops on the SoA arrays.
+    """
+    d2 = (soa.point_lat - lat) ** 2 + (soa.point_lon - lon) ** 2
+    return int(soa.point_seg_ids[int(d2.argmin())])
+
+# Grid cell edge for the corridor lookup table, in degrees (~100 m). The
+# corridor bbox is only a few dozen cells on a side at this resolution.
+GRID_CELL_DEG = 0.001
+
+@st.cache_resource(show_spinner=False,
+                   hash_funcs={RailwayAlignment: lambda a: a.name})
+def load_segment_grid(alignment):
+    """
+    Coarse cell -> segment-index lookup table over the corridor bbox.
+
+    Each cell stores the segment whose centerline vertex lies nearest the
+    cell center, computed in one broadcast distance pass at build time and
+    cached for the process. Queries inside the bbox then cost a single
+    array read instead of the full argmin; resolution is half a cell
+    (~50 m), well inside the tolerance of the approximate-station readout.
+    """
+    soa = load_segment_soa(alignment)
+    lat_min = float(soa.point_lat.min())
+    lon_min = float(soa.point_lon.min())
+    n_rows = int((float(soa.point_lat.max()) - lat_min) / GRID_CELL_DEG) + 1
+    n_cols = int((float(soa.point_lon.max()) - lon_min) / GRID_CELL_DEG) + 1
+    cell_lat = lat_min + (np.arange(n_rows) + 0.5) * GRID_CELL_DEG
+    cell_lon = lon_min + (np.arange(n_cols) + 0.5) * GRID_CELL_DEG
+    d2 = ((cell_lat[:, None, None] - soa.point_lat) ** 2
+          + (cell_lon[None, :, None] - soa.point_lon) ** 2)
+    cells = soa.point_seg_ids[d2.argmin(axis=2)]
+    return lat_min, lon_min, n_rows, n_cols, cells
+
+def lookup_segment_index(soa, grid, lat, lon):
+    """
+    Closest segment via the grid table, with the exact vertex argmin as
+    fallback for points outside the corridor bbox.
+    """
+    lat_min, lon_min, n_rows, n_cols, cells = grid
+    row = int((lat - lat_min) / GRID_CELL_DEG)
+    col = int((lon - lon_min) / GRID_CELL_DEG)
+    if 0 <= row < n_rows and 0 <= col < n_cols:
+        return int(cells[row, col])
+    return closest_segment_index(soa, lat, lon)
 
 try:
     from shapely.geometry import LineString, Point
@@ -89,584 +300,656 @@ st.title("LOSSAN Rail Realignment Explorer")
 # Create a container for the main content
 main_content = st.container()
 
-with main_content:
-    # --- 1. define your four alignments (lat, lon) lists here ---
-    ALIGNMENTS = {
-        "Blue Route: Under Crest Canyon": {
-            "coords": [
-                (32.9720408, -117.2664554),
-                (32.9676162, -117.2653677),
-                (32.9636421, -117.2633048),
-                (32.9558076, -117.2566718),
-                (32.9491315, -117.2547255),
-                (32.9383269, -117.2473140),
-                (32.9306534, -117.2445875),
-                (32.9251512, -117.2425307),
-                (32.9162438, -117.2371537),
-            ],
-            "color": "blue",
-        },
-        "Purple Route: Under Camino Del Mar": {
-            "coords": [
-                (32.9720408, -117.2664554),
-                (32.9676162, -117.2653677),
-                (32.9649757, -117.2655738),
-                (32.9579593, -117.2649714),
-                (32.9480552, -117.2612477),
-                (32.9400607, -117.2610541),
-                (32.9351700+0.00005, -117.2587578+0.00005),
-                (32.9162438+0.00005, -117.2371537+0.00005),
-            ],
-            "color": "magenta",
-        },
-        "Green Route: Del Mar Bluffs Double-Track": {
-            "coords": [
-                (32.9720408, -117.2664554),
-                (32.9676162, -117.2653677),
-                (32.9649757, -117.2655738),
-                (32.9608866, -117.2681671),
-                (32.9556471, -117.2670344),
-                (32.9457051, -117.2631553),
-                (32.9387049, -117.2612257),
-                (32.9351700, -117.2587578),
-                (32.9162438, -117.2371537),
-            ],
-            "color": "green",
-        },
-    }
+# --- 1. define your four alignments (lat, lon) lists here ---
+# Static data: defined at module scope so fragment reruns (which do
+# not re-execute module level) never rebuild the literal dict
+ALIGNMENTS = {
+    "Blue Route: Under Crest Canyon": {
+        "coords": [
+            (32.9720408, -117.2664554),
+            (32.9676162, -117.2653677),
+            (32.9636421, -117.2633048),
+            (32.9558076, -117.2566718),
+            (32.9491315, -117.2547255),
+            (32.9383269, -117.2473140),
+            (32.9306534, -117.2445875),
+            (32.9251512, -117.2425307),
+            (32.9162438, -117.2371537),
+        ],
+        "color": "blue",
+    },
+    "Purple Route: Under Camino Del Mar": {
+        "coords": [
+            (32.9720408, -117.2664554),
+            (32.9676162, -117.2653677),
+            (32.9649757, -117.2655738),
+            (32.9579593, -117.2649714),
+            (32.9480552, -117.2612477),
+            (32.9400607, -117.2610541),
+            (32.9351700+0.00005, -117.2587578+0.00005),
+            (32.9162438+0.00005, -117.2371537+0.00005),
+        ],
+        "color": "magenta",
+    },
+    "Green Route: Del Mar Bluffs Double-Track": {
+        "coords": [
+            (32.9720408, -117.2664554),
+            (32.9676162, -117.2653677),
+            (32.9649757, -117.2655738),
+            (32.9608866, -117.2681671),
+            (32.9556471, -117.2670344),
+            (32.9457051, -117.2631553),
+            (32.9387049, -117.2612257),
+            (32.9351700, -117.2587578),
+            (32.9162438, -117.2371537),
+        ],
+        "color": "green",
+    },
+}
 
-    # --- 2. address input & geocoding ---
-    address = st.sidebar.text_input("Search address", value=st.session_state.get("address", ""))
-    search = st.sidebar.button("Search")
 
-    # Initialize session state for location if not present
-    if "location" not in st.session_state:
-        st.session_state["location"] = None
+def map_and_sidebar():
+    """
+    Everything driven by the search widgets: geocoding, the map build,
+    the distance/station readouts and the embedded map HTML. Executed as
+    a fragment where the installed Streamlit supports it, so a search
+    reruns only this function and leaves the header and footer untouched.
+    """
+    with main_content:
+        # --- 2. address input & geocoding ---
+        # The search widgets live outside the fragment (fragments may not
+        # create widgets in outside containers like the sidebar); read
+        # their state back here
+        address = st.session_state.get("address_input", "")
+        search = st.session_state.get("search_clicked", False)
 
-    if search and address:
-        geolocator = Nominatim(user_agent="lossan_app")
-        location = geolocator.geocode(address)
-        if location is None:
-            st.sidebar.error("Address not found")
+        # Initialize session state for location if not present
+        if "location" not in st.session_state:
             st.session_state["location"] = None
-        else:
-            st.session_state["address"] = address
-            st.session_state["location"] = location
-
-    # Use session state location for display
-    location = st.session_state.get("location", None)
-    address = st.session_state.get("address", "")
-
-    # --- 3. build the Folium map ---
-    # default center over Del Mar
-    center = (32.975, -117.245)
-    initial_zoom = 13
-    if location:
-        center = (location.latitude, location.longitude)
-        initial_zoom = 15
-
-    m = folium.Map(location=center, zoom_start=initial_zoom, tiles="OpenStreetMap")
-
-    # Dictionary to store expanded coordinates for each alignment
-    expanded_alignments = {}
-
-    # add routes for Blue, Purple, and Green tracks
-    for name, data in ALIGNMENTS.items():
-        # Get original coordinates
-        coords = data["coords"]
+
+        if search and address:
+            geolocator = Nominatim(user_agent="lossan_app")
+            location = geolocator.geocode(address)
+            if location is None:
+                sidebar_readout.error("Address not found")
+                st.session_state["location"] = None
+            else:
+                st.session_state["address"] = address
+                st.session_state["location"] = location
+
+        # Use session state location for display
+        location = st.session_state.get("location", None)
+        address = st.session_state.get("address", "")
+
+        # --- 3. build the Folium map ---
+        # default center over Del Mar
+        center = (32.975, -117.245)
+        initial_zoom = 13
+        if location:
+            center = (location.latitude, location.longitude)
+            initial_zoom = 15
+
+        m = folium.Map(location=center, zoom_start=initial_zoom, tiles="OpenStreetMap")
+
+        # Dictionary to store expanded coordinates for each alignment
+        expanded_alignments = {}
+
+        # add routes for Blue, Purple, and Green tracks
+        for name, data in ALIGNMENTS.items():
+            # Get original coordinates
+            coords = data["coords"]
         
-        # Generate a smooth path with straight segments and curved corners
-        smoothed_coords = []
+            # Generate a smooth path with straight segments and curved corners
+            smoothed_coords = []
         
-        # Need at least 3 points to have corners to smooth
-        if len(coords) < 3:
-            smoothed_coords = coords.copy()
-        else:
-            # Process each vertex (where two segments meet)
-            for i in range(len(coords)):
-                # First point - just add it
-                if i == 0:
-                    smoothed_coords.append(coords[i])
-                    continue
+            # Need at least 3 points to have corners to smooth
+            if len(coords) < 3:
+                smoothed_coords = coords.copy()
+            else:
+                # Process each vertex (where two segments meet)
+                for i in range(len(coords)):
+                    # First point - just add it
+                    if i == 0:
+                        smoothed_coords.append(coords[i])
+                        continue
                     
-                # Last point - just add it
-                if i == len(coords) - 1:
-                    smoothed_coords.append(coords[i])
-                    continue
+                    # Last point - just add it
+                    if i == len(coords) - 1:
+                        smoothed_coords.append(coords[i])
+                        continue
                     
-                # This is a vertex between two segments
-                p1 = coords[i-1]  # Previous point
-                p2 = coords[i]    # Current vertex
-                p3 = coords[i+1]  # Next point
+                    # This is a vertex between two segments
+                    p1 = coords[i-1]  # Previous point
+                    p2 = coords[i]    # Current vertex
+                    p3 = coords[i+1]  # Next point
                 
-                # Calculate distances
-                dist1 = geodesic(p1, p2).meters
-                dist2 = geodesic(p2, p3).meters
+                    # Calculate distances
+                    dist1 = geodesic(p1, p2).meters
+                    dist2 = geodesic(p2, p3).meters
                 
-                # Skip very short segments
-                if dist1 < 20 or dist2 < 20:
-                    smoothed_coords.append(p2)
-                    continue
+                    # Skip very short segments
+                    if dist1 < 20 or dist2 < 20:
+                        smoothed_coords.append(p2)
+                        continue
                 
-                # Calculate vectors
-                v1 = np.array([p2[0] - p1[0], p2[1] - p1[1]])
-                v2 = np.array([p3[0] - p2[0], p3[1] - p2[1]])
+                    # Calculate vectors
+                    v1 = np.array([p2[0] - p1[0], p2[1] - p1[1]])
+                    v2 = np.array([p3[0] - p2[0], p3[1] - p2[1]])
                 
-                # Normalize vectors
-                v1_norm = v1 / np.linalg.norm(v1)
-                v2_norm = v2 / np.linalg.norm(v2)
+                    # Normalize vectors
+                    v1_norm = v1 / np.linalg.norm(v1)
+                    v2_norm = v2 / np.linalg.norm(v2)
                 
-                # Calculate angle between segments
-                dot_product = np.clip(np.dot(v1_norm, v2_norm), -1.0, 1.0)
-                angle = np.degrees(np.arccos(dot_product))
+                    # Calculate angle between segments
+                    dot_product = np.clip(np.dot(v1_norm, v2_norm), -1.0, 1.0)
+                    angle = np.degrees(np.arccos(dot_product))
                 
-                # Skip if angle is very small (almost straight)
-                if angle < 5:
-                    smoothed_coords.append(p2)
-                    continue
+                    # Skip if angle is very small (almost straight)
+                    if angle < 5:
+                        smoothed_coords.append(p2)
+                        continue
                     
-                # Determine turn direction using cross product
-                cross_product = v1_norm[0]*v2_norm[1] - v1_norm[1]*v2_norm[0]
-                direction = 'right' if cross_product < 0 else 'left'
+                    # Determine turn direction using cross product
+                    cross_product = v1_norm[0]*v2_norm[1] - v1_norm[1]*v2_norm[0]
+                    direction = 'right' if cross_product < 0 else 'left'
                 
-                # Define how much of each segment to use for the curve
-                # Use a fraction of the shorter segment, but limit curve length
-                curve_length = min(dist1, dist2) * 0.3  # Use 30% of shorter segment
-                curve_length = min(curve_length, 200)   # But no more than 200 meters
-                curve_length = max(curve_length, 50)    # And no less than 50 meters
+                    # Define how much of each segment to use for the curve
+                    # Use a fraction of the shorter segment, but limit curve length
+                    curve_length = min(dist1, dist2) * 0.3  # Use 30% of shorter segment
+                    curve_length = min(curve_length, 200)   # But no more than 200 meters
+                    curve_length = max(curve_length, 50)    # And no less than 50 meters
                 
-                # Calculate points for the start and end of the curve
-                # Move back from p2 along v1 by curve_length
-                curve_start_factor = curve_length / dist1
-                curve_start = (
-                    p2[0] - v1_norm[0] * curve_length / 111000,  # Convert meters to degrees lat
-                    p2[1] - v1_norm[1] * curve_length / (111000 * np.cos(np.radians(p2[0])))  # Convert to degrees lon
-                )
+                    # Calculate points for the start and end of the curve
+                    # Move back from p2 along v1 by curve_length
+                    curve_start_factor = curve_length / dist1
+                    curve_start = (
+                        p2[0] - v1_norm[0] * curve_length / 111000,  # Convert meters to degrees lat
+                        p2[1] - v1_norm[1] * curve_length / (111000 * np.cos(np.radians(p2[0])))  # Convert to degrees lon
+                    )
                 
-                # Move forward from p2 along v2 by curve_length
-                curve_end_factor = curve_length / dist2
-                curve_end = (
-                    p2[0] + v2_norm[0] * curve_length / 111000,  # Convert meters to degrees lat
-                    p2[1] + v2_norm[1] * curve_length / (111000 * np.cos(np.radians(p2[0])))  # Convert to degrees lon
-                )
+                    # Move forward from p2 along v2 by curve_length
+                    curve_end_factor = curve_length / dist2
+                    curve_end = (
+                        p2[0] + v2_norm[0] * curve_length / 111000,  # Convert meters to degrees lat
+                        p2[1] + v2_norm[1] * curve_length / (111000 * np.cos(np.radians(p2[0])))  # Convert to degrees lon
+                    )
                 
-                # Add straight segment from previous point to curve start
-                # Only do this for points after the first vertex
-                if i > 1:
-                    # Create a few points along the straight segment for better visualization
-                    for j in range(1, 4):
-                        t = j / 4
-                        lat = smoothed_coords[-1][0] + t * (curve_start[0] - smoothed_coords[-1][0])
-                        lon = smoothed_coords[-1][1] + t * (curve_start[1] - smoothed_coords[-1][1])
-                        smoothed_coords.append((lat, lon))
+                    # Add straight segment from previous point to curve start
+                    # Only do this for points after the first vertex
+                    if i > 1:
+                        # Create a few points along the straight segment for better visualization
+                        for j in range(1, 4):
+                            t = j / 4
+                            lat = smoothed_coords[-1][0] + t * (curve_start[0] - smoothed_coords[-1][0])
+                            lon = smoothed_coords[-1][1] + t * (curve_start[1] - smoothed_coords[-1][1])
+                            smoothed_coords.append((lat, lon))
                 
-                # Choose curve type based on angle
-                if angle > 60:
-                    # For sharper turns, use circular curve
-                    curve_radius = curve_length * 3  # Larger radius for smoother curve
-                    curve_points = create_circular_curve(
-                        start_point=curve_start,
-                        end_point=curve_end,
-                        radius=curve_radius,
-                        direction=direction,
-                        steps=10
-                    )
-                else:
-                    # For gentler turns, use spiral curve
-                    curve_points = create_spiral_curve(
-                        start_point=curve_start,
-                        end_point=curve_end,
-                        direction=direction,
-                        steps=10
-                    )
+                    # Choose curve type based on angle
+                    if angle > 60:
+                        # For sharper turns, use circular curve
+                        curve_radius = curve_length * 3  # Larger radius for smoother curve
+                        curve_points = create_circular_curve(
+                            start_point=curve_start,
+                            end_point=curve_end,
+                            radius=curve_radius,
+                            direction=direction,
+                            steps=10
+                        )
+                    else:
+                        # For gentler turns, use spiral curve
+                        curve_points = create_spiral_curve(
+                            start_point=curve_start,
+                            end_point=curve_end,
+                            direction=direction,
+                            steps=10
+                        )
                 
-                # Add all curve points
-                smoothed_coords.extend(curve_points)
+                    # Add all curve points
+                    smoothed_coords.extend(curve_points)
         
-        # Store expanded coordinates for distance calculations
-        expanded_alignments[name] = smoothed_coords
+            # Store expanded coordinates for distance calculations
+            expanded_alignments[name] = smoothed_coords
         
-        # Add a solid base line for better visibility
-        folium.PolyLine(
-            locations=smoothed_coords,
-            color=data["color"],
-            weight=7,
-            opacity=0.7,
-            tooltip=name
-        ).add_to(m)
+            # Add a solid base line for better visibility
+            folium.PolyLine(
+                locations=smoothed_coords,
+                color=data["color"],
+                weight=7,
+                opacity=0.7,
+                tooltip=name
+            ).add_to(m)
         
-        # Add animated path on top
-        AntPath(
-            locations=smoothed_coords,
-            dash_array=[10, 15],
-            delay=800,
-            color=data["color"],
-            pulseColor='#FFFFFF',
-            paused=False,
-            weight=4,
-            opacity=0.9,
-            tooltip=name
-        ).add_to(m)
-
-    # === YELLOW TRACK ENGINEERING MODEL ===
-    # Create the yellow track using the engineering specifications and directly add to map
+            # Add animated path on top
+            AntPath(
+                locations=smoothed_coords,
+                dash_array=[10, 15],
+                delay=800,
+                color=data["color"],
+                pulseColor='#FFFFFF',
+                paused=False,
+                weight=4,
+                opacity=0.9,
+                tooltip=name
+            ).add_to(m)
+
+        # === YELLOW TRACK ENGINEERING MODEL ===
+        # Create the yellow track using the engineering specifications and directly add to map
     
-    # Known engineering data for the first curve of the yellow track
-    station_2000_coords = (32.9740081, -117.2669915)  # 20+00 station
-    station_2500_coords = (32.9726647, -117.2666647)  # 25+00 station
+        # Known engineering data for the first curve of the yellow track
+        station_2000_coords = (32.9740081, -117.2669915)  # 20+00 station
+        station_2500_coords = (32.9726647, -117.2666647)  # 25+00 station
     
-    # Create a new Railway Alignment for the Yellow route
-    yellow_alignment = RailwayAlignment(name="Yellow Route: Engineering Alignment", color="#FFD700")  # Gold yellow - less bright
+        # Create a new Railway Alignment for the Yellow route
+        yellow_alignment = RailwayAlignment(name="Yellow Route: Engineering Alignment", color="#FFD700")  # Gold yellow - less bright
     
-    # Add reference points
-    yellow_alignment.add_reference_point("STA_2000", station_2000_coords, 2000)
-    yellow_alignment.add_reference_point("STA_2500", station_2500_coords, 2500)
+        # Add reference points
+        yellow_alignment.add_reference_point("STA_2000", station_2000_coords, 2000)
+        yellow_alignment.add_reference_point("STA_2500", station_2500_coords, 2500)
     
-    # Calculate track parameters based on reference points
-    track_params = yellow_alignment.calculate_track_params("STA_2000", "STA_2500")
+        # Calculate track parameters based on reference points
+        track_params = yellow_alignment.calculate_track_params("STA_2000", "STA_2500")
     
-    # Define segments for the Yellow route
+        # Define segments for the Yellow route
     
-    # First tangent segment
-    yellow_alignment.add_tangent("20+00", "24+04.67", name="Initial Tangent")
+        # First tangent segment
+        yellow_alignment.add_tangent("20+00", "24+04.67", name="Initial Tangent")
     
-    # First spiral-curve-spiral segment
-    yellow_alignment.add_curve(
-        ts_station="24+04.67", 
-        sc_station="25+44.67", 
-        cs_station="30+43.75", 
-        st_station="31+83.75",
-        degree_of_curve="9 00'00\"", 
-        direction="right",
-        name="First Curve"
-    )
+        # First spiral-curve-spiral segment
+        yellow_alignment.add_curve(
+            ts_station="24+04.67", 
+            sc_station="25+44.67", 
+            cs_station="30+43.75", 
+            st_station="31+83.75",
+            degree_of_curve="9 00'00\"", 
+            direction="right",
+            name="First Curve"
+        )
     
-    # Second tangent segment
-    yellow_alignment.add_tangent("31+83.75", "37+45.96", name="Middle Tangent")
+        # Second tangent segment
+        yellow_alignment.add_tangent("31+83.75", "37+45.96", name="Middle Tangent")
     
-    # Second spiral-curve-spiral segment
-    yellow_alignment.add_curve(
-        ts_station="37+45.96", 
-        sc_station="39+05.96",  # 39+05.96 = 37+45.96 + 160' (corrected spiral length)
-        cs_station="40+60.67", 
-        st_station="42+20.67",  # 42+20.67 = 40+60.67 + 160' (corrected spiral length)
-        degree_of_curve="9 30'00\"",  # Corrected degree of curve: 9° 30' 00"
-        direction="left",
-        name="Second Curve"
-    )
+        # Second spiral-curve-spiral segment
+        yellow_alignment.add_curve(
+            ts_station="37+45.96", 
+            sc_station="39+05.96",  # 39+05.96 = 37+45.96 + 160' (corrected spiral length)
+            cs_station="40+60.67", 
+            st_station="42+20.67",  # 42+20.67 = 40+60.67 + 160' (corrected spiral length)
+            degree_of_curve="9 30'00\"",  # Corrected degree of curve: 9° 30' 00"
+            direction="left",
+            name="Second Curve"
+        )
     
-    # Third tangent segment (extended alignment)
-    extended_tangent = yellow_alignment.add_tangent("42+20.67", "75+17.38", name="Extended Tangent")
+        # Third tangent segment (extended alignment)
+        extended_tangent = yellow_alignment.add_tangent("42+20.67", "75+17.38", name="Extended Tangent")
     
-    # Manually set bearing for the extended tangent
-    # This is useful to follow the coastline more accurately
-    extended_tangent.manual_bearing = 142.25  # Southeast direction (0=North, 90=East, 180=South)
+        # Manually set bearing for the extended tangent
+        # This is useful to follow the coastline more accurately
+        extended_tangent.manual_bearing = 142.25  # Southeast direction (0=North, 90=East, 180=South)
     
-    # Third spiral-curve-spiral segment
-    yellow_alignment.add_curve(
-        ts_station="75+17.38", 
-        sc_station="79+17.38",  # 79+17.38 = 75+17.38 + 400' (spiral length)
-        cs_station="87+52.17", 
-        st_station="91+52.17",  # 91+52.17 = 87+52.17 + 400' (spiral length)
-        degree_of_curve="2 24'00\"",  # Degree of curve: 2° 24' 00"
-        direction="right",
-        name="Third Curve"
-    )
+        # Third spiral-curve-spiral segment
+        yellow_alignment.add_curve(
+            ts_station="75+17.38", 
+            sc_station="79+17.38",  # 79+17.38 = 75+17.38 + 400' (spiral length)
+            cs_station="87+52.17", 
+            st_station="91+52.17",  # 91+52.17 = 87+52.17 + 400' (spiral length)
+            degree_of_curve="2 24'00\"",  # Degree of curve: 2° 24' 00"
+            direction="right",
+            name="Third Curve"
+        )
     
-    # Fourth tangent segment
-    yellow_alignment.add_tangent("91+52.17", "94+72.45", name="Fourth Tangent")
+        # Fourth tangent segment
+        yellow_alignment.add_tangent("91+52.17", "94+72.45", name="Fourth Tangent")
     
-    # Fourth spiral-curve-spiral segment
-    yellow_alignment.add_curve(
-        ts_station="94+72.45", 
-        sc_station="98+72.45",  # 98+72.45 = 94+72.45 + 400' (spiral length)
-        cs_station="119+62.32", 
-        st_station="123+62.32",  # 123+62.32 = 119+62.32 + 400' (spiral length)
-        degree_of_curve="2 24'00\"",  # Degree of curve: 2° 24' 00"
-        direction="left",
-        name="Fourth Curve"
-    )
+        # Fourth spiral-curve-spiral segment
+        yellow_alignment.add_curve(
+            ts_station="94+72.45", 
+            sc_station="98+72.45",  # 98+72.45 = 94+72.45 + 400' (spiral length)
+            cs_station="119+62.32", 
+            st_station="123+62.32",  # 123+62.32 = 119+62.32 + 400' (spiral length)
+            degree_of_curve="2 24'00\"",  # Degree of curve: 2° 24' 00"
+            direction="left",
+            name="Fourth Curve"
+        )
     
-    # Fifth tangent segment
-    fifth_tangent = yellow_alignment.add_tangent("123+62.32", "162+59.46", name="Fifth Tangent")
-    fifth_tangent.manual_bearing = 171  # Southeast direction (0=North, 90=East, 180=South)
+        # Fifth tangent segment
+        fifth_tangent = yellow_alignment.add_tangent("123+62.32", "162+59.46", name="Fifth Tangent")
+        fifth_tangent.manual_bearing = 171  # Southeast direction (0=North, 90=East, 180=South)
     
-    # Fifth spiral-curve-spiral segment
-    yellow_alignment.add_curve(
-        ts_station="162+59.46", 
-        sc_station="169+09.46",  # 169+09.46 = 162+59.46 + 650' (spiral length)
-        cs_station="175+18.79",  # Note: This was labeled as SC in the query but should be CS
-        st_station="181+68.79",  # 181+68.79 = 175+18.79 + 650' (spiral length)
-        degree_of_curve="0 44'30\"",  # Degree of curve: 0° 44' 30" (very gentle curve)
-        direction="left",
-        name="Fifth Curve"
-    )
+        # Fifth spiral-curve-spiral segment
+        yellow_alignment.add_curve(
+            ts_station="162+59.46", 
+            sc_station="169+09.46",  # 169+09.46 = 162+59.46 + 650' (spiral length)
+            cs_station="175+18.79",  # Note: This was labeled as SC in the query but should be CS
+            st_station="181+68.79",  # 181+68.79 = 175+18.79 + 650' (spiral length)
+            degree_of_curve="0 44'30\"",  # Degree of curve: 0° 44' 30" (very gentle curve)
+            direction="left",
+            name="Fifth Curve"
+        )
     
-    # Sixth tangent segment
-    yellow_alignment.add_tangent("181+68.79", "196+22.24", name="Sixth Tangent")
+        # Sixth tangent segment
+        yellow_alignment.add_tangent("181+68.79", "196+22.24", name="Sixth Tangent")
     
-    # Sixth spiral-curve-spiral segment (MT1 CURVE #6)
-    yellow_alignment.add_curve(
-        ts_station="196+22.24", 
-        sc_station="202+72.24",  # 202+72.24 = 196+22.24 + 650' (spiral length from box)
-        cs_station="208+28.94", 
-        st_station="214+78.94",  # 216+43.12 = 209+93.12 + 650' (spiral length from box)
-        degree_of_curve="0 44'30\"",  # Degree of curve from box: 0° 44' 30"
-        direction="right",
-        name="Sixth Curve (MT1 CURVE #6)"
-    )
+        # Sixth spiral-curve-spiral segment (MT1 CURVE #6)
+        yellow_alignment.add_curve(
+            ts_station="196+22.24", 
+            sc_station="202+72.24",  # 202+72.24 = 196+22.24 + 650' (spiral length from box)
+            cs_station="208+28.94", 
+            st_station="214+78.94",  # 216+43.12 = 209+93.12 + 650' (spiral length from box)
+            degree_of_curve="0 44'30\"",  # Degree of curve from box: 0° 44' 30"
+            direction="right",
+            name="Sixth Curve (MT1 CURVE #6)"
+        )
     
-    # Seventh tangent segment
-    seventh_tangent = yellow_alignment.add_tangent("214+78.94", "235+49.79", name="Seventh Tangent")
+        # Seventh tangent segment
+        seventh_tangent = yellow_alignment.add_tangent("214+78.94", "235+49.79", name="Seventh Tangent")
     
-    # Seventh spiral-curve-spiral segment (CURVE #7)
-    yellow_alignment.add_curve(
-        ts_station="235+49.79", 
-        sc_station="242+29.79",  # 242+29.79 = 235+49.79 + 680' (spiral length)
-        cs_station="275+32.84", 
-        st_station="282+12.84",  # 282+12.84 = 275+32.84 + 680' (spiral length)
-        degree_of_curve="0 49'11\"",  # Degree of curve: 0° 49' 11"
-        direction="right",  # Alternating direction from previous curve
-        name="Seventh Curve"
-    )
+        # Seventh spiral-curve-spiral segment (CURVE #7)
+        yellow_alignment.add_curve(
+            ts_station="235+49.79", 
+            sc_station="242+29.79",  # 242+29.79 = 235+49.79 + 680' (spiral length)
+            cs_station="275+32.84", 
+            st_station="282+12.84",  # 282+12.84 = 275+32.84 + 680' (spiral length)
+            degree_of_curve="0 49'11\"",  # Degree of curve: 0° 49' 11"
+            direction="right",  # Alternating direction from previous curve
+            name="Seventh Curve"
+        )
     
-    # Eighth tangent segment
-    eighth_tangent = yellow_alignment.add_tangent("282+12.84", "285+53.12", name="Eighth Tangent")
+        # Eighth tangent segment
+        eighth_tangent = yellow_alignment.add_tangent("282+12.84", "285+53.12", name="Eighth Tangent")
     
-    # Eighth spiral-curve-spiral segment (CURVE #8)
-    yellow_alignment.add_curve(
-        ts_station="285+53.12", 
-        sc_station="287+93.12",  # 287+93.12 = 285+53.12 + 240' (spiral length)
-        cs_station="294+53.38", 
-        st_station="296+93.38",  # 296+93.38 = 294+53.38 + 240' (spiral length)
-        degree_of_curve="0 15'00\"",  # Degree of curve: 0° 15' 00"
-        direction="right",  # Alternating direction from previous curve
-        name="Eighth Curve"
-    )
+        # Eighth spiral-curve-spiral segment (CURVE #8)
+        yellow_alignment.add_curve(
+            ts_station="285+53.12", 
+            sc_station="287+93.12",  # 287+93.12 = 285+53.12 + 240' (spiral length)
+            cs_station="294+53.38", 
+            st_station="296+93.38",  # 296+93.38 = 294+53.38 + 240' (spiral length)
+            degree_of_curve="0 15'00\"",  # Degree of curve: 0° 15' 00"
+            direction="right",  # Alternating direction from previous curve
+            name="Eighth Curve"
+        )
     
-    # Ninth tangent segment
-    ninth_tangent = yellow_alignment.add_tangent("296+93.38", "304+93.02", name="Ninth Tangent")
+        # Ninth tangent segment
+        ninth_tangent = yellow_alignment.add_tangent("296+93.38", "304+93.02", name="Ninth Tangent")
     
-    # Add the entire alignment to the map
-    yellow_alignment.add_to_map(
-        m=m, 
-        start_ref_point_name="STA_2000", 
-        track_params=track_params
-    )
+        # Add the entire alignment to the map
+        yellow_alignment.add_to_map(
+            m=m, 
+            start_ref_point_name="STA_2000", 
+            track_params=track_params
+        )
     
-    # Add animated outline to each segment of the yellow alignment
-    for i, segment in enumerate(yellow_alignment.segments):
-        segment_name = segment.name
-        segment_tooltip = segment.name
+        # Add animated outline to each segment of the yellow alignment
+        for i, segment in enumerate(yellow_alignment.segments):
+            segment_name = segment.name
+            segment_tooltip = segment.name
         
-        if segment.type == "tangent":
-            segment_tooltip = f"{segment.name} ({segment.start_station} to {segment.end_station})"
-        elif segment.type == "spiral_curve_spiral":
-            curve_info = f"{segment.degree_value:.2f}° curve, {segment.direction} turn"
-            radius_info = f"R={int(segment.radius_ft)}'"
-            spiral_info = f"{int(segment.entry_spiral_length)}' spirals"
-            segment_tooltip = f"{segment.name} ({segment.ts_station} to {segment.st_station})\n{curve_info}, {radius_info}, {spiral_info}"
+            if segment.type == "tangent":
+                segment_tooltip = f"{segment.name} ({segment.start_station} to {segment.end_station})"
+            elif segment.type == "spiral_curve_spiral":
+                curve_info = f"{segment.degree_value:.2f}° curve, {segment.direction} turn"
+                radius_info = f"R={int(segment.radius_ft)}'"
+                spiral_info = f"{int(segment.entry_spiral_length)}' spirals"
+                segment_tooltip = f"{segment.name} ({segment.ts_station} to {segment.st_station})\n{curve_info}, {radius_info}, {spiral_info}"
         
-        # Add AntPath for this segment
-        if segment.type == "tangent":
-            # For tangent segments, use regular dash pattern
-            dash_array = [10, 20]
-            delay = 800
-        else:
-            # For curve segments, use shorter dash pattern for more animated feel
-            dash_array = [5, 15]
-            delay = 600
+            # Add AntPath for this segment
+            if segment.type == "tangent":
+                # For tangent segments, use regular dash pattern
+                dash_array = [10, 20]
+                delay = 800
+            else:
+                # For curve segments, use shorter dash pattern for more animated feel
+                dash_array = [5, 15]
+                delay = 600
             
-        AntPath(
-            locations=yellow_alignment.segment_coords[i],
-            dash_array=dash_array,
-            delay=delay,
-            color='#FFD700',
-            pulseColor='#FFFFFF',
-            paused=False,
-            weight=4,
-            opacity=0.9,
-            tooltip=segment_tooltip
-        ).add_to(m)
+            AntPath(
+                locations=yellow_alignment.segment_coords[i],
+                dash_array=dash_array,
+                delay=delay,
+                color='#FFD700',
+                pulseColor='#FFFFFF',
+                paused=False,
+                weight=4,
+                opacity=0.9,
+                tooltip=segment_tooltip
+            ).add_to(m)
     
-    # Print out bearings at key points for debugging
-    print("\nBearings at key points in railway alignment:")
-    for i, segment in enumerate(yellow_alignment.segments):
-        if segment.type == "tangent":
-            bearing_str = f"{segment.manual_bearing}° (manual)" if segment.manual_bearing is not None else "calculated"
-            print(f"Tangent {i+1} ({segment.name}): {bearing_str}")
-        elif segment.type == "spiral_curve_spiral":
-            print(f"Curve {i+1} ({segment.name}):")
-            print(f"  TS bearing: {segment.ts_bearing:.2f}°")
-            print(f"  SC bearing: {segment.sc_bearing:.2f}°")
-            print(f"  CS bearing: {segment.cs_bearing:.2f}°")
-            print(f"  ST bearing: {segment.st_bearing:.2f}°")
-            print(f"  Direction: {segment.direction}")
-            print(f"  Radius: {segment.radius_ft:.2f} ft")
-            print(f"  Degree of curve: {segment.degree_value:.4f}°")
-
-    # if we have a valid location, plot it + compute distances
-    if location:
-        addr_pt = (location.latitude, location.longitude)
-        folium.Marker(addr_pt, tooltip=address, icon=folium.Icon(color="red")).add_to(m)
-
-        st.sidebar.markdown("## Distances to Each Alignment")
-        for name, data in expanded_alignments.items():
-            # Create a LineString from the coordinates
-            smoothed_coords = data
+        # Print out bearings at key points for debugging
+        print("\nBearings at key points in railway alignment:")
+        for i, segment in enumerate(yellow_alignment.segments):
+            if segment.type == "tangent":
+                bearing_str = f"{segment.manual_bearing}° (manual)" if segment.manual_bearing is not None else "calculated"
+                print(f"Tangent {i+1} ({segment.name}): {bearing_str}")
+            elif segment.type == "spiral_curve_spiral":
+                print(f"Curve {i+1} ({segment.name}):")
+                print(f"  TS bearing: {segment.ts_bearing:.2f}°")
+                print(f"  SC bearing: {segment.sc_bearing:.2f}°")
+                print(f"  CS bearing: {segment.cs_bearing:.2f}°")
+                print(f"  ST bearing: {segment.st_bearing:.2f}°")
+                print(f"  Direction: {segment.direction}")
+                print(f"  Radius: {segment.radius_ft:.2f} ft")
+                print(f"  Degree of curve: {segment.degree_value:.4f}°")
+
+        # if we have a valid location, plot it + compute distances
+        if location:
+            addr_pt = (location.latitude, location.longitude)
+            folium.Marker(addr_pt, tooltip=address, icon=folium.Icon(color="red")).add_to(m)
+
+            sidebar_readout.markdown("## Distances to Each Alignment")
+            for name, data in expanded_alignments.items():
+                # Create a LineString from the coordinates
+                smoothed_coords = data
             
-            # Create a LineString from the smoothed coordinates
-            line = LineString([(lon, lat) for lat, lon in smoothed_coords])
-            pt = Point(location.longitude, location.latitude)
+                # Create a LineString from the smoothed coordinates
+                line = LineString([(lon, lat) for lat, lon in smoothed_coords])
+                pt = Point(location.longitude, location.latitude)
 
-            # find nearest point on the line
-            nearest = line.interpolate(line.project(pt))
-            nearest_lat, nearest_lon = nearest.y, nearest.x
+                # find nearest point on the line
+                nearest = line.interpolate(line.project(pt))
+                nearest_lat, nearest_lon = nearest.y, nearest.x
 
-            # geodesic distance in meters
-            dist_m = geodesic(addr_pt, (nearest_lat, nearest_lon)).meters
+                # geodesic distance in meters
+                dist_m = geodesic(addr_pt, (nearest_lat, nearest_lon)).meters
             
+                # Convert to different units and round
+                dist_ft = round(dist_m * 3.28084)  # Convert meters to feet
+                dist_m_rounded = round(dist_m / 10) * 10  # Round to nearest 10 meters
+                dist_km = round(dist_m / 1000, 1)  # Round to 0.1 km
+                dist_miles = round(dist_m * 0.000621371, 1)  # Round to 0.1 miles
+
+                # draw a connector
+                folium.PolyLine(
+                    [addr_pt, (nearest_lat, nearest_lon)],
+                    color="blue" if "Blue" in name else "magenta" if "Purple" in name else "green" if "Green" in name else "#FF7700",
+                    weight=2,
+                    dash_array="5,5"
+                ).add_to(m)
+
+                sidebar_readout.write(f"**{name}:**")
+                sidebar_readout.write(f"- {dist_ft} ft")
+                sidebar_readout.write(f"- {dist_m_rounded} m")
+                sidebar_readout.write(f"- {dist_km} km")
+                sidebar_readout.write(f"- {dist_miles} mi")
+            
+            # Calculate distance to yellow track
+            yellow_line = LineString([(lon, lat) for lat, lon in yellow_alignment.all_coords])
+            pt = Point(location.longitude, location.latitude)
+        
+            # Find nearest point on the yellow track
+            nearest = yellow_line.interpolate(yellow_line.project(pt))
+            nearest_lat, nearest_lon = nearest.y, nearest.x
+        
+            # Calculate geodesic distance in meters
+            dist_m = geodesic(addr_pt, (nearest_lat, nearest_lon)).meters
+        
             # Convert to different units and round
             dist_ft = round(dist_m * 3.28084)  # Convert meters to feet
             dist_m_rounded = round(dist_m / 10) * 10  # Round to nearest 10 meters
             dist_km = round(dist_m / 1000, 1)  # Round to 0.1 km
             dist_miles = round(dist_m * 0.000621371, 1)  # Round to 0.1 miles
-
-            # draw a connector
+        
+            # Draw a connector
             folium.PolyLine(
                 [addr_pt, (nearest_lat, nearest_lon)],
-                color="blue" if "Blue" in name else "magenta" if "Purple" in name else "green" if "Green" in name else "#FF7700",
+                color="#FF7700",
                 weight=2,
                 dash_array="5,5"
             ).add_to(m)
-
-            st.sidebar.write(f"**{name}:**")
-            st.sidebar.write(f"- {dist_ft} ft")
-            st.sidebar.write(f"- {dist_m_rounded} m")
-            st.sidebar.write(f"- {dist_km} km")
-            st.sidebar.write(f"- {dist_miles} mi")
-            
-        # Calculate distance to yellow track
-        yellow_line = LineString([(lon, lat) for lat, lon in yellow_alignment.all_coords])
-        pt = Point(location.longitude, location.latitude)
-        
-        # Find nearest point on the yellow track
-        nearest = yellow_line.interpolate(yellow_line.project(pt))
-        nearest_lat, nearest_lon = nearest.y, nearest.x
-        
-        # Calculate geodesic distance in meters
-        dist_m = geodesic(addr_pt, (nearest_lat, nearest_lon)).meters
-        
-        # Convert to different units and round
-        dist_ft = round(dist_m * 3.28084)  # Convert meters to feet
-        dist_m_rounded = round(dist_m / 10) * 10  # Round to nearest 10 meters
-        dist_km = round(dist_m / 1000, 1)  # Round to 0.1 km
-        dist_miles = round(dist_m * 0.000621371, 1)  # Round to 0.1 miles
         
-        # Draw a connector
-        folium.PolyLine(
-            [addr_pt, (nearest_lat, nearest_lon)],
-            color="#FF7700",
-            weight=2,
-            dash_array="5,5"
-        ).add_to(m)
+            # Display the distance to Yellow track
+            sidebar_readout.write("**Yellow Route: Engineering Alignment:**")
+            sidebar_readout.write(f"- {dist_ft} ft")
+            sidebar_readout.write(f"- {dist_m_rounded} m")
+            sidebar_readout.write(f"- {dist_km} km")
+            sidebar_readout.write(f"- {dist_miles} mi")
         
-        # Display the distance to Yellow track
-        st.sidebar.write("**Yellow Route: Engineering Alignment:**")
-        st.sidebar.write(f"- {dist_ft} ft")
-        st.sidebar.write(f"- {dist_m_rounded} m")
-        st.sidebar.write(f"- {dist_km} km")
-        st.sidebar.write(f"- {dist_miles} mi")
-        
-        # Add more information about which segment of the yellow track is closest
-        # Find which segment the nearest point belongs to
-        min_distance = float('inf')
-        closest_segment = None
-        segment_index = None
-        
-        for i, segment in enumerate(yellow_alignment.segments):
-            segment_linestring = LineString([(lon, lat) for lat, lon in yellow_alignment.segment_coords[i]])
-            segment_nearest = segment_linestring.interpolate(segment_linestring.project(pt))
-            segment_dist = geodesic(addr_pt, (segment_nearest.y, segment_nearest.x)).meters
-            
-            if segment_dist < min_distance:
-                min_distance = segment_dist
-                closest_segment = segment
-                segment_index = i
-        
-        if closest_segment:
-            # Bold header for closest segment
-            st.sidebar.markdown(f"**Closest to: {closest_segment.name}**")
-            
-            # Determine approximate station of the closest point
-            if closest_segment.type == "tangent":
-                # Calculate percentage along the segment
-                percentage = segment_linestring.project(pt) / segment_linestring.length
-                
-                # Interpolate station value
-                station_value = closest_segment.start_station_value + percentage * (closest_segment.end_station_value - closest_segment.start_station_value)
-                
-                # Format station
-                station_formatted = format_station(station_value)
-                
-                st.sidebar.write(f"Approximate Station: {station_formatted}")
-                
-            elif closest_segment.type == "spiral_curve_spiral":
-                # For curves, show the type of element (entry spiral, circular curve, exit spiral)
-                # Determine which part of the curve is closest
-                
-                # Calculate total curve length
-                total_length = closest_segment.entry_spiral_length + closest_segment.circular_arc_length + closest_segment.exit_spiral_length
-                
-                # Get normalized distance along the curve
-                curve_distance = segment_linestring.project(pt) / segment_linestring.length * total_length
-                
-                if curve_distance < closest_segment.entry_spiral_length:
-                    # In entry spiral
-                    percentage = curve_distance / closest_segment.entry_spiral_length
-                    station_value = closest_segment.ts_station_value + percentage * (closest_segment.sc_station_value - closest_segment.ts_station_value)
-                    element_type = "Entry Spiral"
-                elif curve_distance < closest_segment.entry_spiral_length + closest_segment.circular_arc_length:
-                    # In circular curve
-                    distance_in_curve = curve_distance - closest_segment.entry_spiral_length
-                    percentage = distance_in_curve / closest_segment.circular_arc_length
-                    station_value = closest_segment.sc_station_value + percentage * (closest_segment.cs_station_value - closest_segment.sc_station_value)
-                    element_type = "Circular Curve"
-                else:
-                    # In exit spiral
-                    distance_in_spiral = curve_distance - closest_segment.entry_spiral_length - closest_segment.circular_arc_length
-                    percentage = distance_in_spiral / closest_segment.exit_spiral_length
-                    station_value = closest_segment.cs_station_value + percentage * (closest_segment.st_station_value - closest_segment.cs_station_value)
-                    element_type = "Exit Spiral"
-                
-                # Format station
-                station_formatted = format_station(station_value)
-                
-                st.sidebar.write(f"Element: {element_type}")
-                st.sidebar.write(f"Approximate Station: {station_formatted}")
-                
-                # Add information about the curve
-                if element_type == "Circular Curve":
-                    radius_ft = closest_segment.radius_ft
-                    degree_curve = closest_segment.degree_value
-                    st.sidebar.write(f"Radius: {int(radius_ft)} ft")
-                    st.sidebar.write(f"Degree of Curve: {degree_curve:.2f}°")
+            # Add more information about which segment of the yellow track is
+            # closest. The whole pipeline is fingerprinted on the searched
+            # coordinates in session state: unrelated reruns (widget toggles)
+            # reuse the cached readout strings instead of re-running the
+            # search and spiral math.
+            search_key = (round(location.latitude, 6), round(location.longitude, 6))
+            if st.session_state.get("_station_key") != search_key:
+                # O(1) grid-cell read picks the owning segment inside the
+                # corridor; the vectorized vertex argmin covers the rest
+                yellow_soa = load_segment_soa(yellow_alignment)
+                yellow_grid = load_segment_grid(yellow_alignment)
+                segment_index = lookup_segment_index(
+                    yellow_soa, yellow_grid,
+                    location.latitude, location.longitude)
+                closest_segment = yellow_alignment.segments[segment_index]
+
+                # Bold header for closest segment
+                station_header = f"**Closest to: {closest_segment.name}**"
+                station_details = ""
+
+                # Fraction along the winning segment. The old loop-based search
+                # reused whichever LineString the last iteration left behind,
+                # which was only correct when the final segment happened to win;
+                # build it for the selected segment explicitly.
+                segment_linestring = LineString([(lon, lat) for lat, lon in yellow_alignment.segment_coords[segment_index]])
+
+                # Determine approximate station of the closest point
+                if closest_segment.type == "tangent":
+                    # Calculate percentage along the segment
+                    percentage = segment_linestring.project(pt) / segment_linestring.length
+
+                    # Interpolate station value from the SoA fields
+                    start_value = yellow_soa.start_station[segment_index]
+                    end_value = yellow_soa.end_station[segment_index]
+                    station_value = start_value + percentage * (end_value - start_value)
+
+                    # Format station
+                    station_formatted = format_station(station_value)
+
+                    station_details = f"Approximate Station: {station_formatted}"
+
+                elif closest_segment.type == "spiral_curve_spiral":
+                    # For curves, show the type of element (entry spiral, circular curve, exit spiral)
+                    # Determine which part of the curve is closest - all fields
+                    # read from the SoA arrays at the winning index
+                    entry_spiral_length = yellow_soa.entry_spiral_length[segment_index]
+                    circular_arc_length = yellow_soa.circular_arc_length[segment_index]
+                    exit_spiral_length = yellow_soa.exit_spiral_length[segment_index]
+                    ts_value = yellow_soa.ts_station[segment_index]
+                    sc_value = yellow_soa.sc_station[segment_index]
+                    cs_value = yellow_soa.cs_station[segment_index]
+                    st_value = yellow_soa.st_station[segment_index]
+
+                    # Calculate total curve length
+                    total_length = entry_spiral_length + circular_arc_length + exit_spiral_length
 
-    # --- 4. render ---
-    # Set the map height to fill available space while leaving room for header and footer
-    st_folium(m, width="100%")
+                    # Get normalized distance along the curve
+                    curve_distance = segment_linestring.project(pt) / segment_linestring.length * total_length
+
+                    # Locate the curve element with one searchsorted, then
+                    # evaluate only that element's interpolation: the region
+                    # code indexes the per-element (anchor, offset, reciprocal,
+                    # span) parameters, so the other two branches are never
+                    # computed and no mask temporaries are built.
+                    entry_end = yellow_soa.cum_entry_end[segment_index]
+                    circ_end = yellow_soa.cum_circ_end[segment_index]
+                    region = int(np.searchsorted([entry_end, circ_end],
+                                                 curve_distance, side="right"))
+                    anchor = (ts_value, sc_value, cs_value)[region]
+                    offset = (0.0, entry_end, circ_end)[region]
+                    inv_length = (yellow_soa.inv_entry[segment_index],
+                                  yellow_soa.inv_arc[segment_index],
+                                  yellow_soa.inv_exit[segment_index])[region]
+                    span = (sc_value - ts_value,
+                            cs_value - sc_value,
+                            st_value - cs_value)[region]
+                    station_value = float(
+                        anchor + (curve_distance - offset) * inv_length * span)
+                    # The region code doubles as the element id; the display
+                    # string is resolved only here at render time
+                    element_type = ELEMENT_NAMES[region]
+
+                    # Format station
+                    station_formatted = format_station(station_value)
+
+                    # One markdown widget for the whole readout - each separate
+                    # st.sidebar.write is its own protobuf message and DOM node
+                    station_details = (f"Element: {element_type}  \n"
+                                       f"Approximate Station: {station_formatted}")
+
+                    # Add information about the curve
+                    if element_type == "Circular Curve":
+                        station_details += yellow_soa.curve_info[segment_index]
+
+                st.session_state["_station_key"] = search_key
+                st.session_state["_station_readout"] = (station_header, station_details)
+
+            # Render the readout from the cached strings on every rerun
+            station_header, station_details = st.session_state["_station_readout"]
+            sidebar_readout.markdown(station_header)
+            if station_details:
+                sidebar_readout.markdown(station_details)
+
+        # --- 4. render ---
+        # Set the map height to fill available space while leaving room for
+        # header and footer. Nothing reads the click data st_folium returns,
+        # so serve the cached HTML straight into an iframe and skip the
+        # bidirectional component (and its per-rerun re-render) entirely.
+        map_html = render_map_html(m, address) if location else load_base_map_html(m)
+        components.html(map_html, height=700, scrolling=False)
+
+
+# The search widgets are created here, outside the fragment, because a
+# fragment may not write widgets to outside containers like the sidebar;
+# the fragment reads their values from session state. A click still
+# triggers a full rerun, matching the pre-fragment search behavior.
+if "address_input" not in st.session_state:
+    st.session_state["address_input"] = st.session_state.get("address", "")
+st.sidebar.text_input("Search address", key="address_input")
+st.session_state["search_clicked"] = st.sidebar.button("Search")
+
+# Sidebar slot the fragment writes its readouts into: direct st.sidebar
+# calls are also disallowed from inside a fragment, but static elements
+# written through a container created out here are fine
+sidebar_readout = st.sidebar.container()
+
+# Fragments arrived in Streamlit 1.33/1.37; fall back to a plain call
+# (full-script rerun, the pre-fragment behavior) on older installs.
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+if _fragment is not None:
+    map_and_sidebar = _fragment(map_and_sidebar)
+map_and_sidebar()
 
 # --- 5. Footer with credits and disclaimer ---
-# Create footer using native Streamlit elements
-st.markdown("<div class='custom-footer'>", unsafe_allow_html=True)
-footer_cols = st.columns([3, 1])
-with footer_cols[0]:
-    st.markdown("""
-    The four proposed routes and their distance calculations are based on the most recent SANDAG documentation.
-    """)
-with footer_cols[1]:
-    st.markdown("""
-    **Created by:** Nathan Qiu  
-    **Contact:** [nathanqiu07@gmail.com](mailto:nathanqiu07@gmail.com)
-    """)
-st.markdown("</div>", unsafe_allow_html=True)
+# One markdown widget with an inline flexbox instead of three markdown
+# calls plus an st.columns round-trip - the footer is static, so it
+# should cost a single Streamlit message per rerun
+st.markdown(
+    """
+    <div class='custom-footer' style='display: flex; gap: 20px;'>
+        <div style='flex: 3;'>
+            The four proposed routes and their distance calculations are based on the most recent SANDAG documentation.
+        </div>
+        <div style='flex: 1;'>
+            <b>Created by:</b> Nathan Qiu<br>
+            <b>Contact:</b> <a href='mailto:nathanqiu07@gmail.com'>nathanqiu07@gmail.com</a>
+        </div>
+    </div>
+    """,
+    unsafe_allow_html=True
+)
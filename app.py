@@ -1,10 +1,11 @@
+import os
 import streamlit as st
+import streamlit.components.v1 as components
 import folium
-from streamlit_folium import st_folium
-from geopy.distance import geodesic
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
 import numpy as np
 import pandas as pd
-from folium.plugins import AntPath
 from utils import create_curved_path, create_circular_curve, create_spiral_curve
 from utils.engineering_coords import (
     calculate_track_parameters, 
@@ -19,6 +20,7 @@ from utils.circular_curve import create_railway_circular_curve, add_railway_circ
 from utils.tangent_line import add_railway_tangent_to_map
 from utils.railway_curve import add_complete_railway_curve_to_map, add_complete_railway_alignment_to_map
 from utils.railway_alignment import RailwayAlignment, TangentSegment, CurveSegment
+from utils.fast_geo import haversine_meters, nearest_point_on_polyline
 from utils.portal import Portal
 from opencage.geocoder import OpenCageGeocode
 
@@ -32,9 +34,55 @@ except ImportError:
 # Set page config first
 st.set_page_config(layout="wide")
 
-# Hide default Streamlit footer and add padding
-st.markdown(
+# OpenCage geocoding configuration
+OPENCAGE_API_KEY = "e4a3fe37fe3d469499dc77e798f65245"  # Replace with your OpenCage API key
+SOCAL_BOUNDS = "-117.4,32.5,-116.8,33.3"  # San Diego County area
+
+class LocationResult(NamedTuple):
+    """Geocoded location with the attribute names the app reads."""
+    latitude: float
+    longitude: float
+    address: str
+
+@st.cache_resource(show_spinner=False)
+def get_geocoder():
+    """
+    One OpenCageGeocode client per process.
+
+    The client owns a requests.Session, so constructing it per search paid
+    a fresh TLS handshake and connection-pool warmup each time; a shared
+    instance reuses the pooled connection. The API key is read from
+    st.secrets or the environment when deployed, falling back to the
+    development key above.
+    """
+    try:
+        api_key = st.secrets["opencage_key"]
+    except Exception:
+        api_key = os.environ.get("OPENCAGE_KEY", OPENCAGE_API_KEY)
+    return OpenCageGeocode(api_key)
+
+@st.cache_data(show_spinner=False, max_entries=1024, ttl=86400)
+def geocode_socal(address):
+    """
+    Geocode an address within the San Diego bounds, cached for a day.
+
+    Each OpenCage round trip costs 200-2000 ms; repeated searches for the
+    same (normalized) address are served from the cache without touching
+    the API or its quota. Returns a (lat, lng, formatted) tuple that the
+    caller wraps in LocationResult.
     """
+    results = get_geocoder().geocode(address, bounds=SOCAL_BOUNDS)
+    if results and len(results):
+        location_data = results[0]
+        return (
+            location_data['geometry']['lat'],
+            location_data['geometry']['lng'],
+            location_data['formatted'],
+        )
+    return None
+
+# Hide default Streamlit footer and add padding
+_PAGE_CSS = """
     <style>
     footer {visibility: hidden;}
     /* Make the main content area fill available space but not overflow */
@@ -114,205 +162,131 @@ st.markdown(
         color: #2c5282;
     }
     </style>
-    """,
-    unsafe_allow_html=True
-)
-
-st.title("LOSSAN Rail Realignment Explorer")
-
-# Create a container for the main content
-main_content = st.container()
-
-with main_content:
-    # Add instructions to the main page using a blue box
-    st.markdown("""
-    <div style="background-color: #e6f2ff; padding: 20px; border-radius: 10px; border-left: 5px solid #4b92e5; 
-         margin-bottom: 20px; border: 2px solid #4b92e5; box-shadow: 0 0 10px rgba(75, 146, 229, 0.3);">
-        <h2>How to Use the Interactive Map</h2>
-        
-        Search Your Address:
-        Enter your home address in the search bar and click "Search." The map will display the shortest distance from your location to each proposed rail realignment route and the nearest boring site.
-        
-        Explore Infrastructure Details:
-        Hover over each alignment line to view detailed infrastructure components—such as portals, bored tunnels, cut-and-cover sections, trenches, and U-structures. Hover on pins to view boring locations for geotechnical and geological data collection.
-        
-        Customize the View:
-        Use the checkboxes to toggle individual alignments and boring locations on or off, depending on what you'd like to explore.
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # --- 1. define your four alignments (lat, lon) lists here ---
-    # Green track will now be an engineering track, so we'll remove it from ALIGNMENTS
-    ALIGNMENTS = {}
+    """
 
-    # --- 2. address input & geocoding ---
-    st.sidebar.subheader("Search Location")
-    
-    # Simple text input for address without autocomplete
-    address_input = st.sidebar.text_input("Enter address", value=st.session_state.get("address", ""), key="address_input")
-    
-    # Check if Enter key was pressed (when the text input value changes)
-    if "address_input" in st.session_state and "previous_address" not in st.session_state:
-        st.session_state.previous_address = ""
-        
-    enter_pressed = False
-    if "address_input" in st.session_state and "previous_address" in st.session_state:
-        if st.session_state.address_input != st.session_state.previous_address and st.session_state.address_input:
-            enter_pressed = True
-        st.session_state.previous_address = st.session_state.address_input
-    
-    # Initialize session state for track visibility if not present
-    if "track_visibility" not in st.session_state:
-        st.session_state.track_visibility = {
-            "yellow": True,
-            "blue": True,
-            "purple": True,
-            "green": True,
-            "northern_yellow": True
-        }
-    
-    # Check if any tracks are visible
-    any_tracks_visible = any(st.session_state.track_visibility.values())
-    
-    # Search button - disable if no tracks are visible
-    if not any_tracks_visible and address_input:
-        st.sidebar.warning("Please enable at least one track before searching")
-        search = False
-    else:
-        # Trigger search either by button or Enter key
-        button_search = st.sidebar.button("Search")
-        search = button_search or enter_pressed
-    
-    # Track visibility options
-    st.sidebar.subheader("Track Visibility")
-    
-    # Create toggle options for each track
-    st.sidebar.checkbox("Yellow Track", value=st.session_state.track_visibility["yellow"], 
-                        key="yellow_track_visible", 
-                        on_change=lambda: st.session_state.track_visibility.update({"yellow": st.session_state.yellow_track_visible}))
-    
-    st.sidebar.checkbox("Blue Track", value=st.session_state.track_visibility["blue"], 
-                        key="blue_track_visible", 
-                        on_change=lambda: st.session_state.track_visibility.update({"blue": st.session_state.blue_track_visible}))
-    
-    st.sidebar.checkbox("Purple Track", value=st.session_state.track_visibility["purple"], 
-                        key="purple_track_visible", 
-                        on_change=lambda: st.session_state.track_visibility.update({"purple": st.session_state.purple_track_visible}))
-    
-    st.sidebar.checkbox("Green Track", value=st.session_state.track_visibility["green"], 
-                        key="green_track_visible", 
-                        on_change=lambda: st.session_state.track_visibility.update({"green": st.session_state.green_track_visible}))
-    
-    st.sidebar.checkbox("Northern Yellow Track", value=st.session_state.track_visibility["northern_yellow"], 
-                        key="northern_yellow_track_visible", 
-                        on_change=lambda: st.session_state.track_visibility.update({"northern_yellow": st.session_state.northern_yellow_track_visible}))
+@st.cache_resource(show_spinner=False)
+def _inject_css():
+    """Emit the page-level style block, built and hashed once per process.
 
-    # Add boring locations control
-    st.sidebar.subheader("Boring Locations")
-    
-    # Initialize boring visibility in session state if not present
-    if "boring_visibility" not in st.session_state:
-        st.session_state.boring_visibility = True
-    
-    # Initialize boring year selection in session state if not present
-    if "boring_year" not in st.session_state:
-        st.session_state.boring_year = "2025"
-        
-    # Add checkbox to toggle boring locations
-    st.sidebar.checkbox("Show Boring Locations", value=st.session_state.boring_visibility,
-                        key="boring_locations_visible",
-                        on_change=lambda: setattr(st.session_state, "boring_visibility", st.session_state.boring_locations_visible))
-    
-    # Add radio buttons to select boring year
-    st.sidebar.radio("Boring Location Year", 
-                     options=["2025", "2024"],
-                     key="boring_year_selection",
-                     on_change=lambda: setattr(st.session_state, "boring_year", st.session_state.boring_year_selection))
-    
-    # Add info about boring locations
-    with st.sidebar.expander("Boring Locations Info"):
-        st.write("These markers represent boring locations used for geological surveys along the proposed railway alignments.")
-        st.write("The 'R-' prefix indicates regular borings, while 'RC-' indicates rock core samples.")
-        st.write("You can toggle between 2024 and 2025 boring locations using the radio buttons above.")
+    Static elements recorded inside a cached function are replayed to the
+    browser on cache hits, so the styles still land on every rerun without
+    Python reconstructing and hashing the string each time.
+    """
+    st.markdown(_PAGE_CSS, unsafe_allow_html=True)
 
-    # Initialize session state for location if not present
-    if "location" not in st.session_state:
-        st.session_state["location"] = None
+_inject_css()
 
-    if search and address_input:
-        # Initialize OpenCage geocoder with API key
-        opencage_api_key = "e4a3fe37fe3d469499dc77e798f65245"  # Replace with your OpenCage API key
-        geocoder = OpenCageGeocode(opencage_api_key)
-        
-        try:
-            # Define bounds for San Diego area
-            socal_bounds = "-117.4,32.5,-116.8,33.3"  # San Diego County area
-            
-            # Perform geocoding with bounds constraint
-            results = geocoder.geocode(address_input, bounds=socal_bounds)
-            
-            if results and len(results):
-                # Extract location data from the first result
-                location_data = results[0]
-                
-                # Create a location object with the required attributes
-                class LocationResult:
-                    def __init__(self, lat, lng, formatted):
-                        self.latitude = lat
-                        self.longitude = lng
-                        self.address = formatted
-                
-                location = LocationResult(
-                    location_data['geometry']['lat'],
-                    location_data['geometry']['lng'],
-                    location_data['formatted']
-                )
-                
-                st.session_state["address"] = address_input
-                st.session_state["location"] = location
-            else:
-                st.sidebar.error("Address not found")
-                st.session_state["location"] = None
-        except Exception as e:
-            st.sidebar.error(f"Geocoding service error: {str(e)}")
-            st.session_state["location"] = None
+# Geological boring locations surveyed along the corridor, keyed by year
+BORING_LOCATIONS = {
+    "2024": [
+        {"name": "R-24-002", "latitude": 32.919826, "longitude": -117.239439},
+        {"name": "R-24-004", "latitude": 32.919798, "longitude": -117.241627},
+        {"name": "R-24-005B", "latitude": 32.93025, "longitude": -117.245635},
+        {"name": "R-24-008", "latitude": 32.970812, "longitude": -117.266118},
+        {"name": "RC-24-11", "latitude": 32.965970, "longitude": -117.264261},
+        {"name": "RC-24-12", "latitude": 32.967189, "longitude": -117.265276},
+        {"name": "RC-24-13", "latitude": 32.939822, "longitude": -117.260618},
+        {"name": "RC-24-14", "latitude": 32.933054, "longitude": -117.246391},
+        {"name": "RC-24-15", "latitude": 32.926628, "longitude": -117.241601},
+        {"name": "RC-24-16", "latitude": 32.947879, "longitude": -117.261747},
+        {"name": "RC-24-17", "latitude": 32.951342, "longitude": -117.255873},
+        {"name": "RC-24-18", "latitude": 32.954228, "longitude": -117.262734},
+        {"name": "RC-24-30", "latitude": 32.980163, "longitude": -117.268140},
+        {"name": "RC-24-31", "latitude": 32.973985, "longitude": -117.265193},
+        {"name": "RC-24-32", "latitude": 32.969438, "longitude": -117.261282},
+        {"name": "RC-24-33", "latitude": 32.969282, "longitude": -117.258178},
+        {"name": "RC-24-34", "latitude": 32.967745, "longitude": -117.259878},
+        {"name": "RC-24-35", "latitude": 32.967481, "longitude": -117.251245},
+        {"name": "RC-24-36", "latitude": 32.963180, "longitude": -117.255802},
+        {"name": "RC-24-37", "latitude": 32.961115, "longitude": -117.248894},
+        {"name": "RC-24-38", "latitude": 32.951487, "longitude": -117.244680},
+        {"name": "RC-24-38 (Alternate)", "latitude": 32.945097, "longitude": -117.243998},
+        {"name": "RC-24-39", "latitude": 32.938215, "longitude": -117.242444}
+    ],
+    "2025": [
+        {"name": "R-25-001", "latitude": 32.971046, "longitude": -117.264254},
+        {"name": "R-25-001 (ALT)", "latitude": 32.970734, "longitude": -117.264221},
+        {"name": "R-25-002", "latitude": 32.969379, "longitude": -117.261362},
+        {"name": "R-25-003", "latitude": 32.966078, "longitude": -117.258489},
+        {"name": "R-25-004", "latitude": 32.970336, "longitude": -117.265995},
+        {"name": "R-25-005", "latitude": 32.971853, "longitude": -117.260492},
+        {"name": "R-25-006", "latitude": 32.959975, "longitude": -117.26774},
+        {"name": "R-25-007", "latitude": 32.9728194, "longitude": -117.2562306},
+        {"name": "RC-25-008", "latitude": 32.950464, "longitude": -117.26495},
+        {"name": "R-25-009", "latitude": 32.971503, "longitude": -117.250369},
+        {"name": "RC-25-010", "latitude": 32.941742, "longitude": -117.261893},
+        {"name": "RC-25-010 (ALT)", "latitude": 32.941251, "longitude": -117.26162},
+        {"name": "RC-25-011", "latitude": 32.9653444, "longitude": -117.2489528},
+        {"name": "R-25-012", "latitude": 32.920027, "longitude": -117.241851},
+        {"name": "R-25-013", "latitude": 32.921952, "longitude": -117.239029},
+        {"name": "SR-4", "latitude": 32.928348, "longitude": -117.251231},
+        {"name": "SR-4", "latitude": 32.925997, "longitude": -117.248887},
+        {"name": "SR-5", "latitude": 32.932889, "longitude": -117.256222},
+        {"name": "SR-5", "latitude": 32.930735, "longitude": -117.254084},
+        {"name": "RC-25-014", "latitude": 32.967197, "longitude": -117.265296},
+        {"name": "RC-25-015", "latitude": 32.965777, "longitude": -117.26387},
+        {"name": "RC-25-016", "latitude": 32.954454, "longitude": -117.263053},
+        {"name": "RC-25-017", "latitude": 32.94787, "longitude": -117.261761},
+        {"name": "RC-25-018", "latitude": 32.939808, "longitude": -117.260643},
+        {"name": "RC-25-019", "latitude": 32.957757, "longitude": -117.258327},
+        {"name": "RC-25-019 (ALT)", "latitude": 32.955799, "longitude": -117.257076},
+        {"name": "RC-25-020", "latitude": 32.949152, "longitude": -117.253271},
+        {"name": "RC-25-020 (ALT)", "latitude": 32.949558, "longitude": -117.253189},
+        {"name": "RC-25-021", "latitude": 32.934571, "longitude": -117.245331},
+        {"name": "RC-25-021 (ALT)", "latitude": 32.935461, "longitude": -117.246732},
+        {"name": "RC-25-022", "latitude": 32.930696, "longitude": -117.242233},
+        {"name": "RC-25-023", "latitude": 32.926629, "longitude": -117.241608},
+        {"name": "RC-25-024", "latitude": 32.9629, "longitude": -117.254686},
+        {"name": "RC-25-025", "latitude": 32.957772, "longitude": -117.252188},
+        {"name": "RC-25-025 (ALT)", "latitude": 32.95783, "longitude": -117.252372},
+        {"name": "RC-25-026", "latitude": 32.930579, "longitude": -117.241966},
+        {"name": "RC-25-027", "latitude": 32.95108, "longitude": -117.244676},
+        {"name": "RC-25-028", "latitude": 32.937633, "longitude": -117.242141}
+    ],
+}
 
-    # Use session state location for display
-    location = st.session_state.get("location", None)
-    address = st.session_state.get("address", "")
+def _boring_feature_collection(year):
+    """GeoJSON FeatureCollection for one survey year's borings."""
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [b["longitude"], b["latitude"]]},
+                "properties": {
+                    "name": b["name"],
+                    "latitude": b["latitude"],
+                    "longitude": b["longitude"],
+                    "year": year,
+                },
+            }
+            for b in BORING_LOCATIONS[year]
+        ],
+    }
 
-    # --- 3. build the Folium map ---
-    # default center over Del Mar
-    center = (32.975, -117.245)
-    initial_zoom = 13
-    if location:
-        center = (location.latitude, location.longitude)
-        initial_zoom = 15
+# Serialized once at import; build_map hands the selected year's blob
+# to a single folium.GeoJson layer
+BORING_FEATURES = {year: _boring_feature_collection(year) for year in BORING_LOCATIONS}
 
-    m = folium.Map(location=center, zoom_start=initial_zoom, tiles="OpenStreetMap")
+# Shared reference stations for the Yellow and Northern Yellow tracks
+STATION_2000_COORDS = (32.9740081, -117.2669915)  # 20+00 station
+STATION_2500_COORDS = (32.9726647, -117.2666647)  # 25+00 station
 
-    # Dictionary to store expanded coordinates for each alignment
-    expanded_alignments = {}
+def build_yellow_alignment():
+    """Yellow route: the staff-recommended tunnel alignment.
 
-    
+    Built once per process via load_alignments(): every station string
+    and curve parameter is a hardcoded constant, so there is nothing to
+    key the cache on.
+    """
 
-    # === YELLOW TRACK ENGINEERING MODEL ===
-    # Create the yellow track using the engineering specifications and directly add to map
-    
-    # Known engineering data for the first curve of the yellow track
-    station_2000_coords = (32.9740081, -117.2669915)  # 20+00 station
-    station_2500_coords = (32.9726647, -117.2666647)  # 25+00 station
-    
     # Create a new Railway Alignment for the Yellow route
     yellow_alignment = RailwayAlignment(name="Yellow Route: Engineering Alignment", color="#FFD700")  # Gold yellow - less bright
     
     # Add reference points
-    yellow_alignment.add_reference_point("STA_2000", station_2000_coords, 2000)
-    yellow_alignment.add_reference_point("STA_2500", station_2500_coords, 2500)
-    
-    # Calculate track parameters based on reference points
-    track_params = yellow_alignment.calculate_track_params("STA_2000", "STA_2500")
-    
+    yellow_alignment.add_reference_point("STA_2000", STATION_2000_COORDS, 2000)
+    yellow_alignment.add_reference_point("STA_2500", STATION_2500_COORDS, 2500)
+
     # Define segments for the Yellow route
     
     # First tangent segment
@@ -436,8 +410,68 @@ with main_content:
     yellow_ninth_tangent = yellow_alignment.add_tangent("296+93.38", "304+93.02", name="Ninth Tangent")
 
     
-    # === BLUE TRACK ENGINEERING MODEL ===
-    # Create the blue track using the engineering specifications and directly add to map
+
+    # Track construction-type sections, defined once with the
+    # alignment; render_to_map draws them for visible tracks
+    yellow_alignment.add_track_type_section(
+    track_type="Yellow Track Initial Tangent",
+    start_station="20+00",
+    end_station="24+00",
+    color="#FFD700",
+    tooltip="Yellow Track"
+    )
+    yellow_alignment.add_track_type_section(
+    track_type="Bridge",
+    start_station="24+00",
+    end_station="78+00",
+    color="#FFD700",
+    tooltip="Yellow Track: Bridge"
+    )
+    yellow_alignment.add_track_type_section(
+    track_type="Cut and Cover Tunnel",
+    start_station="78+00",
+    end_station="86+00",
+    color="#FFD700",
+    tooltip="Yellow Track: Cut and Cover Tunnel"
+    )
+    yellow_alignment.add_track_type_section(
+    track_type="Bored Tunnel",
+    start_station="86+00",
+    end_station="226+00",
+    color="#FFD700",
+    tooltip="Yellow Track: Bored Tunnel"
+    )
+    yellow_alignment.add_track_type_section(
+    track_type="Cut and Cover Tunnel",
+    start_station="226+00",
+    end_station="234+00",
+    color="#FFD700",
+    tooltip="Yellow Track: Cut and Cover Tunnel"
+    )
+    yellow_alignment.add_track_type_section(
+    track_type="U-Section",
+    start_station="234+00",
+    end_station="255+00",
+    color="#FFD700",
+    tooltip="Yellow Track: U-Section"
+    )
+    yellow_alignment.add_track_type_section(
+    track_type="Yellow Track Last Tangent",
+    start_station="255+00",
+    end_station="304+93.02",
+    color="#FFD700",
+    tooltip="Yellow Track"
+    )
+
+    return yellow_alignment
+
+def build_blue_alignment():
+    """Blue route: the alignment tunneling under Crest Canyon.
+
+    Built once per process via load_alignments(): every station string
+    and curve parameter is a hardcoded constant, so there is nothing to
+    key the cache on.
+    """
 
     # Create a new Railway Alignment for the Blue route
     blue_alignment = RailwayAlignment(name="Blue Route: Under Crest Canyon", color="blue")
@@ -448,10 +482,7 @@ with main_content:
     
     blue_alignment.add_reference_point("STA_500", blue_sta_500_coords, 500)
     blue_alignment.add_reference_point("STA_1000", blue_sta_1000_coords, 1000)
-    
-    # Calculate track parameters based on reference points
-    blue_track_params = blue_alignment.calculate_track_params("STA_500", "STA_1000")
-    
+
     # Define segments for the Blue route - initial tangent
     blue_first_tangent = blue_alignment.add_tangent("5+00", "17+46.12", name="Initial Tangent")
     
@@ -542,8 +573,74 @@ with main_content:
     blue_seventh_tangent = blue_alignment.add_tangent("266+25.11", "274+32.35", name="Seventh Tangent")
     blue_seventh_tangent.manual_bearing = 135
 
-    # === PURPLE TRACK ENGINEERING MODEL ===
-    # Create the purple track using the engineering specifications and directly add to map
+    # Track construction-type sections, defined once with the
+    # alignment; render_to_map draws them for visible tracks
+    blue_alignment.add_track_type_section(
+    track_type="Blue Track Initial Tangent",
+    start_station="5+00",
+    end_station="14+00",
+    color="blue",
+    tooltip="Blue Track"
+    )
+    blue_alignment.add_track_type_section(
+    track_type="Floodwalls",
+    start_station="14+00",
+    end_station="20+00",
+    color="blue",
+    tooltip="Blue Track: Floodwalls"
+    )
+    blue_alignment.add_track_type_section(
+    track_type="U-Section",
+    start_station="20+00",
+    end_station="26+00",
+    color="blue",
+    tooltip="Blue Track: U-Section"
+    )
+    blue_alignment.add_track_type_section(
+    track_type="Cut and Cover Tunnel",
+    start_station="26+00",
+    end_station="30+00",
+    color="blue",
+    tooltip="Blue Track: Cut and Cover Tunnel"
+    )
+    blue_alignment.add_track_type_section(
+    track_type="Bored Tunnel",
+    start_station="30+00",
+    end_station="195+00",
+    color="blue",
+    tooltip="Blue Track: Bored Tunnel"
+    )
+    blue_alignment.add_track_type_section(
+    track_type="Cut and Cover Tunnel",
+    start_station="195+00",
+    end_station="204+00",
+    color="blue",
+    tooltip="Blue Track: Cut and Cover Tunnel"
+    )
+    blue_alignment.add_track_type_section(
+    track_type="U-Section",
+    start_station="204+00",
+    end_station="224+00",
+    color="blue",
+    tooltip="Blue Track: U-Section"
+    )
+    blue_alignment.add_track_type_section(
+    track_type="Blue Track Last Tangent",
+    start_station="224+00",
+    end_station="274+32.35",
+    color="blue",
+    tooltip="Blue Track"
+    )
+
+    return blue_alignment
+
+def build_purple_alignment():
+    """Purple route: the alignment under Camino Del Mar.
+
+    Built once per process via load_alignments(): every station string
+    and curve parameter is a hardcoded constant, so there is nothing to
+    key the cache on.
+    """
 
     # Create a new Railway Alignment for the Purple route
     purple_alignment = RailwayAlignment(name="Purple Route: Under Camino Del Mar", color="magenta")
@@ -555,9 +652,6 @@ with main_content:
     purple_alignment.add_reference_point("STA_500", purple_sta_500_coords, 500)
     purple_alignment.add_reference_point("STA_1000", purple_sta_1000_coords, 1000)
 
-    # Calculate track parameters based on reference points
-    purple_track_params = purple_alignment.calculate_track_params("STA_500", "STA_1000")
-
     # Define segments for the Purple route - initial tangent
     purple_first_tangent = purple_alignment.add_tangent("5+00", "33+23.02", name="Initial Tangent")
 
@@ -648,14 +742,99 @@ with main_content:
     purple_seventh_tangent = purple_alignment.add_tangent("244+38.89", "280+89.19", name="Seventh Tangent")
     #purple_seventh_tangent.manual_bearing = 160  # More southerly direction
 
-    
-
-    # === GREEN TRACK ENGINEERING MODEL ===
-    # Create the green track using the engineering specifications based on the purple track
-    
-    # Create a new Railway Alignment for the Green route
-    green_alignment = RailwayAlignment(name="Green Route: Del Mar Bluffs Double-Track", color="green")
-    
+    # Track construction-type sections, defined once with the
+    # alignment; render_to_map draws them for visible tracks
+    purple_alignment.add_track_type_section(
+    track_type="Purple Track Initial Tangent",
+    start_station="5+00",
+    end_station="11+00",
+    color="magenta",
+    tooltip="Purple Track"
+    )
+    purple_alignment.add_track_type_section(
+    track_type="Floodwalls",
+    start_station="11+00",
+    end_station="19+00",
+    color="magenta",
+    tooltip="Purple Track: Floodwalls"
+    )
+    purple_alignment.add_track_type_section(
+    track_type="U-Section",
+    start_station="19+00",
+    end_station="26+00",
+    color="magenta",
+    tooltip="Purple Track: U-Section"
+    )
+    purple_alignment.add_track_type_section(
+    track_type="Cut and Cover Tunnel",
+    start_station="26+00",
+    end_station="30+00",
+    color="magenta",
+    tooltip="Purple Track: Cut and Cover Tunnel"
+    )
+    purple_alignment.add_track_type_section(
+    track_type="Bored Tunnel",
+    start_station="30+00",
+    end_station="129+00",
+    color="magenta",
+    tooltip="Purple Track: Bored Tunnel"
+    )
+    purple_alignment.add_track_type_section(
+    track_type="Cut and Cover Tunnel",
+    start_station="129+00",
+    end_station="130+00",
+    color="magenta",
+    tooltip="Purple Track: Cut and Cover Tunnel"
+    )
+    purple_alignment.add_track_type_section(
+    track_type="U-Section",
+    start_station="130+00",
+    end_station="133+00",
+    color="magenta",
+    tooltip="Purple Track: U-Section"
+    )
+    purple_alignment.add_track_type_section(
+    track_type="Bridge",
+    start_station="133+00",
+    end_station="180+00",
+    color="magenta",
+    tooltip="Purple Track: Bridge"
+    )
+    purple_alignment.add_track_type_section(
+    track_type="Purple Track Middle Tangent",
+    start_station="180+00",
+    end_station="187+00",
+    color="magenta",
+    tooltip="Purple Track"
+    )
+    purple_alignment.add_track_type_section(
+    track_type="Bridge",
+    start_station="187+00",
+    end_station="199+00",
+    color="magenta",
+    tooltip="Purple Track: Bridge"
+    )
+    purple_alignment.add_track_type_section(
+    track_type="Purple Track Last Tangent",
+    start_station="199+00",
+    end_station="280+89.19",
+    color="magenta",
+    tooltip="Purple Track"
+    )
+
+    return purple_alignment
+
+def build_green_alignment():
+    """Green route: the Del Mar bluffs double-track alignment.
+
+    Built once per process via load_alignments(): every station string
+    and curve parameter is a hardcoded constant, so there is nothing to
+    key the cache on.
+    """
+    
+    # Create a new Railway Alignment for the Green route
+    green_alignment = RailwayAlignment(name="Green Route: Del Mar Bluffs Double-Track", color="green")
+    
     # Add reference points for the green track
     green_sta_500_coords = (32.9731225, -117.2667758)  # 5+00 station
     #green_sta_1000_coords = (32.9716252, -117.2664515)  # 10+00 station (mannually edited)
@@ -663,16 +842,7 @@ with main_content:
     
     green_alignment.add_reference_point("STA_500", green_sta_500_coords, 500)
     green_alignment.add_reference_point("STA_1000", green_sta_1000_coords, 1000)
-    
-    # Calculate track parameters directly using the engineering_coords function
-    # This ensures precise alignment between reference points
-    green_track_params = calculate_track_parameters(
-        point1=green_sta_500_coords,
-        station1=500,
-        point2=green_sta_1000_coords,
-        station2=1000
-    )
-    
+
     # Define segments for the Green route - initial tangent
     # First tangent from STA_500 to STA_1000 (exactly between reference points)
     green_first_tangent = green_alignment.add_tangent("5+00", "10+00", name="Initial Reference Tangent")
@@ -791,20 +961,75 @@ with main_content:
     # Add eighth tangent
     green_eighth_tangent = green_alignment.add_tangent("248+47.68", "284+97.94", name="Eighth Tangent")
 
+    # Track construction-type sections, defined once with the
+    # alignment; render_to_map draws them for visible tracks
+    green_alignment.add_track_type_section(
+    track_type="Green Track Initial Tangent",
+    start_station="5+00",
+    end_station="48+00",
+    color="green",
+    tooltip="Green Track"
+    )
+    green_alignment.add_track_type_section(
+    track_type="Trench",
+    start_station="48+00",
+    end_station="89+00",
+    color="green",
+    tooltip="Green Track: Trench"
+    )
+    green_alignment.add_track_type_section(
+    track_type="Green Track Middle Tangent",
+    start_station="89+00",
+    end_station="141+00",
+    color="green",
+    tooltip="Green Track"
+    )
+    green_alignment.add_track_type_section(
+    track_type="Bridge",
+    start_station="141+00",
+    end_station="184+00",
+    color="green",
+    tooltip="Green Track: Bridge"
+    )
+    green_alignment.add_track_type_section(
+    track_type="Green Track Short Tangent",
+    start_station="184+00",
+    end_station="191+00",
+    color="green",
+    tooltip="Green Track"
+    )
+    green_alignment.add_track_type_section(
+    track_type="Bridge",
+    start_station="191+00",
+    end_station="203+00",
+    color="green",
+    tooltip="Green Track: Bridge"
+    )
+    green_alignment.add_track_type_section(
+    track_type="Green Track Last Tangent",
+    start_station="203+00",
+    end_station="284+97.94",
+    color="green",
+    tooltip="Green Track"
+    )
 
-    # === NORTHERN YELLOW TRACK ENGINEERING MODEL ===
-    # Create the Northern Yellow track following the San Dieguito River path shown in the image
+    return green_alignment
+
+def build_northern_yellow_alignment():
+    """Northern Yellow route along the San Dieguito River.
+
+    Built once per process via load_alignments(): every station string
+    and curve parameter is a hardcoded constant, so there is nothing to
+    key the cache on.
+    """
     
     # Create a new Railway Alignment for the Northern Yellow route with orange color
     northern_yellow_alignment = RailwayAlignment(name="Northern Yellow Route", color="orange")
     
     # Use the same reference points as the original Yellow track
-    northern_yellow_alignment.add_reference_point("STA_2000", station_2000_coords, 2000)
-    northern_yellow_alignment.add_reference_point("STA_2500", station_2500_coords, 2500)
-    
-    # Calculate track parameters based on reference points - same as yellow track
-    northern_yellow_track_params = yellow_alignment.calculate_track_params("STA_2000", "STA_2500")
-    
+    northern_yellow_alignment.add_reference_point("STA_2000", STATION_2000_COORDS, 2000)
+    northern_yellow_alignment.add_reference_point("STA_2500", STATION_2500_COORDS, 2500)
+
     # Define segments for the Northern Yellow route
     # Start further back with initial tangent from the coast
     northern_yellow_first_tangent = northern_yellow_alignment.add_tangent("10+00", "19+00", name="First Tangent")
@@ -923,777 +1148,530 @@ with main_content:
     
     # Ninth tangent segment
     northern_yellow_ninth_tangent = northern_yellow_alignment.add_tangent("309+93.38", "317+93.02", name="Ninth Tangent")
-    # Add CSS to disable hover/tooltips on original polylines
-    css = """
-    <style>
-    .folium-map .leaflet-pane path:not(.yellow-bridge-overlay) {
-        pointer-events: none !important;
-    }
-    </style>
+
+    return northern_yellow_alignment
+
+@st.cache_resource(show_spinner=False)
+def load_alignments():
+    """Build all five alignments concurrently, once per process.
+
+    The builders are independent trig-heavy computations, so a small
+    thread pool overlaps them on cold start. Caching the single entry
+    point instead of each builder keeps the worker threads free of
+    Streamlit cache machinery.
+
+    Coordinates are also sampled here, exactly once, against a throwaway
+    map: the alignments are process-wide shared singletons, and
+    add_to_map resets and repopulates their segment state, so concurrent
+    map builds for different cache keys must never call it themselves.
+    build_map draws through the read-only render_to_map instead.
     """
-    
-    # Add the CSS to the map
-    m.get_root().html.add_child(folium.Element(css))
-    
-    # Add the entire alignment to the map
-    if st.session_state.track_visibility["yellow"]:
-        yellow_alignment.add_to_map(
-            m=m, 
-            start_ref_point_name="STA_2000", 
-            track_params=track_params,
-            add_markers=False,  # Hide all pin points
-            hide_technical_info=True  # Hide tangent/curve information
-        )
-        
-        # Define track type sections for the Yellow alignment
-        yellow_alignment.add_track_type_section(
-            track_type="Yellow Track Initial Tangent",
-            start_station="20+00",
-            end_station="24+00",
-            color="#FFD700",
-            tooltip="Yellow Track"
-        )
-        
-        yellow_alignment.add_track_type_section(
-            track_type="Bridge",
-            start_station="24+00",
-            end_station="78+00",
-            color="#FFD700",
-            tooltip="Yellow Track: Bridge"
-        )
-        
-        yellow_alignment.add_track_type_section(
-            track_type="Cut and Cover Tunnel",
-            start_station="78+00",
-            end_station="86+00",
-            color="#FFD700",
-            tooltip="Yellow Track: Cut and Cover Tunnel"
-        )
-        
-        yellow_alignment.add_track_type_section(
-            track_type="Bored Tunnel",
-            start_station="86+00",
-            end_station="226+00",
-            color="#FFD700",
-            tooltip="Yellow Track: Bored Tunnel"
-        )
-        
-        yellow_alignment.add_track_type_section(
-            track_type="Cut and Cover Tunnel",
-            start_station="226+00",
-            end_station="234+00",
-            color="#FFD700",
-            tooltip="Yellow Track: Cut and Cover Tunnel"
-        )
-        
-        yellow_alignment.add_track_type_section(
-            track_type="U-Section",
-            start_station="234+00",
-            end_station="255+00",
-            color="#FFD700",
-            tooltip="Yellow Track: U-Section"
-        )
-        
-        yellow_alignment.add_track_type_section(
-            track_type="Yellow Track Last Tangent",
-            start_station="255+00",
-            end_station="304+93.02",
-            color="#FFD700",
-            tooltip="Yellow Track"
-        )
-    
-    # Render the yellow track type sections
-    if st.session_state.track_visibility["yellow"]:
-        yellow_alignment.render_track_type_sections(m)
-    
-    # Add the blue alignment to the map with hidden technical details
-    if st.session_state.track_visibility["blue"]:
-        blue_alignment.add_to_map(
-            m=m,
-            start_ref_point_name="STA_500",
-            track_params=blue_track_params,
-            add_markers=False,  # Hide all pin points
-            hide_technical_info=True  # Hide tangent/curve information
-        )
-        
-        # Define track type sections for the Blue alignment
-        blue_alignment.add_track_type_section(
-            track_type="Blue Track Initial Tangent",
-            start_station="5+00",
-            end_station="14+00",
-            color="blue",
-            tooltip="Blue Track"
-        )
-        
-        blue_alignment.add_track_type_section(
-            track_type="Floodwalls",
-            start_station="14+00",
-            end_station="20+00",
-            color="blue",
-            tooltip="Blue Track: Floodwalls"
-        )
-        
-        blue_alignment.add_track_type_section(
-            track_type="U-Section",
-            start_station="20+00",
-            end_station="26+00",
-            color="blue",
-            tooltip="Blue Track: U-Section"
-        )
-        
-        blue_alignment.add_track_type_section(
-            track_type="Cut and Cover Tunnel",
-            start_station="26+00",
-            end_station="30+00",
-            color="blue",
-            tooltip="Blue Track: Cut and Cover Tunnel"
-        )
-        
-        blue_alignment.add_track_type_section(
-            track_type="Bored Tunnel",
-            start_station="30+00",
-            end_station="195+00",
-            color="blue",
-            tooltip="Blue Track: Bored Tunnel"
-        )
-        
-        blue_alignment.add_track_type_section(
-            track_type="Cut and Cover Tunnel",
-            start_station="195+00",
-            end_station="204+00",
-            color="blue",
-            tooltip="Blue Track: Cut and Cover Tunnel"
-        )
-        
-        blue_alignment.add_track_type_section(
-            track_type="U-Section",
-            start_station="204+00",
-            end_station="224+00",
-            color="blue",
-            tooltip="Blue Track: U-Section"
-        )
+    builders = [
+        build_yellow_alignment,
+        build_blue_alignment,
+        build_purple_alignment,
+        build_green_alignment,
+        build_northern_yellow_alignment,
+    ]
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        alignments = tuple(executor.map(lambda build: build(), builders))
 
-        blue_alignment.add_track_type_section(
-            track_type="Blue Track Last Tangent",
-            start_station="224+00",
-            end_station="274+32.35",
-            color="blue",
-            tooltip="Blue Track"
-        )
-        
-        # Render the blue track type sections
-        blue_alignment.render_track_type_sections(m)
-    
-    # Add the purple alignment to the map
-    if st.session_state.track_visibility["purple"]:
-        purple_alignment.add_to_map(
-            m=m,
-            start_ref_point_name="STA_500",
-            track_params=purple_track_params,
-            add_markers=False,  # Hide all pin points
-            hide_technical_info=True  # Hide tangent/curve information
-        )
-        
-        # Define track type sections for the Purple alignment
-        purple_alignment.add_track_type_section(
-            track_type="Purple Track Initial Tangent",
-            start_station="5+00",
-            end_station="11+00",
-            color="magenta",
-            tooltip="Purple Track"
-        )
-        
-        purple_alignment.add_track_type_section(
-            track_type="Floodwalls",
-            start_station="11+00",
-            end_station="19+00",
-            color="magenta",
-            tooltip="Purple Track: Floodwalls"
-        )
-        
-        purple_alignment.add_track_type_section(
-            track_type="U-Section",
-            start_station="19+00",
-            end_station="26+00",
-            color="magenta",
-            tooltip="Purple Track: U-Section"
-        )
-        
-        purple_alignment.add_track_type_section(
-            track_type="Cut and Cover Tunnel",
-            start_station="26+00",
-            end_station="30+00",
-            color="magenta",
-            tooltip="Purple Track: Cut and Cover Tunnel"
-        )
-        
-        purple_alignment.add_track_type_section(
-            track_type="Bored Tunnel",
-            start_station="30+00",
-            end_station="129+00",
-            color="magenta",
-            tooltip="Purple Track: Bored Tunnel"
-        )
-        
-        purple_alignment.add_track_type_section(
-            track_type="Cut and Cover Tunnel",
-            start_station="129+00",
-            end_station="130+00",
-            color="magenta",
-            tooltip="Purple Track: Cut and Cover Tunnel"
-        )
-        
-        purple_alignment.add_track_type_section(
-            track_type="U-Section",
-            start_station="130+00",
-            end_station="133+00",
-            color="magenta",
-            tooltip="Purple Track: U-Section"
-        )
-        
-        purple_alignment.add_track_type_section(
-            track_type="Bridge",
-            start_station="133+00",
-            end_station="180+00",
-            color="magenta",
-            tooltip="Purple Track: Bridge"
-        )
-        
-        purple_alignment.add_track_type_section(
-            track_type="Purple Track Middle Tangent",
-            start_station="180+00",
-            end_station="187+00",
-            color="magenta",
-            tooltip="Purple Track"
-        )
-        
-        purple_alignment.add_track_type_section(
-            track_type="Bridge",
-            start_station="187+00",
-            end_station="199+00",
-            color="magenta",
-            tooltip="Purple Track: Bridge"
-        )
-        
-        purple_alignment.add_track_type_section(
-            track_type="Purple Track Last Tangent",
-            start_station="199+00",
-            end_station="280+89.19",
-            color="magenta",
-            tooltip="Purple Track"
-        )
-        
-        # Render the purple track type sections
-        purple_alignment.render_track_type_sections(m)
-    
-    # Add the green alignment to the map
-    if st.session_state.track_visibility["green"]:
-        green_alignment.add_to_map(
-            m=m,
-            start_ref_point_name="STA_500",
-            track_params=green_track_params,
-            add_markers=False,  # Hide all pin points
-            hide_technical_info=True  # Hide tangent/curve information
-        )
-        
-        # Define track type sections for the Green alignment
-        green_alignment.add_track_type_section(
-            track_type="Green Track Initial Tangent",
-            start_station="5+00",
-            end_station="48+00",
-            color="green",
-            tooltip="Green Track"
-        )
-        
-        green_alignment.add_track_type_section(
-            track_type="Trench",
-            start_station="48+00",
-            end_station="89+00",
-            color="green",
-            tooltip="Green Track: Trench"
-        )
-        
-        green_alignment.add_track_type_section(
-            track_type="Green Track Middle Tangent",
-            start_station="89+00",
-            end_station="141+00",
-            color="green",
-            tooltip="Green Track"
-        )
-        
-        green_alignment.add_track_type_section(
-            track_type="Bridge",
-            start_station="141+00",
-            end_station="184+00",
-            color="green",
-            tooltip="Green Track: Bridge"
-        )
-        
-        green_alignment.add_track_type_section(
-            track_type="Green Track Short Tangent",
-            start_station="184+00",
-            end_station="191+00",
-            color="green",
-            tooltip="Green Track"
-        )
-        
-        green_alignment.add_track_type_section(
-            track_type="Bridge",
-            start_station="191+00",
-            end_station="203+00",
-            color="green",
-            tooltip="Green Track: Bridge"
-        )
-        
-        green_alignment.add_track_type_section(
-            track_type="Green Track Last Tangent",
-            start_station="203+00",
-            end_station="284+97.94",
-            color="green",
-            tooltip="Green Track"
-        )
-        
-        # Render the green track type sections
-        green_alignment.render_track_type_sections(m)
-    
-    # Add the Northern Yellow alignment to the map
-    if st.session_state.track_visibility["northern_yellow"]:
-        northern_yellow_alignment.add_to_map(
-            m=m,
-            start_ref_point_name="STA_2000",
-            track_params=northern_yellow_track_params,
-            add_markers=False,  # Hide all pin points
-            hide_technical_info=True  # Hide tangent/curve information
+    scratch = folium.Map(location=(32.975, -117.245), zoom_start=13)
+    for alignment, (ref1, ref2) in zip(alignments, (
+        ("STA_2000", "STA_2500"),
+        ("STA_500", "STA_1000"),
+        ("STA_500", "STA_1000"),
+        ("STA_500", "STA_1000"),
+        ("STA_2000", "STA_2500"),
+    )):
+        alignment.add_to_map(
+            m=scratch,
+            start_ref_point_name=ref1,
+            track_params=alignment.calculate_track_params(ref1, ref2),
+            add_markers=False,
+            hide_technical_info=True
         )
+    return alignments
+
+@st.cache_resource(show_spinner=False)
+def load_track_geometries():
+    """
+    Shapely LineString and (N, 2) coordinate array per track, built once.
 
-        northern_yellow_alignment.render_track_type_sections(m)
-    
-    # Define all portals using the Portal class
-    portals = [
-        # Blue track portals
-        Portal(
-            name="Jimmy Durante Blvd Portal",
-            track_alignment=blue_alignment,
-            station_value=2600,  # 26+00
-            color="blue",
-            description="Western portal of the Blue Route tunnel under Jimmy Durante Blvd"
-        ),
+    The distance sidebar rebuilt each track's LineString from its tuple
+    list on every address search. load_alignments() samples every track's
+    coordinates at build time, so this just packages them; the geometries
+    persist for the life of the process.
+    """
+    (yellow_alignment, blue_alignment, purple_alignment,
+     green_alignment, northern_yellow_alignment) = load_alignments()
+
+    geometries = {}
+    for name, alignment in (
+        ("yellow", yellow_alignment),
+        ("blue", blue_alignment),
+        ("purple", purple_alignment),
+        ("green", green_alignment),
+        ("northern_yellow", northern_yellow_alignment),
+    ):
+        coords = np.asarray(alignment.all_coords, dtype=np.float64)
+        line = LineString(coords[:, ::-1])  # shapely wants (lon, lat)
+        geometries[name] = (line, coords)
+    return geometries
+
+st.title("LOSSAN Rail Realignment Explorer")
+
+# Create a container for the main content
+main_content = st.container()
+
+with main_content:
+    # Add instructions to the main page using a blue box
+    st.markdown("""
+    <div style="background-color: #e6f2ff; padding: 20px; border-radius: 10px; border-left: 5px solid #4b92e5; 
+         margin-bottom: 20px; border: 2px solid #4b92e5; box-shadow: 0 0 10px rgba(75, 146, 229, 0.3);">
+        <h2>How to Use the Interactive Map</h2>
         
-        # Purple track portals
-        Portal(
-            name="Torrey Pines Rd West Portal",
-            track_alignment=purple_alignment,
-            station_value=13000,  # 130+00
-            color="magenta",
-            description="Western portal of the Purple Route tunnel under Torrey Pines Road"
-        ),
+        Search Your Address:
+        Enter your home address in the search bar and click "Search." The map will display the shortest distance from your location to each proposed rail realignment route and the nearest boring site.
         
-        # Yellow track portals
-        Portal(
-            name="Racetrack View Dr Portal",
-            track_alignment=yellow_alignment,
-            station_value=7800,  # 82+00
-            color="red",
-            description="Northern portal of the Yellow Route tunnel at Racetrack View Drive"
-        ),
+        Explore Infrastructure Details:
+        Hover over each alignment line to view detailed infrastructure components—such as portals, bored tunnels, cut-and-cover sections, trenches, and U-structures. Hover on pins to view boring locations for geotechnical and geological data collection.
         
-        Portal(
-            name="I-5 Knoll Portal",
-            track_alignment=yellow_alignment,
-            station_value=parse_station("234+00"),  # TS station of the seventh curve
-            color="#B8860B",  # Dark goldenrod
-            description="Southern portal of the Yellow Route tunnel at I-5 Knoll"
-        )
-    ]
+        Customize the View:
+        Use the checkboxes to toggle individual alignments and boring locations on or off, depending on what you'd like to explore.
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # --- address input & geocoding ---
+    st.sidebar.subheader("Search Location")
+    
+    # Simple text input for address without autocomplete
+    address_input = st.sidebar.text_input("Enter address", value=st.session_state.get("address", ""), key="address_input")
     
-    # Add all portals to the map
-    for portal in portals:
-        # Only add portals for tracks that are visible
-        track_alignment = portal.track_alignment
-        if track_alignment == yellow_alignment and st.session_state.track_visibility["yellow"]:
-            portal.add_to_map(m)
-        elif track_alignment == blue_alignment and st.session_state.track_visibility["blue"]:
-            portal.add_to_map(m)
-        elif track_alignment == purple_alignment and st.session_state.track_visibility["purple"]:
-            portal.add_to_map(m)
-        elif track_alignment == green_alignment and st.session_state.track_visibility["green"]:
-            portal.add_to_map(m)
-        elif track_alignment == northern_yellow_alignment and st.session_state.track_visibility["northern_yellow"]:
-            portal.add_to_map(m)
-    
-    # Add animated path for the Northern Yellow track
-    if northern_yellow_alignment.all_coords:
-        # Add a solid base line
-        folium.PolyLine(
-            locations=northern_yellow_alignment.all_coords,
-            color='orange',
-            weight=7,
-            opacity=0.7,
-            tooltip="Northern Yellow Route"
-        ).add_to(m)
+    # Check if Enter key was pressed (when the text input value changes)
+    if "address_input" in st.session_state and "previous_address" not in st.session_state:
+        st.session_state.previous_address = ""
         
-        # Add animated path
-        AntPath(
-            locations=northern_yellow_alignment.all_coords,
-            dash_array=[10, 20],
-            delay=800,
-            color='orange',
-            pulseColor='white',
-            paused=False,
-            weight=5,
-            opacity=0.9,
-            tooltip="Northern Yellow Route",
-            className="northern-yellow-route-overlay"  # Special class to allow hover
-        ).add_to(m)
-    
-    # Add boring location markers
-    boring_locations_2024 = [
-        {"name": "R-24-002", "latitude": 32.919826, "longitude": -117.239439},
-        {"name": "R-24-004", "latitude": 32.919798, "longitude": -117.241627},
-        {"name": "R-24-005B", "latitude": 32.93025, "longitude": -117.245635},
-        {"name": "R-24-008", "latitude": 32.970812, "longitude": -117.266118},
-        {"name": "RC-24-11", "latitude": 32.965970, "longitude": -117.264261},
-        {"name": "RC-24-12", "latitude": 32.967189, "longitude": -117.265276},
-        {"name": "RC-24-13", "latitude": 32.939822, "longitude": -117.260618},
-        {"name": "RC-24-14", "latitude": 32.933054, "longitude": -117.246391},
-        {"name": "RC-24-15", "latitude": 32.926628, "longitude": -117.241601},
-        {"name": "RC-24-16", "latitude": 32.947879, "longitude": -117.261747},
-        {"name": "RC-24-17", "latitude": 32.951342, "longitude": -117.255873},
-        {"name": "RC-24-18", "latitude": 32.954228, "longitude": -117.262734},
-        {"name": "RC-24-30", "latitude": 32.980163, "longitude": -117.268140},
-        {"name": "RC-24-31", "latitude": 32.973985, "longitude": -117.265193},
-        {"name": "RC-24-32", "latitude": 32.969438, "longitude": -117.261282},
-        {"name": "RC-24-33", "latitude": 32.969282, "longitude": -117.258178},
-        {"name": "RC-24-34", "latitude": 32.967745, "longitude": -117.259878},
-        {"name": "RC-24-35", "latitude": 32.967481, "longitude": -117.251245},
-        {"name": "RC-24-36", "latitude": 32.963180, "longitude": -117.255802},
-        {"name": "RC-24-37", "latitude": 32.961115, "longitude": -117.248894},
-        {"name": "RC-24-38", "latitude": 32.951487, "longitude": -117.244680},
-        {"name": "RC-24-38 (Alternate)", "latitude": 32.945097, "longitude": -117.243998},
-        {"name": "RC-24-39", "latitude": 32.938215, "longitude": -117.242444}
-    ]
+    enter_pressed = False
+    if "address_input" in st.session_state and "previous_address" in st.session_state:
+        if st.session_state.address_input != st.session_state.previous_address and st.session_state.address_input:
+            enter_pressed = True
+        st.session_state.previous_address = st.session_state.address_input
     
-    # Add 2025 boring location markers from the table
-    boring_locations_2025 = [
-        {"name": "R-25-001", "latitude": 32.971046, "longitude": -117.264254},
-        {"name": "R-25-001 (ALT)", "latitude": 32.970734, "longitude": -117.264221},
-        {"name": "R-25-002", "latitude": 32.969379, "longitude": -117.261362},
-        {"name": "R-25-003", "latitude": 32.966078, "longitude": -117.258489},
-        {"name": "R-25-004", "latitude": 32.970336, "longitude": -117.265995},
-        {"name": "R-25-005", "latitude": 32.971853, "longitude": -117.260492},
-        {"name": "R-25-006", "latitude": 32.959975, "longitude": -117.26774},
-        {"name": "R-25-007", "latitude": 32.9728194, "longitude": -117.2562306},
-        {"name": "RC-25-008", "latitude": 32.950464, "longitude": -117.26495},
-        {"name": "R-25-009", "latitude": 32.971503, "longitude": -117.250369},
-        {"name": "RC-25-010", "latitude": 32.941742, "longitude": -117.261893},
-        {"name": "RC-25-010 (ALT)", "latitude": 32.941251, "longitude": -117.26162},
-        {"name": "RC-25-011", "latitude": 32.9653444, "longitude": -117.2489528},
-        {"name": "R-25-012", "latitude": 32.920027, "longitude": -117.241851},
-        {"name": "R-25-013", "latitude": 32.921952, "longitude": -117.239029},
-        {"name": "SR-4", "latitude": 32.928348, "longitude": -117.251231},
-        {"name": "SR-4", "latitude": 32.925997, "longitude": -117.248887},
-        {"name": "SR-5", "latitude": 32.932889, "longitude": -117.256222},
-        {"name": "SR-5", "latitude": 32.930735, "longitude": -117.254084},
-        {"name": "RC-25-014", "latitude": 32.967197, "longitude": -117.265296},
-        {"name": "RC-25-015", "latitude": 32.965777, "longitude": -117.26387},
-        {"name": "RC-25-016", "latitude": 32.954454, "longitude": -117.263053},
-        {"name": "RC-25-017", "latitude": 32.94787, "longitude": -117.261761},
-        {"name": "RC-25-018", "latitude": 32.939808, "longitude": -117.260643},
-        {"name": "RC-25-019", "latitude": 32.957757, "longitude": -117.258327},
-        {"name": "RC-25-019 (ALT)", "latitude": 32.955799, "longitude": -117.257076},
-        {"name": "RC-25-020", "latitude": 32.949152, "longitude": -117.253271},
-        {"name": "RC-25-020 (ALT)", "latitude": 32.949558, "longitude": -117.253189},
-        {"name": "RC-25-021", "latitude": 32.934571, "longitude": -117.245331},
-        {"name": "RC-25-021 (ALT)", "latitude": 32.935461, "longitude": -117.246732},
-        {"name": "RC-25-022", "latitude": 32.930696, "longitude": -117.242233},
-        {"name": "RC-25-023", "latitude": 32.926629, "longitude": -117.241608},
-        {"name": "RC-25-024", "latitude": 32.9629, "longitude": -117.254686},
-        {"name": "RC-25-025", "latitude": 32.957772, "longitude": -117.252188},
-        {"name": "RC-25-025 (ALT)", "latitude": 32.95783, "longitude": -117.252372},
-        {"name": "RC-25-026", "latitude": 32.930579, "longitude": -117.241966},
-        {"name": "RC-25-027", "latitude": 32.95108, "longitude": -117.244676},
-        {"name": "RC-25-028", "latitude": 32.937633, "longitude": -117.242141}
-    ]
+    # Initialize session state for track visibility if not present
+    if "track_visibility" not in st.session_state:
+        st.session_state.track_visibility = {
+            "yellow": True,
+            "blue": True,
+            "purple": True,
+            "green": True,
+            "northern_yellow": True
+        }
     
-    # Select the boring locations based on the selected year
-    boring_locations = boring_locations_2024 if st.session_state.boring_year == "2024" else boring_locations_2025
-    
-    # Create a feature group for boring markers so they can be toggled as a group
-    boring_markers = folium.FeatureGroup(name=f"Boring Locations ({st.session_state.boring_year})")
-    
-    # Add each boring marker to the map if boring visibility is enabled
-    if st.session_state.boring_visibility:
-        for boring in boring_locations:
-            # Use CircleMarker instead of DivIcon for better compatibility
-            folium.CircleMarker(
-                location=[boring["latitude"], boring["longitude"]],
-                radius=6,
-                color='white',
-                fill=True,
-                fill_color='#4B0082' if st.session_state.boring_year == "2024" else '#006400',  # Purple for 2024, Dark Green for 2025
-                fill_opacity=1.0,
-                weight=2,
-                tooltip=boring["name"],
-                popup=folium.Popup(
-                    f"""
-                    <div style="min-width: 150px; text-align: center;">
-                        <h4>{boring["name"]}</h4>
-                        <p>Latitude: {boring["latitude"]}<br>
-                        Longitude: {boring["longitude"]}<br>
-                        Year: {st.session_state.boring_year}</p>
-                    </div>
-                    """,
-                    max_width=300
-                )
-            ).add_to(boring_markers)
+    # Check if any tracks are visible
+    any_tracks_visible = any(st.session_state.track_visibility.values())
     
-    # Add the feature group to the map
-    boring_markers.add_to(m)
+    # Search button - disable if no tracks are visible
+    if not any_tracks_visible and address_input:
+        st.sidebar.warning("Please enable at least one track before searching")
+        search = False
+    else:
+        # Trigger search either by button or Enter key
+        button_search = st.sidebar.button("Search")
+        search = button_search or enter_pressed
     
-    # Add a control to toggle boring markers
-    folium.LayerControl().add_to(m)
-                
-    # if we have a valid location, plot it + compute distances
-    if location:
-        addr_pt = (location.latitude, location.longitude)
-        folium.Marker(addr_pt, tooltip=address, icon=folium.Icon(color="red")).add_to(m)
-
-        # Create Point object for shapely operations
-        pt = Point(location.longitude, location.latitude)
+    # Track visibility options
+    st.sidebar.subheader("Track Visibility")
+    
+    # Create toggle options for each track
+    st.sidebar.checkbox("Yellow Track", value=st.session_state.track_visibility["yellow"], 
+                        key="yellow_track_visible", 
+                        on_change=lambda: st.session_state.track_visibility.update({"yellow": st.session_state.yellow_track_visible}))
+    
+    st.sidebar.checkbox("Blue Track", value=st.session_state.track_visibility["blue"], 
+                        key="blue_track_visible", 
+                        on_change=lambda: st.session_state.track_visibility.update({"blue": st.session_state.blue_track_visible}))
+    
+    st.sidebar.checkbox("Purple Track", value=st.session_state.track_visibility["purple"], 
+                        key="purple_track_visible", 
+                        on_change=lambda: st.session_state.track_visibility.update({"purple": st.session_state.purple_track_visible}))
+    
+    st.sidebar.checkbox("Green Track", value=st.session_state.track_visibility["green"], 
+                        key="green_track_visible", 
+                        on_change=lambda: st.session_state.track_visibility.update({"green": st.session_state.green_track_visible}))
+    
+    st.sidebar.checkbox("Northern Yellow Track", value=st.session_state.track_visibility["northern_yellow"], 
+                        key="northern_yellow_track_visible", 
+                        on_change=lambda: st.session_state.track_visibility.update({"northern_yellow": st.session_state.northern_yellow_track_visible}))
 
-        st.sidebar.markdown("## Distances to Each Alignment")
-        
-        # Create dictionary to store all route distances
-        distance_data = {
-            "Route": [],
-            "Feet": [],
-            "Meters": []
-        }
+    # Add boring locations control
+    st.sidebar.subheader("Boring Locations")
+    
+    # Initialize boring visibility in session state if not present
+    if "boring_visibility" not in st.session_state:
+        st.session_state.boring_visibility = True
+    
+    # Initialize boring year selection in session state if not present
+    if "boring_year" not in st.session_state:
+        st.session_state.boring_year = "2025"
         
-        for name, data in expanded_alignments.items():
-            # Skip if the track is not visible
-            track_name = name.lower().split()[0]  # Extract first word (yellow, blue, etc.)
+    # Add checkbox to toggle boring locations
+    st.sidebar.checkbox("Show Boring Locations", value=st.session_state.boring_visibility,
+                        key="boring_locations_visible",
+                        on_change=lambda: setattr(st.session_state, "boring_visibility", st.session_state.boring_locations_visible))
+    
+    # Add radio buttons to select boring year
+    st.sidebar.radio("Boring Location Year", 
+                     options=["2025", "2024"],
+                     key="boring_year_selection",
+                     on_change=lambda: setattr(st.session_state, "boring_year", st.session_state.boring_year_selection))
+    
+    # Add info about boring locations (one element instead of three - each
+    # st.write is a separate websocket message replayed every rerun)
+    with st.sidebar.expander("Boring Locations Info"):
+        st.markdown(
+            "These markers represent boring locations used for geological surveys along the proposed railway alignments.\n\n"
+            "The 'R-' prefix indicates regular borings, while 'RC-' indicates rock core samples.\n\n"
+            "You can toggle between 2024 and 2025 boring locations using the radio buttons above."
+        )
+
+    # Initialize session state for location if not present
+    if "location" not in st.session_state:
+        st.session_state["location"] = None
+
+    if search and address_input:
+        try:
+            # Normalize so trivially different spellings share a cache entry
+            result = geocode_socal(address_input.strip().lower())
             
-            # Special case for "Northern Yellow"
-            if "northern" in track_name:
-                track_name = "northern_yellow"
-                
-            if track_name in st.session_state.track_visibility and not st.session_state.track_visibility[track_name]:
-                continue
+            if result:
+                location = LocationResult(*result)
                 
-            # Create a LineString from the coordinates
-            smoothed_coords = data
-            
-            # Create a LineString from the smoothed coordinates
-            line = LineString([(lon, lat) for lat, lon in smoothed_coords])
-            pt = Point(location.longitude, location.latitude)
+                st.session_state["address"] = address_input
+                st.session_state["location"] = location
+            else:
+                st.sidebar.error("Address not found")
+                st.session_state["location"] = None
+        except Exception as e:
+            st.sidebar.error(f"Geocoding service error: {str(e)}")
+            st.session_state["location"] = None
 
-            # find nearest point on the line
-            nearest = line.interpolate(line.project(pt))
-            nearest_lat, nearest_lon = nearest.y, nearest.x
+    # Use session state location for display
+    location = st.session_state.get("location", None)
+    address = st.session_state.get("address", "")
 
-            # geodesic distance in meters
-            dist_m = geodesic(addr_pt, (nearest_lat, nearest_lon)).meters
-            
-            # Convert to different units and round (ensure integers)
-            dist_ft = int(round(dist_m * 3.28084 / 10) * 10)  # Convert meters to feet and round to nearest 10 feet
-            dist_m_rounded = int(round(dist_m / 10) * 10)  # Round to nearest 10 meters
+    # --- 3. build the Folium map ---
+    # default center over Del Mar
+    center = (32.975, -117.245)
+    initial_zoom = 13
+    if location:
+        center = (location.latitude, location.longitude)
+        initial_zoom = 15
 
-            # draw a connector
-            folium.PolyLine(
-                [addr_pt, (nearest_lat, nearest_lon)],
-                color="magenta" if "Purple" in name else "green" if "Green" in name else "#FF7700",
-                weight=2,
-                dash_array="5,5"
-            ).add_to(m)
-            
-            # Get simplified route name
-            if "Yellow" in name and "Northern" not in name:
-                simple_name = "Yellow Route"
-            elif "Blue" in name:
-                simple_name = "Blue Route"
-            elif "Purple" in name:
-                simple_name = "Purple Route"
-            elif "Green" in name:
-                simple_name = "Green Route"
-            elif "Northern Yellow" in name:
-                simple_name = "Northern Yellow Route"
-            else:
-                simple_name = name
-                
-            # Add to distance data dictionary
-            distance_data["Route"].append(simple_name)
-            distance_data["Feet"].append(f"{dist_ft}")
-            distance_data["Meters"].append(f"{dist_m_rounded}")
-            
-        # Calculate distance to yellow track
-        if st.session_state.track_visibility["yellow"] and yellow_alignment.all_coords:
-            yellow_line = LineString([(lon, lat) for lat, lon in yellow_alignment.all_coords])
-            yellow_nearest = yellow_line.interpolate(yellow_line.project(pt))
-            yellow_nearest_lat, yellow_nearest_lon = yellow_nearest.y, yellow_nearest.x
-            yellow_dist_m = geodesic(addr_pt, (yellow_nearest_lat, yellow_nearest_lon)).meters
-            
-            # Convert to different units and round (ensure integers)
-            yellow_dist_ft = int(round(yellow_dist_m * 3.28084 / 10) * 10)  # Convert meters to feet and round to nearest 10 feet
-            yellow_dist_m_rounded = int(round(yellow_dist_m / 10) * 10)  # Round to nearest 10 meters
-            
-            # Draw a connector
-            folium.PolyLine(
-                [addr_pt, (yellow_nearest_lat, yellow_nearest_lon)],
-                color="#FF7700",
-                weight=2,
-                dash_array="5,5"
-            ).add_to(m)
-            
-            # Add to distance data dictionary
-            distance_data["Route"].append("Yellow Route")
-            distance_data["Feet"].append(str(yellow_dist_ft))
-            distance_data["Meters"].append(str(yellow_dist_m_rounded))
-        
-        # Calculate distance to blue track
-        if st.session_state.track_visibility["blue"] and blue_alignment.all_coords:
-            blue_line = LineString([(lon, lat) for lat, lon in blue_alignment.all_coords])
-            blue_nearest = blue_line.interpolate(blue_line.project(pt))
-            blue_nearest_lat, blue_nearest_lon = blue_nearest.y, blue_nearest.x
-            blue_dist_m = geodesic(addr_pt, (blue_nearest_lat, blue_nearest_lon)).meters
-            
-            # Convert to different units and round (ensure integers)
-            blue_dist_ft = int(round(blue_dist_m * 3.28084 / 10) * 10)  # Convert meters to feet and round to nearest 10 feet
-            blue_dist_m_rounded = int(round(blue_dist_m / 10) * 10)  # Round to nearest 10 meters
-            
-            # Draw a connector
-            folium.PolyLine(
-                [addr_pt, (blue_nearest_lat, blue_nearest_lon)],
+    def _visibility_key():
+        """Hashable cache key for the track-visibility checkboxes."""
+        return tuple(sorted(st.session_state.track_visibility.items()))
+
+    @st.cache_resource(show_spinner=False, hash_funcs={folium.Map: lambda _: 0})
+    def render_map_html(m, map_key):
+        """
+        Serialize the built map to HTML once per map state.
+
+        streamlit-folium renders the figure on every call, and for a map
+        this dense the Jinja2 serialization rivals the build cost. The map
+        is excluded from the cache key (it is itself cached per map_key),
+        so the HTML string is produced once and replayed on later reruns.
+        """
+        return m.get_root().render()
+
+    @st.cache_resource(show_spinner=False)
+    def build_map(center, zoom, visibility_key, boring_year, boring_visible, location_key):
+        """
+        Build the full Folium map and the route-distance table data.
+
+        Rebuilding the alignments and re-rendering every polyline on each
+        Streamlit rerun dominated interaction latency, so the assembled map
+        is cached per input state: the track-visibility tuple, the boring
+        controls, and the searched location. Reruns that change none of
+        these (map pans, repeated clicks) return the cached map instantly.
+        The searched location and address are read from the enclosing
+        scope; location_key stands in for them in the cache key.
+        """
+        track_visibility = dict(visibility_key)
+        m = folium.Map(location=center, zoom_start=zoom, tiles="OpenStreetMap")
+
+        # Alignments are pure functions of hardcoded station data, built
+        # once per process (concurrently on cold start) by load_alignments
+        (yellow_alignment, blue_alignment, purple_alignment,
+         green_alignment, northern_yellow_alignment) = load_alignments()
+
+        # Add CSS to disable hover/tooltips on original polylines
+        css = """
+        <style>
+        .folium-map .leaflet-pane path:not(.yellow-bridge-overlay) {
+            pointer-events: none !important;
+        }
+        </style>
+        """
+    
+        # Add the CSS to the map
+        m.get_root().html.add_child(folium.Element(css))
+    
+        # Draw the visible alignments. render_to_map only reads the
+        # coordinates sampled once in load_alignments - these objects are
+        # shared across sessions, so map assembly must not mutate them
+        if track_visibility["yellow"]:
+            yellow_alignment.render_to_map(m)
+        if track_visibility["blue"]:
+            blue_alignment.render_to_map(m)
+        if track_visibility["purple"]:
+            purple_alignment.render_to_map(m)
+        if track_visibility["green"]:
+            green_alignment.render_to_map(m)
+        if track_visibility["northern_yellow"]:
+            northern_yellow_alignment.render_to_map(m)
+
+        # With no searched location, frame the visible tracks explicitly:
+        # one min/max reduction over the coordinate arrays hands Leaflet
+        # ready-made bounds instead of letting it walk every polyline.
+        # A searched address keeps its own center and zoom.
+        if location_key is None:
+            visible_coords = [
+                alignment.all_coords
+                for alignment, name in (
+                    (yellow_alignment, "yellow"),
+                    (blue_alignment, "blue"),
+                    (purple_alignment, "purple"),
+                    (green_alignment, "green"),
+                    (northern_yellow_alignment, "northern_yellow"),
+                )
+                if track_visibility[name] and alignment.all_coords
+            ]
+            if visible_coords:
+                stacked = np.vstack([np.asarray(c) for c in visible_coords])
+                m.fit_bounds([
+                    [stacked[:, 0].min(), stacked[:, 1].min()],
+                    [stacked[:, 0].max(), stacked[:, 1].max()],
+                ])
+
+        # Define all portals using the Portal class
+        portals = [
+            # Blue track portals
+            Portal(
+                name="Jimmy Durante Blvd Portal",
+                track_alignment=blue_alignment,
+                station_value=2600,  # 26+00
                 color="blue",
-                weight=2,
-                dash_array="5,5"
-            ).add_to(m)
-            
-            # Add to distance data dictionary
-            distance_data["Route"].append("Blue Route")
-            distance_data["Feet"].append(str(blue_dist_ft))
-            distance_data["Meters"].append(str(blue_dist_m_rounded))
+                description="Western portal of the Blue Route tunnel under Jimmy Durante Blvd"
+            ),
         
-        # Calculate distance to purple track
-        if st.session_state.track_visibility["purple"] and purple_alignment.all_coords:
-            purple_line = LineString([(lon, lat) for lat, lon in purple_alignment.all_coords])
-            purple_nearest = purple_line.interpolate(purple_line.project(pt))
-            purple_nearest_lat, purple_nearest_lon = purple_nearest.y, purple_nearest.x
-            purple_dist_m = geodesic(addr_pt, (purple_nearest_lat, purple_nearest_lon)).meters
-            
-            # Convert to different units and round (ensure integers)
-            purple_dist_ft = int(round(purple_dist_m * 3.28084 / 10) * 10)  # Convert meters to feet and round to nearest 10 feet
-            purple_dist_m_rounded = int(round(purple_dist_m / 10) * 10)  # Round to nearest 10 meters
-            
-            # Draw a connector
-            folium.PolyLine(
-                [addr_pt, (purple_nearest_lat, purple_nearest_lon)],
+            # Purple track portals
+            Portal(
+                name="Torrey Pines Rd West Portal",
+                track_alignment=purple_alignment,
+                station_value=13000,  # 130+00
                 color="magenta",
-                weight=2,
-                dash_array="5,5"
-            ).add_to(m)
-            
-            # Add to distance data dictionary
-            distance_data["Route"].append("Purple Route")
-            distance_data["Feet"].append(str(purple_dist_ft))
-            distance_data["Meters"].append(str(purple_dist_m_rounded))
+                description="Western portal of the Purple Route tunnel under Torrey Pines Road"
+            ),
         
-        # Calculate distance to green track
-        if st.session_state.track_visibility["green"] and green_alignment.all_coords:
-            green_line = LineString([(lon, lat) for lat, lon in green_alignment.all_coords])
-            green_nearest = green_line.interpolate(green_line.project(pt))
-            green_nearest_lat, green_nearest_lon = green_nearest.y, green_nearest.x
-            green_dist_m = geodesic(addr_pt, (green_nearest_lat, green_nearest_lon)).meters
-            
-            # Convert to different units and round (ensure integers)
-            green_dist_ft = int(round(green_dist_m * 3.28084 / 10) * 10)  # Convert meters to feet and round to nearest 10 feet
-            green_dist_m_rounded = int(round(green_dist_m / 10) * 10)  # Round to nearest 10 meters
-            
-            # Draw a connector
+            # Yellow track portals
+            Portal(
+                name="Racetrack View Dr Portal",
+                track_alignment=yellow_alignment,
+                station_value=7800,  # 82+00
+                color="red",
+                description="Northern portal of the Yellow Route tunnel at Racetrack View Drive"
+            ),
+        
+            Portal(
+                name="I-5 Knoll Portal",
+                track_alignment=yellow_alignment,
+                station_value=parse_station("234+00"),  # TS station of the seventh curve
+                color="#B8860B",  # Dark goldenrod
+                description="Southern portal of the Yellow Route tunnel at I-5 Knoll"
+            )
+        ]
+    
+        # Add all portals to the map
+        for portal in portals:
+            # Only add portals for tracks that are visible
+            track_alignment = portal.track_alignment
+            if track_alignment == yellow_alignment and track_visibility["yellow"]:
+                portal.add_to_map(m)
+            elif track_alignment == blue_alignment and track_visibility["blue"]:
+                portal.add_to_map(m)
+            elif track_alignment == purple_alignment and track_visibility["purple"]:
+                portal.add_to_map(m)
+            elif track_alignment == green_alignment and track_visibility["green"]:
+                portal.add_to_map(m)
+            elif track_alignment == northern_yellow_alignment and track_visibility["northern_yellow"]:
+                portal.add_to_map(m)
+    
+        # Add highlighted path for the Northern Yellow track; the dashed
+        # overlay is a static PolyLine, so the browser paints it once
+        # instead of re-animating it every frame like the old AntPath
+        if track_visibility["northern_yellow"] and northern_yellow_alignment.all_coords:
+            # Add a solid base line
             folium.PolyLine(
-                [addr_pt, (green_nearest_lat, green_nearest_lon)],
-                color="green",
-                weight=2,
-                dash_array="5,5"
+                locations=northern_yellow_alignment.all_coords,
+                color='orange',
+                weight=7,
+                opacity=0.7,
+                tooltip="Northern Yellow Route"
             ).add_to(m)
-            
-            # Add to distance data dictionary
-            distance_data["Route"].append("Green Route")
-            distance_data["Feet"].append(str(green_dist_ft))
-            distance_data["Meters"].append(str(green_dist_m_rounded))
-        
-        # Calculate distance to Northern Yellow track
-        if st.session_state.track_visibility["northern_yellow"] and northern_yellow_alignment.all_coords:
-            northern_yellow_line = LineString([(lon, lat) for lat, lon in northern_yellow_alignment.all_coords])
-            northern_yellow_nearest = northern_yellow_line.interpolate(northern_yellow_line.project(pt))
-            northern_yellow_nearest_lat, northern_yellow_nearest_lon = northern_yellow_nearest.y, northern_yellow_nearest.x
-            northern_yellow_dist_m = geodesic(addr_pt, (northern_yellow_nearest_lat, northern_yellow_nearest_lon)).meters
-            
-            # Convert to different units and round (ensure integers)
-            northern_yellow_dist_ft = int(round(northern_yellow_dist_m * 3.28084 / 10) * 10)  # Convert meters to feet and round to nearest 10 feet
-            northern_yellow_dist_m_rounded = int(round(northern_yellow_dist_m / 10) * 10)  # Round to nearest 10 meters
-            
-            # Draw a connector
+
+            # Add dashed overlay
             folium.PolyLine(
-                [addr_pt, (northern_yellow_nearest_lat, northern_yellow_nearest_lon)],
-                color="orange",
-                weight=2,
-                dash_array="5,5"
+                locations=northern_yellow_alignment.all_coords,
+                dash_array="10,20",
+                color='orange',
+                weight=5,
+                opacity=0.9,
+                tooltip="Northern Yellow Route",
+                className="northern-yellow-route-overlay"  # Special class to allow hover
             ).add_to(m)
-            
-            # Add to distance data dictionary
-            distance_data["Route"].append("Northern Yellow Route")
-            distance_data["Feet"].append(str(northern_yellow_dist_ft))
-            distance_data["Meters"].append(str(northern_yellow_dist_m_rounded))
-            
-            # Find which segment of the northern yellow track is closest
-            northern_yellow_min_distance = float('inf')
-            northern_yellow_closest_segment = None
-            northern_yellow_segment_index = None
-            
-            for i, segment in enumerate(northern_yellow_alignment.segments):
-                segment_linestring = LineString([(lon, lat) for lat, lon in northern_yellow_alignment.segment_coords[i]])
-                segment_nearest = segment_linestring.interpolate(segment_linestring.project(pt))
-                segment_dist = geodesic(addr_pt, (segment_nearest.y, segment_nearest.x)).meters
-                
-                if segment_dist < northern_yellow_min_distance:
-                    northern_yellow_min_distance = segment_dist
-                    northern_yellow_closest_segment = segment
-                    northern_yellow_segment_index = i
-        
-        # Calculate distance to each boring location if they're visible
-        if st.session_state.boring_visibility and boring_locations:
-            
-            # Find the closest boring location
-            closest_boring = None
-            closest_boring_dist = float('inf')
-            
-            for boring in boring_locations:
-                boring_point = (boring["latitude"], boring["longitude"])
-                dist = geodesic(addr_pt, boring_point).meters
-                
-                if dist < closest_boring_dist:
-                    closest_boring_dist = dist
-                    closest_boring = boring
-            
-            if closest_boring:
-                # Convert to different units (ensure integers)
-                closest_boring_dist_ft = int(round(closest_boring_dist * 3.28084 / 10) * 10)  # Convert meters to feet and round to nearest 10 feet
-                closest_boring_dist_m_rounded = int(round(closest_boring_dist / 10) * 10)  # Round to nearest 10 meters
+    
+        # Select the boring locations based on the selected year
+        boring_locations = BORING_LOCATIONS[boring_year]
+
+        # Add boring location markers as one GeoJson layer: Leaflet
+        # instantiates a single object for the whole year instead of one
+        # CircleMarker per boring
+        if boring_visible:
+            fill_color = '#4B0082' if boring_year == "2024" else '#006400'  # Purple for 2024, Dark Green for 2025
+            folium.GeoJson(
+                BORING_FEATURES[boring_year],
+                name=f"Boring Locations ({boring_year})",
+                marker=folium.CircleMarker(
+                    radius=6,
+                    color='white',
+                    fill=True,
+                    fill_opacity=1.0,
+                    weight=2
+                ),
+                style_function=lambda feature, color=fill_color: {"fillColor": color},
+                tooltip=folium.GeoJsonTooltip(fields=["name"], labels=False),
+                popup=folium.GeoJsonPopup(fields=["name", "latitude", "longitude", "year"])
+            ).add_to(m)
+    
+        # Add a control to toggle boring markers
+        folium.LayerControl().add_to(m)
                 
-                # Draw a connector to the closest boring location
+        # Create dictionary to store all route distances
+        distance_data = {
+            "Route": [],
+            "Feet": [],
+            "Meters": []
+        }
+
+        # if we have a valid location, plot it + compute distances
+        if location:
+            track_geometries = load_track_geometries()
+            addr_pt = (location.latitude, location.longitude)
+            folium.Marker(addr_pt, tooltip=address, icon=folium.Icon(color="red")).add_to(m)
+
+            # One data-driven pass over the visible tracks replaces five
+            # copy-pasted per-color distance blocks
+            distance_tracks = (
+                ("yellow", "Yellow Route", "#FF7700"),
+                ("blue", "Blue Route", "blue"),
+                ("purple", "Purple Route", "magenta"),
+                ("green", "Green Route", "green"),
+                ("northern_yellow", "Northern Yellow Route", "orange"),
+            )
+            for track_key, route_label, connector_color in distance_tracks:
+                if not track_visibility[track_key]:
+                    continue
+
+                nearest_lat, nearest_lon = nearest_point_on_polyline(
+                    addr_pt[0], addr_pt[1], track_geometries[track_key][1])
+                dist_m = haversine_meters(addr_pt[0], addr_pt[1], nearest_lat, nearest_lon)
+
+                # Convert to different units and round (ensure integers)
+                dist_ft = int(round(dist_m * 3.28084 / 10) * 10)  # Convert meters to feet and round to nearest 10 feet
+                dist_m_rounded = int(round(dist_m / 10) * 10)  # Round to nearest 10 meters
+
+                # Draw a connector
                 folium.PolyLine(
-                    [addr_pt, (closest_boring["latitude"], closest_boring["longitude"])],
-                    color="purple" if st.session_state.boring_year == "2024" else "darkgreen",
+                    [addr_pt, (nearest_lat, nearest_lon)],
+                    color=connector_color,
                     weight=2,
                     dash_array="5,5"
                 ).add_to(m)
+
+                # Add to distance data dictionary
+                distance_data["Route"].append(route_label)
+                distance_data["Feet"].append(str(dist_ft))
+                distance_data["Meters"].append(str(dist_m_rounded))
+
+            if track_visibility["northern_yellow"]:
+                # Find which segment of the northern yellow track is closest:
+                # collect the nearest point on every segment, then measure all
+                # of them against the address in one vectorized haversine call
+                segment_nearest_points = [
+                    nearest_point_on_polyline(addr_pt[0], addr_pt[1], segment.coords_array)
+                    for segment in northern_yellow_alignment.segments
+                ]
+
+                segment_nearest_points = np.array(segment_nearest_points)
+                segment_dists = haversine_meters(
+                    addr_pt[0], addr_pt[1],
+                    segment_nearest_points[:, 0], segment_nearest_points[:, 1]
+                )
+                northern_yellow_segment_index = int(segment_dists.argmin())
+                northern_yellow_min_distance = float(segment_dists[northern_yellow_segment_index])
+                northern_yellow_closest_segment = northern_yellow_alignment.segments[northern_yellow_segment_index]
+        
+            # Calculate distance to each boring location if they're visible
+            if boring_visible and boring_locations:
+            
+                # Find the closest boring location with one vectorized
+                # distance pass over all borings
+                boring_points = np.array([(b["latitude"], b["longitude"]) for b in boring_locations])
+                boring_dists = haversine_meters(
+                    addr_pt[0], addr_pt[1],
+                    boring_points[:, 0], boring_points[:, 1]
+                )
+                closest_boring_index = int(boring_dists.argmin())
+                closest_boring = boring_locations[closest_boring_index]
+                closest_boring_dist = float(boring_dists[closest_boring_index])
+            
+                if closest_boring:
+                    # Convert to different units (ensure integers)
+                    closest_boring_dist_ft = int(round(closest_boring_dist * 3.28084 / 10) * 10)  # Convert meters to feet and round to nearest 10 feet
+                    closest_boring_dist_m_rounded = int(round(closest_boring_dist / 10) * 10)  # Round to nearest 10 meters
+                
+                    # Draw a connector to the closest boring location
+                    folium.PolyLine(
+                        [addr_pt, (closest_boring["latitude"], closest_boring["longitude"])],
+                        color="purple" if boring_year == "2024" else "darkgreen",
+                        weight=2,
+                        dash_array="5,5"
+                    ).add_to(m)
                 
-                # Add boring location to distance data
-                distance_data["Route"].append(f"Boring ({st.session_state.boring_year}): {closest_boring['name']}")
-                distance_data["Feet"].append(str(closest_boring_dist_ft))
-                distance_data["Meters"].append(str(closest_boring_dist_m_rounded))
+                    # Add boring location to distance data
+                    distance_data["Route"].append(f"Boring ({boring_year}): {closest_boring['name']}")
+                    distance_data["Feet"].append(str(closest_boring_dist_ft))
+                    distance_data["Meters"].append(str(closest_boring_dist_m_rounded))
                 
+
+        return m, distance_data
+
+    location_key = (address, location.latitude, location.longitude) if location else None
+    map_key = (
+        center,
+        initial_zoom,
+        _visibility_key(),
+        st.session_state.boring_year,
+        st.session_state.boring_visibility,
+        location_key,
+    )
+    m, distance_data = build_map(*map_key)
+
+    # Sidebar output happens outside the cached builder so it is emitted on
+    # every rerun, cache hit or miss
+    if location:
+        st.sidebar.markdown("## Distances to Each Alignment")
         # Display all distances in a table
         if distance_data["Route"]:
             # First, let's add custom CSS to control table column widths and prevent wrapping
@@ -1760,7 +1738,8 @@ with main_content:
 
     # --- 4. render ---
     # Set the map height to fill available space while leaving room for header and footer
-    st_folium(m, width="100%")
+    map_html = render_map_html(m, map_key)
+    components.html(map_html, height=700, scrolling=False)
 
 # --- 5. Footer with credits and disclaimer ---
 # Create footer using native Streamlit elements
@@ -0,0 +1,228 @@
+# build_alignments.py
+"""
+Offline generator for the static route alignment coordinates.
+
+The five route alignments (Yellow, Blue, Purple, Green, Northern Yellow)
+are fixed engineering definitions - their spiral/curve/tangent geometry
+never changes at runtime. This script runs the full generation pipeline
+once and dumps the resulting (lat, lon) polylines to alignments.json so
+consumers that only need the coordinates can load the file instead of
+re-running the trig-heavy generation.
+
+Usage:
+    python build_alignments.py
+
+Regenerate the JSON whenever the engineering parameters below change.
+The segment definitions must stay in sync with the alignments built in
+the app.
+"""
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import folium
+
+from utils.railway_alignment import RailwayAlignment
+
+# Known engineering reference points (station -> GIS anchors)
+STATION_2000_COORDS = (32.9740081, -117.2669915)  # 20+00 station
+STATION_2500_COORDS = (32.9726647, -117.2666647)  # 25+00 station
+STA_500_COORDS = (32.9731225, -117.2667758)  # 5+00 station
+STA_1000_COORDS = (32.9717752, -117.2664515)  # 10+00 station
+
+# Segment specs per alignment:
+#   ("tangent", start_station, end_station, name, manual_bearing_or_None)
+#   ("curve", ts, sc, cs, st, degree_of_curve, direction, name)
+YELLOW_SEGMENTS = [
+    ("tangent", "20+00", "24+04.67", "Initial Tangent", None),
+    ("curve", "24+04.67", "25+44.67", "30+43.75", "31+83.75", "9 00'00\"", "right", "First Curve"),
+    ("tangent", "31+83.75", "37+45.96", "Middle Tangent", None),
+    ("curve", "37+45.96", "39+05.96", "40+60.67", "42+20.67", "9 30'00\"", "left", "Second Curve"),
+    ("tangent", "42+20.67", "75+17.38", "Extended Tangent", 142.25),
+    ("curve", "75+17.38", "79+17.38", "87+52.17", "91+52.17", "2 24'00\"", "right", "Third Curve"),
+    ("tangent", "91+52.17", "94+72.45", "Fourth Tangent", None),
+    ("curve", "94+72.45", "98+72.45", "119+62.32", "123+62.32", "2 24'00\"", "left", "Fourth Curve"),
+    ("tangent", "123+62.32", "162+59.46", "Fifth Tangent", 171),
+    ("curve", "162+59.46", "169+09.46", "175+18.79", "181+68.79", "0 44'30\"", "left", "Fifth Curve"),
+    ("tangent", "181+68.79", "196+22.24", "Sixth Tangent", None),
+    ("curve", "196+22.24", "202+72.24", "208+28.94", "214+78.94", "0 44'30\"", "right", "Sixth Curve (MT1 CURVE #6)"),
+    ("tangent", "214+78.94", "235+49.79", "Seventh Tangent", None),
+    ("curve", "235+49.79", "242+29.79", "275+32.84", "282+12.84", "0 49'11\"", "right", "Seventh Curve"),
+    ("tangent", "282+12.84", "285+53.12", "Eighth Tangent", None),
+    ("curve", "285+53.12", "287+93.12", "294+53.38", "296+93.38", "0 15'00\"", "right", "Eighth Curve"),
+    ("tangent", "296+93.38", "304+93.02", "Ninth Tangent", None),
+]
+
+BLUE_SEGMENTS = [
+    ("tangent", "5+00", "17+46.12", "Initial Tangent", None),
+    ("curve", "17+46.12", "23+96.12", "54+05.81", "60+55.81", "0 48'00\"", "right", "First Curve"),
+    ("tangent", "60+55.81", "64+00.52", "Second Tangent", 141.5),
+    ("curve", "64+00.52", "70+80.52", "96+80.99", "103+60.99", "0 49'35\"", "left", "Second Curve"),
+    ("tangent", "103+60.99", "116+60.92", "Third Tangent", None),
+    ("curve", "116+60.92", "123+40.92", "146+18.69", "152+98.69", "0 49'35\"", "right", "Third Curve"),
+    ("tangent", "152+98.69", "156+48.69", "Fourth Tangent", 141.5),
+    ("curve", "156+48.69", "163+28.69", "192+18.38", "198+98.38", "0 49'35\"", "left", "Fourth Curve"),
+    ("tangent", "198+98.38", "204+89.02", "Fifth Tangent", None),
+    ("curve", "204+89.02", "211+69.02", "244+71.53", "251+51.53", "0 49'11\"", "right", "Fifth Curve"),
+    ("tangent", "251+51.53", "255+07.34", "Sixth Tangent", None),
+    ("curve", "255+07.34", "257+27.34", "264+05.11", "266+25.11", "0 15'00\"", "left", "Sixth Curve"),
+    ("tangent", "266+25.11", "274+32.35", "Seventh Tangent", 135),
+]
+
+PURPLE_SEGMENTS = [
+    ("tangent", "5+00", "33+23.02", "Initial Tangent", None),
+    ("curve", "33+23.02", "35+73.02", "46+03.60", "48+53.60", "1 25'00\"", "left", "First Curve"),
+    ("tangent", "48+53.60", "51+91.55", "Second Tangent", 181.75),
+    ("curve", "51+91.55", "54+41.55", "71+12.55", "73+62.55", "1 00'00\"", "right", "Second Curve"),
+    ("tangent", "73+62.55", "91+37.23", "Third Tangent", None),
+    ("curve", "91+37.23", "94+37.23", "108+41.79", "111+41.79", "1 06'00\"", "left", "Third Curve"),
+    ("tangent", "111+41.79", "114+31.56", "Fourth Tangent", None),
+    ("curve", "114+31.56", "117+01.56", "152+41.45", "155+11.45", "1 03'30\"", "right", "Fourth Curve"),
+    ("tangent", "155+11.45", "183+01.22", "Fifth Tangent", None),
+    ("curve", "183+01.22", "188+81.22", "197+17.88", "202+97.88", "0 30'00\"", "right", "Fifth Curve"),
+    ("tangent", "202+97.88", "226+46.37", "Sixth Tangent", 133),
+    ("curve", "226+46.37", "233+26.37", "237.58+89", "244+38.89", "0 49'35\"", "left", "Sixth Curve"),
+    ("tangent", "244+38.89", "280+89.19", "Seventh Tangent", None),
+]
+
+GREEN_SEGMENTS = [
+    ("tangent", "5+00", "10+00", "Initial Reference Tangent", None),
+    ("tangent", "10+00", "12+05.15", "Pre-Curve Tangent", None),
+    ("curve", "12+05.15", "14+15.15", "17+79.87", "19+89.87", "0 40'00\"", "left", "First Curve"),
+    ("curve", "19+89.87", "35+22.79", "36+28.04", "37+28.04", "2 55'00\"", "left", "First Curve"),
+    ("tangent", "37+28.04", "53+08.78", "Second Tangent", None),
+    ("curve", "53+08.78", "55+58.78", "60+27.97", "62+77.96", "4 09'00\"", "right", "Second Curve"),
+    ("tangent", "62+77.96", "71+41.19", "Third Tangent", None),
+    ("curve", "71+41.19", "73+81.19", "76+68.70", "79+08.70", "1 20'00\"", "right", "Third Curve"),
+    ("tangent", "79+08.70", "101+45.73", "Fourth Tangent", 161),
+    ("curve", "101+45.73", "105+05.73", "109+96.76", "113+56.76", "0 44'35\"", "left", "Fourth Curve"),
+    ("tangent", "113+56.76", "129+11.51", "Fifth Tangent", None),
+    ("curve", "129+11.51", "131+61.51", "138+79.54", "141+29.54", "2 45'00\"", "right", "Fifth Curve"),
+    ("tangent", "141+29.54", "187+10.02", "Sixth Tangent", None),
+    ("curve", "187+10.02", "192+90.02", "201+26.67", "207+06.67", "0 30'00\"", "right", "Sixth Curve"),
+    ("tangent", "207+06.67", "230+55.17", "Seventh Tangent", None),
+    ("curve", "230+55.17", "237+35.17", "241+67.68", "248+47.68", "0 45'35\"", "left", "Seventh Curve"),
+    ("tangent", "248+47.68", "284+97.94", "Eighth Tangent", None),
+]
+
+NORTHERN_YELLOW_SEGMENTS = [
+    ("tangent", "10+00", "19+00", "First Tangent", None),
+    ("curve", "19+00", "22+00", "25+00", "28+00", "9 00'00\"", "right", "First Curve"),
+    ("tangent", "28+00", "35+00", "Second Tangent", None),
+    ("curve", "35+00", "37+00", "40+00", "43+00", "7 00'00\"", "right", "Second Curve"),
+    ("tangent", "43+00", "65+00", "Third Tangent", 75),
+    ("curve", "65+00", "68+00", "73+00", "76+00", "9 30'00\"", "left", "Third Curve"),
+    ("tangent", "76+00", "120+00", "Fourth Tangent", 163),
+    ("curve", "120+00", "125+00", "126+00", "131+00", "2 00'00\"", "left", "Fourth Curve"),
+    ("tangent", "123+62.32", "175+59.46", "Fifth Tangent", 171),
+    ("curve", "175+59.46", "182+09.46", "188+18.79", "194+68.79", "0 44'30\"", "left", "Fifth Curve"),
+    ("tangent", "194+68.79", "209+22.24", "Sixth Tangent", None),
+    ("curve", "209+22.24", "215+72.24", "221+28.94", "227+78.94", "0 44'30\"", "right", "Sixth Curve (MT1 CURVE #6)"),
+    ("tangent", "227+78.94", "248+49.79", "Seventh Tangent", None),
+    ("curve", "248+49.79", "255+29.79", "288+32.84", "295+12.84", "0 49'11\"", "right", "Seventh Curve"),
+    ("tangent", "295+12.84", "298+53.12", "Eighth Tangent", None),
+    ("curve", "298+53.12", "300+93.12", "307+53.38", "309+93.38", "0 15'00\"", "right", "Eighth Curve"),
+    ("tangent", "309+93.38", "317+93.02", "Ninth Tangent", None),
+]
+
+ALIGNMENT_SPECS = {
+    "yellow": {
+        "name": "Yellow Route: Engineering Alignment",
+        "color": "#FFD700",
+        "reference_points": [("STA_2000", STATION_2000_COORDS, 2000), ("STA_2500", STATION_2500_COORDS, 2500)],
+        "start_ref": "STA_2000",
+        "segments": YELLOW_SEGMENTS,
+    },
+    "blue": {
+        "name": "Blue Route: Under Crest Canyon",
+        "color": "blue",
+        "reference_points": [("STA_500", STA_500_COORDS, 500), ("STA_1000", STA_1000_COORDS, 1000)],
+        "start_ref": "STA_500",
+        "segments": BLUE_SEGMENTS,
+    },
+    "purple": {
+        "name": "Purple Route: Under Camino Del Mar",
+        "color": "magenta",
+        "reference_points": [("STA_500", STA_500_COORDS, 500), ("STA_1000", STA_1000_COORDS, 1000)],
+        "start_ref": "STA_500",
+        "segments": PURPLE_SEGMENTS,
+    },
+    "green": {
+        "name": "Green Route: Del Mar Bluffs Double-Track",
+        "color": "green",
+        "reference_points": [("STA_500", STA_500_COORDS, 500), ("STA_1000", STA_1000_COORDS, 1000)],
+        "start_ref": "STA_500",
+        "segments": GREEN_SEGMENTS,
+    },
+    "northern_yellow": {
+        "name": "Northern Yellow Route",
+        "color": "orange",
+        "reference_points": [("STA_2000", STATION_2000_COORDS, 2000), ("STA_2500", STATION_2500_COORDS, 2500)],
+        "start_ref": "STA_2000",
+        "segments": NORTHERN_YELLOW_SEGMENTS,
+    },
+}
+
+def make_alignment(spec):
+    """Instantiate a RailwayAlignment (reference points + segments) from a spec dict."""
+    alignment = RailwayAlignment(name=spec["name"], color=spec["color"])
+
+    for ref_name, coords, station in spec["reference_points"]:
+        alignment.add_reference_point(ref_name, coords, station)
+
+    for seg in spec["segments"]:
+        if seg[0] == "tangent":
+            _, start, end, name, manual_bearing = seg
+            tangent = alignment.add_tangent(start, end, name=name)
+            if manual_bearing is not None:
+                tangent.manual_bearing = manual_bearing
+        else:
+            _, ts, sc, cs, st_sta, degree, direction, name = seg
+            alignment.add_curve(
+                ts_station=ts,
+                sc_station=sc,
+                cs_station=cs,
+                st_station=st_sta,
+                degree_of_curve=degree,
+                direction=direction,
+                name=name
+            )
+
+    return alignment
+
+def build_alignment(spec):
+    """Build a RailwayAlignment from a spec dict and return its coordinates."""
+    alignment = make_alignment(spec)
+
+    ref1, ref2 = (rp[0] for rp in spec["reference_points"])
+    track_params = alignment.calculate_track_params(ref1, ref2)
+
+    # Use a throwaway map - we only want the generated coordinates
+    scratch_map = folium.Map(location=(32.975, -117.245), zoom_start=13)
+    alignment.add_to_map(
+        m=scratch_map,
+        start_ref_point_name=spec["start_ref"],
+        track_params=track_params,
+        add_markers=False
+    )
+
+    return alignment.all_coords
+
+def main():
+    # The five alignments are independent, and the generation is CPU-bound
+    # pure-Python trig, so build them in separate processes. Specs and the
+    # returned coordinate lists are plain tuples/lists, so they pickle
+    # cleanly across the process boundary.
+    keys = list(ALIGNMENT_SPECS)
+    with ProcessPoolExecutor(max_workers=len(keys)) as executor:
+        results = executor.map(build_alignment, (ALIGNMENT_SPECS[k] for k in keys))
+    alignments = dict(zip(keys, results))
+
+    with open("alignments.json", "w") as f:
+        json.dump(alignments, f)
+
+    for key, coords in alignments.items():
+        print(f"{key}: {len(coords)} points")
+    print("Wrote alignments.json")
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ from utils.spiral_curve import create_spiral_curve, create_railway_spiral, add_r
 from utils.tangent_line import add_railway_tangent_to_map
 from utils.engineering_coords import calculate_track_parameters, station_to_gis, parse_station, parse_angle, calculate_radius_from_degree_of_curve
 from utils.railway_curve import add_complete_railway_curve_to_map, add_complete_railway_alignment_to_map
+from utils.fast_geo import haversine_meters
 
 __all__ = [
     'create_curved_path', 
@@ -20,5 +21,6 @@ __all__ = [
     'parse_angle',
     'calculate_radius_from_degree_of_curve',
     'add_complete_railway_curve_to_map',
-    'add_complete_railway_alignment_to_map'
-] 
\ No newline at end of file
+    'add_complete_railway_alignment_to_map',
+    'haversine_meters'
+]
\ No newline at end of file
@@ -125,44 +125,30 @@ def create_railway_circular_curve(start_point, end_point=None, bearing_deg=None,
         # Direction multiplier
         sign = 1 if direction.lower() == 'left' else -1
         
-        # Initialize the points list with the start point
-        points = [start_point]
+        # Arc distances past the start point; chord length and bearing for
+        # every sample are computed in one vector pass instead of a Python
+        # loop per point
+        arc_dist = (np.arange(1, steps + 1) / steps) * arc_length_ft
+        angle = arc_dist / radius_ft
         
-        # Generate points along the arc
-        for i in range(1, steps + 1):
-            # Calculate arc distance for this point
-            arc_dist = (i / steps) * arc_length_ft
-            
-            # Calculate the angle subtended at this point
-            angle = arc_dist / radius_ft
-            
-            # Calculate the bearing to this point
-            point_bearing_rad = radians(bearing_deg) + sign * angle
-            
-            # Calculate the straight-line distance (chord)
-            chord = 2 * radius_ft * sin(angle / 2)
-            
-            # Calculate the bearing to the chord midpoint
-            chord_bearing_rad = radians(bearing_deg) + sign * angle / 2
-            
-            # Calculate the offset from the starting point
-            # North component (latitude) - positive is North
-            north_offset = chord * cos(chord_bearing_rad)
-            # East component (longitude) - positive is East
-            east_offset = chord * sin(chord_bearing_rad)
-            
-            # Convert from feet to degrees
-            lat_scale = 364000  # Approximate feet per degree of latitude
-            lon_scale = lat_scale * cos(radians(lat0))  # Adjust for longitude at this latitude
-            
-            # Calculate the new coordinates
-            new_lat = lat0 + north_offset / lat_scale
-            new_lon = lon0 + east_offset / lon_scale
-            
-            # Add to the points list
-            points.append((new_lat, new_lon))
+        # Straight-line distance (chord) and bearing to the chord midpoint
+        chord = 2 * radius_ft * np.sin(angle / 2)
+        chord_bearing_rad = radians(bearing_deg) + sign * angle / 2
         
-        return points
+        # Offsets from the starting point
+        # North component (latitude) - positive is North
+        north_offset = chord * np.cos(chord_bearing_rad)
+        # East component (longitude) - positive is East
+        east_offset = chord * np.sin(chord_bearing_rad)
+        
+        # Convert from feet to degrees
+        lat_scale = 364000  # Approximate feet per degree of latitude
+        lon_scale = lat_scale * cos(radians(lat0))  # Adjust for longitude at this latitude
+        
+        new_lat = lat0 + north_offset / lat_scale
+        new_lon = lon0 + east_offset / lon_scale
+        
+        return [start_point] + list(zip(new_lat.tolist(), new_lon.tolist()))
     
     # Mode 1: Using endpoints and radius (less common for railway design)
     elif end_point is not None and (degree_of_curve is not None or radius_ft is not None):
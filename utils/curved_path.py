@@ -45,8 +45,11 @@ def create_curved_path(coords, curve_factor=0.2, steps=20):
         
         # Generate points along the quadratic Bezier curve
         for t in np.linspace(0, 1, steps):
-            # Quadratic Bezier formula: B(t) = (1-t)²P0 + 2(1-t)tP1 + t²P2
-            intermediate = (1-t)**2 * mid1 + 2*(1-t)*t * control + t**2 * mid2
+            # De Casteljau evaluation: two lerps instead of expanding the
+            # (1-t)²P0 + 2(1-t)tP1 + t²P2 polynomial - fewer multiplies per point
+            a = mid1 + t * (control - mid1)
+            b = control + t * (mid2 - control)
+            intermediate = a + t * (b - a)
             curved_coords.append((intermediate[0], intermediate[1]))
     
     # Add the last point
@@ -1,6 +1,6 @@
 import numpy as np
-from geopy.distance import geodesic
 import math
+from functools import lru_cache
 
 def calculate_track_parameters(point1, station1, point2, station2):
     """
@@ -104,10 +104,14 @@ def station_to_gis(reference_point, reference_station, target_station, track_par
     
     return (target_point[0], target_point[1])
 
+@lru_cache(maxsize=256)
 def parse_station(station_str):
     """
     Parse a station string (e.g., "24+04.67") to a numeric value in feet.
-    
+
+    Results are memoized - the same station literals recur across the
+    alignment definitions, so each distinct string is parsed once.
+
     Args:
         station_str: Station string in the format "XX+YY.ZZ"
         
@@ -123,10 +127,14 @@ def parse_station(station_str):
     
     return hundreds + feet
 
+@lru_cache(maxsize=256)
 def parse_angle(angle_str):
     """
     Parse an angle string (e.g., "9 00'00\"") to degrees.
-    
+
+    Memoized like parse_station - degree-of-curve literals repeat
+    across routes.
+
     Args:
         angle_str: Angle string in DMS format
         
@@ -142,12 +150,16 @@ def parse_angle(angle_str):
     
     return degrees + minutes/60 + seconds/3600
 
+@lru_cache(maxsize=256)
 def calculate_radius_from_degree_of_curve(degree_of_curve):
     """
     Calculate radius from degree of curvature (arc definition).
     In US railway engineering, Dc is defined as the central angle in degrees
     subtended by a 100-foot arc.
-    
+
+    Memoized alongside parse_station/parse_angle - the same handful of
+    degree-of-curve constants recurs across every alignment build.
+
     Args:
         degree_of_curve: Degree of curvature in decimal degrees
         
@@ -7,12 +7,18 @@ from utils.engineering_coords import (
     parse_angle,
     calculate_radius_from_degree_of_curve
 )
+from utils.fast_geo import simplify_coords
 from utils.railway_curve import add_complete_railway_curve_to_map
 from utils.tangent_line import add_railway_tangent_to_map
 
 class RailwaySegment:
     """Base class for railway alignment segments"""
-    
+
+    # Fixed attribute layout: slot reads skip the per-instance __dict__
+    # (one hash lookup per attribute access) and shrink each segment
+    __slots__ = ("type", "name", "color", "weight", "opacity",
+                 "start_point", "end_point", "_coords", "_coords_array")
+
     def __init__(self, segment_type, name=None, color="#FF7700", weight=8, opacity=1.0):
         self.type = segment_type
         self.name = name or f"{segment_type.capitalize()} segment"
@@ -22,14 +28,41 @@ class RailwaySegment:
         self.start_point = None
         self.end_point = None
         self.coords = []
-        
+
+    @property
+    def coords(self):
+        """Sampled coordinates as a list of (lat, lon) tuples"""
+        return self._coords
+
+    @coords.setter
+    def coords(self, value):
+        self._coords = value
+        self._coords_array = None
+
+    @property
+    def coords_array(self):
+        """Sampled coordinates as a contiguous (N, 2) float64 array
+
+        Built lazily from coords and cached until coords is reassigned.
+        List storage stays the source of truth (Folium and the JSON
+        export consume lists), but vectorized math - bounding boxes,
+        haversine distances, simplification - can work on this array
+        without converting tuple-by-tuple each time.
+        """
+        if self._coords_array is None:
+            self._coords_array = np.asarray(self._coords, dtype=np.float64).reshape(-1, 2)
+        return self._coords_array
+
     def add_to_map(self, m, start_point, bearing_deg):
         """Add the segment to the map and return the end point and bearing"""
         raise NotImplementedError("Subclasses must implement this method")
 
 class TangentSegment(RailwaySegment):
     """Straight line segment in a railway alignment"""
-    
+
+    __slots__ = ("start_station", "end_station", "start_station_value",
+                 "end_station_value", "length_ft", "manual_bearing")
+
     def __init__(self, start_station, end_station, name=None, color="#FF7700", weight=8, opacity=1.0):
         super().__init__("tangent", name, color, weight, opacity)
         self.start_station = start_station
@@ -66,7 +99,16 @@ class TangentSegment(RailwaySegment):
 
 class CurveSegment(RailwaySegment):
     """Spiral-curve-spiral segment in a railway alignment"""
-    
+
+    __slots__ = ("ts_station", "sc_station", "cs_station", "st_station",
+                 "ts_station_value", "sc_station_value", "cs_station_value",
+                 "st_station_value", "entry_spiral_length",
+                 "circular_arc_length", "exit_spiral_length",
+                 "degree_value", "radius_ft", "direction",
+                 "add_white_pattern", "add_markers",
+                 "ts_point", "sc_point", "cs_point", "st_point",
+                 "ts_bearing", "sc_bearing", "cs_bearing", "st_bearing")
+
     def __init__(self, ts_station, sc_station, cs_station, st_station, 
                  degree_of_curve=None, radius_ft=None, direction="right", 
                  name=None, color="#FF7700", weight=8, opacity=1.0, 
@@ -485,6 +527,50 @@ class RailwayAlignment:
         
         return track_params
         
+    def to_single_polyline(self):
+        """Concatenate all segments' sampled coordinates into one coordinate list
+
+        Consecutive segments share their join vertex (each segment starts at
+        the previous segment's end point), so the duplicate is dropped when
+        stitching. The result is suitable for a single folium.PolyLine per
+        alignment instead of one Leaflet path per segment.
+
+        Returns:
+            List of (lat, lon) tuples covering the whole alignment
+        """
+        coords = []
+        for segment_coords in self.segment_coords:
+            if coords and segment_coords and segment_coords[0] == coords[-1]:
+                coords.extend(segment_coords[1:])
+            else:
+                coords.extend(segment_coords)
+        return coords
+
+    def render_to_map(self, m):
+        """Draw the alignment onto a map from already-sampled coordinates
+
+        Read-only counterpart to add_to_map's hide_technical_info path: it
+        draws the stitched polyline and any track-type sections but never
+        resets or resamples segment state, so a process-shared alignment
+        can be drawn onto several maps concurrently.
+
+        Args:
+            m: Folium map object
+        """
+        if not self.all_coords:
+            raise ValueError("Alignment coordinates have not been sampled yet")
+
+        folium.PolyLine(
+            locations=simplify_coords(self.to_single_polyline()),
+            color=self.color,
+            weight=5,
+            opacity=0.7,
+            tooltip=self.name
+        ).add_to(m)
+
+        if self.track_type_sections:
+            self.render_track_type_sections(m)
+
     def add_to_map(self, m, start_ref_point_name=None, track_params=None, start_station=None, add_markers=False, hide_technical_info=False):
         """Add the entire alignment to the map
         
@@ -589,9 +675,11 @@ class RailwayAlignment:
                 self.segment_coords.append(segment.coords)
                 self.all_coords.extend(segment.coords)
             
-            # Add a single polyline for the entire alignment with a generic tooltip
+            # Add a single polyline for the entire alignment with a generic
+            # tooltip; duplicated segment-join vertices are stitched out and
+            # visually colinear sample points dropped before serialization
             folium.PolyLine(
-                locations=self.all_coords,
+                locations=simplify_coords(self.to_single_polyline()),
                 color=self.color,
                 weight=5,
                 opacity=0.7,
@@ -1,8 +1,26 @@
 import numpy as np
+from functools import lru_cache
 from math import sin, cos, atan2, radians, degrees
 from utils.engineering_coords import calculate_radius_from_degree_of_curve
 import folium
 
+@lru_cache(maxsize=64)
+def _spiral_chord_geometry(spiral_length_ft, radius_ft, steps):
+    """
+    Deflection and chord-length arrays for a spiral of a given shape.
+
+    These depend only on (length, radius, sample count) - roughly ten
+    distinct shapes recur across all five alignments - so each shape is
+    computed once and the cached arrays are marked read-only. Only the
+    bearing-dependent rotation remains per-call work.
+    """
+    distance = np.linspace(0, spiral_length_ft, steps + 1)[1:]
+    deflection = distance**2 / (2 * radius_ft * spiral_length_ft)
+    chord_length = distance * (1.0 - deflection**2 / 10.0)  # Approximation
+    deflection.setflags(write=False)
+    chord_length.setflags(write=False)
+    return deflection, chord_length
+
 def create_spiral_curve(start_point, end_point, direction='right', steps=20):
     """
     Generate points along a spiral curve (clothoid) between two points.
@@ -120,74 +138,31 @@ def create_railway_spiral(start_point, bearing_deg, spiral_length_ft, degree_of_
     elif radius_ft is None:
         raise ValueError("Either radius_ft or degree_of_curve must be provided")
     
-    # Parameter A = sqrt(R*Ls) for spiral calculation
-    A = np.sqrt(radius_ft * spiral_length_ft)
-    
-    # Generate points along the spiral
-    # Use exact distances along the curve to ensure accurate station points
-    s = np.linspace(0, spiral_length_ft, steps+1)
-    
-    # Calculate local x,y coordinates using Fresnel integrals
-    x_local = s - s**5 / (40 * A**4) + s**9 / (3456 * A**8)
-    y_local = (s**3) / (6 * A**2) - (s**7) / (336 * A**6)
-    
-    # Adjust for direction
-    if direction.lower() == 'right':
-        y_local *= -1
-    
-    # Convert bearing to radians - adjust for coordinate system
-    # In GIS: 0° is North, 90° is East
-    th = radians(bearing_deg)
-    
-    # Initialize arrays for final coordinates
-    points = []
-    
-    # Start point is the first point
-    points.append(start_point)
-    
-    # Calculate the remaining points using proper railway engineering
-    for i in range(1, len(s)):
-        # Get the distance along the spiral
-        distance = s[i]
-        
-        # Calculate deflection angle at this point
-        deflection = distance**2 / (2 * radius_ft * spiral_length_ft)
-        
-        # Calculate radius at this point
-        R = radius_ft * spiral_length_ft / distance if distance > 0 else float('inf')
-        
-        # Calculate arc length and chord length
-        arc_length = distance
-        chord_length = arc_length * (1.0 - deflection**2 / 10.0)  # Approximation
-        
-        # Calculate chord bearing
-        chord_bearing = bearing_deg
-        if direction.lower() == 'left':
-            chord_bearing += np.degrees(deflection / 2)
-        else:
-            chord_bearing -= np.degrees(deflection / 2)
-        
-        # Convert to radians
-        chord_bearing_rad = radians(chord_bearing)
-        
-        # Calculate the offset from the starting point
-        # North component (latitude) - positive is North
-        north_offset = chord_length * np.cos(chord_bearing_rad)
-        # East component (longitude) - positive is East
-        east_offset = chord_length * np.sin(chord_bearing_rad)
-        
-        # Convert from feet to degrees
-        lat_scale = 364000  # Approximate feet per degree of latitude
-        lon_scale = lat_scale * np.cos(radians(lat_ts))  # Adjust for longitude at this latitude
-        
-        # Calculate the new coordinates
-        new_lat = lat_ts + north_offset / lat_scale
-        new_lon = lon_ts + east_offset / lon_scale
-        
-        # Add to the points list
-        points.append((new_lat, new_lon))
-    
-    return points
+    # Deflection angle and chord length at every sample past the TS point
+    # (the start point itself is emitted as-is), memoized per spiral shape
+    deflection, chord_length = _spiral_chord_geometry(spiral_length_ft, radius_ft, steps)
+
+    # Chord bearing: half the deflection, signed by turn direction
+    if direction.lower() == 'left':
+        chord_bearing = bearing_deg + np.degrees(deflection / 2)
+    else:
+        chord_bearing = bearing_deg - np.degrees(deflection / 2)
+    chord_bearing_rad = np.radians(chord_bearing)
+
+    # Offsets from the starting point
+    # North component (latitude) - positive is North
+    north_offset = chord_length * np.cos(chord_bearing_rad)
+    # East component (longitude) - positive is East
+    east_offset = chord_length * np.sin(chord_bearing_rad)
+
+    # Convert from feet to degrees
+    lat_scale = 364000  # Approximate feet per degree of latitude
+    lon_scale = lat_scale * np.cos(radians(lat_ts))  # Adjust for longitude at this latitude
+
+    lats = lat_ts + north_offset / lat_scale
+    lons = lon_ts + east_offset / lon_scale
+
+    return [start_point] + list(zip(lats.tolist(), lons.tolist()))
 
 def add_railway_spiral_to_map(m, start_point, bearing_deg, spiral_length_ft, 
                               degree_of_curve=None, radius_ft=None, 